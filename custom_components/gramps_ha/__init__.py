@@ -1,183 +1,400 @@
-"""The Gramps HA integration."""
-
-import logging
-from datetime import timedelta, datetime, date
-from pathlib import Path
-
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.device_registry import (
-    async_get as async_get_device_registry,
-    DeviceEntryType,
-    DeviceInfo,
-)
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from homeassistant.components import persistent_notification
-
-from .const import DOMAIN, CONF_URL, CONF_USERNAME, CONF_PASSWORD, CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
-
-_LOGGER = logging.getLogger(__name__)
-
-PLATFORMS: list[Platform] = [Platform.SENSOR]
-
-SCAN_INTERVAL = timedelta(hours=6)
-
-
-async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Set up Gramps HA from a config entry."""
-    _LOGGER.info("Setting up Gramps HA integration")
-
-    try:
-        from .grampsweb_api import GrampsWebAPI
-
-        hass.data.setdefault(DOMAIN, {})
-
-        url = entry.data.get(CONF_URL)
-        username = entry.data.get(CONF_USERNAME)
-        password = entry.data.get(CONF_PASSWORD)
-
-        _LOGGER.debug("Gramps Web URL: %s", url)
-        _LOGGER.debug("Username provided: %s", bool(username))
-
-        # Register device in device registry
-        device_registry = async_get_device_registry(hass)
-        device = device_registry.async_get_or_create(
-            config_entry_id=entry.entry_id,
-            identifiers={(DOMAIN, entry.entry_id)},
-            name=entry.title or "Gramps Web",
-            manufacturer="Gramps Web",
-            model="Birthday Tracker",
-            entry_type=DeviceEntryType.SERVICE,
-            configuration_url=url,
-        )
-        _LOGGER.debug("Device registered: %s", device.name)
-
-        api = GrampsWebAPI(
-            url=url,
-            username=username,
-            password=password,
-            hass_config_path=hass.config.config_dir,
-        )
-
-        # Get scan interval from config (in hours), default to DEFAULT_SCAN_INTERVAL
-        scan_interval_hours = entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
-        
-        coordinator = GrampsWebCoordinator(hass, api, entry, scan_interval_hours=scan_interval_hours)
-
-        # Try initial refresh, but don't fail if it doesn't work
-        try:
-            await coordinator.async_config_entry_first_refresh()
-            _LOGGER.info("Initial data fetch successful")
-        except Exception as refresh_err:
-            _LOGGER.warning("Initial data fetch failed (will retry): %s", refresh_err)
-            # Don't fail setup, just log the warning
-
-        hass.data[DOMAIN][entry.entry_id] = coordinator
-
-        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-
-        _LOGGER.info("Gramps HA setup completed successfully")
-        return True
-
-    except Exception as err:
-        _LOGGER.error("Failed to setup Gramps HA: %s", err, exc_info=True)
-        return False
-
-
-async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Unload a config entry."""
-    try:
-        if unload_ok := await hass.config_entries.async_unload_platforms(
-            entry, PLATFORMS
-        ):
-            hass.data[DOMAIN].pop(entry.entry_id)
-
-        return unload_ok
-    except Exception as err:
-        _LOGGER.error("Failed to unload Gramps HA: %s", err)
-        return False
-
-
-class GrampsWebCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching Gramps Web data."""
-
-    def __init__(self, hass: HomeAssistant, api, entry: ConfigEntry, scan_interval_hours: int = None) -> None:
-        """Initialize."""
-        if scan_interval_hours is None:
-            scan_interval_hours = DEFAULT_SCAN_INTERVAL
-        
-        super().__init__(
-            hass,
-            _LOGGER,
-            name=DOMAIN,
-            update_interval=timedelta(hours=scan_interval_hours),
-        )
-        self.api = api
-        self.entry = entry
-        self.last_birthdays = []  # Track previous list for comparison
-
-    async def _async_update_data(self):
-        """Fetch data from API."""
-        try:
-            _LOGGER.debug("Fetching birthday data from Gramps Web")
-            data = await self.hass.async_add_executor_job(self.api.get_birthdays)
-            _LOGGER.debug("Fetched %s birthdays", len(data) if data else 0)
-            
-            # Check for notifications
-            await self._check_notifications(data)
-            
-            # Fetch deathdays if enabled
-            if self.entry.data.get("show_deathdays", False):
-                deathdays = await self.hass.async_add_executor_job(self.api.get_deathdays)
-                self.hass.data.setdefault(f"{DOMAIN}_deathdays", {})[self.entry.entry_id] = deathdays or []
-                _LOGGER.debug(
-                    "Deathdays fetched: %s entries%s",
-                    len(deathdays) if deathdays else 0,
-                    f" | first: {deathdays[0]}" if deathdays else "",
-                )
-            else:
-                _LOGGER.debug("Deathdays disabled in config; skipping fetch")
-            
-            # Fetch anniversaries if enabled
-            if self.entry.data.get("show_anniversaries", False):
-                anniversaries = await self.hass.async_add_executor_job(self.api.get_anniversaries)
-                self.hass.data.setdefault(f"{DOMAIN}_anniversaries", {})[self.entry.entry_id] = anniversaries or []
-                _LOGGER.debug(
-                    "Anniversaries fetched: %s entries%s",
-                    len(anniversaries) if anniversaries else 0,
-                    f" | first: {anniversaries[0]}" if anniversaries else "",
-                )
-            else:
-                _LOGGER.debug("Anniversaries disabled in config; skipping fetch")
-            
-            # Store current list for next comparison
-            self.last_birthdays = data or []
-            
-            return data
-        except Exception as err:
-            _LOGGER.error("Error fetching data: %s", err, exc_info=True)
-            raise UpdateFailed(f"Error communicating with API: {err}") from err
-
-    async def _check_notifications(self, current_birthdays):
-        """Send only one notification: always 1 day before the event."""
-        if not current_birthdays:
-            return
-
-        today = date.today()
-        tomorrow = today.replace(day=today.day + 1) if today.day < 28 else date(today.year if today.month < 12 else today.year + 1, today.month if today.month < 12 else 1, 1)
-        tomorrow_str = tomorrow.strftime("%Y-%m-%d")
-
-        for person in current_birthdays:
-            next_bday = person.get("next_birthday", "")
-            if next_bday.startswith(tomorrow_str):
-                age = person.get("age", "?")
-                title = "🎉 Geburtstag morgen!"
-                message = f"{person.get('person_name')} hat morgen Geburtstag!\n\nZukünftiges Alter: {age + 1} Jahre"
-                persistent_notification.create(
-                    self.hass,
-                    message,
-                    title=title,
-                    notification_id=f"gramps_tomorrow_{person.get('person_name')}"
-                )
-                _LOGGER.info("Birthday tomorrow notification: %s", person.get("person_name"))
+"""The Gramps HA integration."""
+
+import logging
+from datetime import timedelta, datetime, date
+from functools import partial
+from pathlib import Path
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_change
+from homeassistant.helpers.device_registry import (
+    async_get as async_get_device_registry,
+    DeviceEntryType,
+    DeviceInfo,
+)
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    CONF_URL,
+    CONF_USERNAME,
+    CONF_PASSWORD,
+    CONF_SCAN_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+    CONF_SERVER_FILTERS,
+    DEFAULT_SERVER_FILTERS,
+    CONF_FILTER_TAG,
+    DEFAULT_FILTER_TAG,
+    CONF_FETCH_WINDOW,
+    DEFAULT_FETCH_WINDOW,
+    CONF_EVENT_TYPES,
+    DEFAULT_EVENT_TYPES,
+    CONF_SHOW_DEATHDAYS,
+    DEFAULT_SHOW_DEATHDAYS,
+    CONF_SHOW_ANNIVERSARIES,
+    DEFAULT_SHOW_ANNIVERSARIES,
+    CONF_SCAN_INTERVAL_DEATHDAYS,
+    CONF_SCAN_INTERVAL_ANNIVERSARIES,
+    CONF_SCAN_INTERVAL_EVENTS,
+    EVENT_TODAY,
+    EVENT_UPCOMING_CHANGED,
+)
+from .changes import new_today, upcoming_diff
+from .snapshot import Snapshot
+
+_LOGGER = logging.getLogger(__name__)
+
+PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.CALENDAR]
+RETRY_INTERVAL = timedelta(minutes=30)  # after a failed refresh
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Set up Gramps HA from a config entry."""
+    _LOGGER.info("Setting up Gramps HA integration")
+
+    try:
+        from .grampsweb_api import GrampsWebAPI
+        from .ics import async_ensure_feed_token, async_register_feed_view
+        from .notifications import GrampsNotifier
+        from .services import async_setup_services
+        from .storage import SnapshotStore
+        from .websocket import async_register_websocket_commands
+
+        hass.data.setdefault(DOMAIN, {})
+
+        url = entry.data.get(CONF_URL)
+        username = entry.data.get(CONF_USERNAME)
+        password = entry.data.get(CONF_PASSWORD)
+
+        _LOGGER.debug("Gramps Web URL: %s", url)
+        _LOGGER.debug("Username provided: %s", bool(username))
+
+        # Register device in device registry
+        device_registry = async_get_device_registry(hass)
+        device = device_registry.async_get_or_create(
+            config_entry_id=entry.entry_id,
+            identifiers={(DOMAIN, entry.entry_id)},
+            name=entry.title or "Gramps Web",
+            manufacturer="Gramps Web",
+            model="Birthday Tracker",
+            entry_type=DeviceEntryType.SERVICE,
+            configuration_url=url,
+        )
+        _LOGGER.debug("Device registered: %s", device.name)
+
+        # The client creates the images directory, keep that off the event loop
+        api = await hass.async_add_executor_job(
+            partial(
+                GrampsWebAPI,
+                url=url,
+                username=username,
+                password=password,
+                hass_config_path=hass.config.config_dir,
+                server_filters=entry.data.get(CONF_SERVER_FILTERS, DEFAULT_SERVER_FILTERS),
+                filter_tag=entry.data.get(CONF_FILTER_TAG, DEFAULT_FILTER_TAG),
+                window_days=entry.data.get(CONF_FETCH_WINDOW, DEFAULT_FETCH_WINDOW),
+                event_types=entry.data.get(CONF_EVENT_TYPES, DEFAULT_EVENT_TYPES).split(","),
+            )
+        )
+
+        # Get scan interval from config (in hours), default to DEFAULT_SCAN_INTERVAL
+        scan_interval_hours = entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+
+        # One coordinator per kind, each on its own schedule (0 = scan interval)
+        kinds = {"birthdays": scan_interval_hours}
+        if entry.data.get(CONF_SHOW_DEATHDAYS, DEFAULT_SHOW_DEATHDAYS):
+            kinds["deathdays"] = entry.data.get(CONF_SCAN_INTERVAL_DEATHDAYS) or scan_interval_hours
+        if entry.data.get(CONF_SHOW_ANNIVERSARIES, DEFAULT_SHOW_ANNIVERSARIES):
+            kinds["anniversaries"] = entry.data.get(CONF_SCAN_INTERVAL_ANNIVERSARIES) or scan_interval_hours
+        if api.event_types:
+            kinds["events"] = entry.data.get(CONF_SCAN_INTERVAL_EVENTS) or scan_interval_hours
+
+        coordinators = {
+            kind: GrampsWebCoordinator(hass, api, entry, scan_interval_hours=hours, kind=kind)
+            for kind, hours in kinds.items()
+        }
+        coordinator = coordinators["birthdays"]
+
+        # Notifications are scheduled from the fetched data, dedupe state is persisted
+        notifier = GrampsNotifier(hass, entry.entry_id)
+        await notifier.async_load()
+        entry.async_on_unload(notifier.async_cancel)
+
+        # Start with the snapshots of the last run until the first fetch is done
+        store = SnapshotStore(hass, entry.entry_id)
+        stored = await store.async_load()
+
+        for kind, kind_coordinator in coordinators.items():
+            kind_coordinator.coordinators = coordinators
+            kind_coordinator.notifier = notifier
+            kind_coordinator.store = store
+            if kind in stored:
+                kind_coordinator.async_restore(stored[kind])
+
+        hass.data[DOMAIN][entry.entry_id] = coordinator
+        async_ensure_feed_token(hass, entry)
+
+        # Roll the countdowns over at local midnight from the cached dates
+        for kind_coordinator in coordinators.values():
+            entry.async_on_unload(
+                async_track_time_change(
+                    hass, kind_coordinator.async_midnight_rollover, hour=0, minute=0, second=0
+                )
+            )
+
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+        async_setup_services(hass)
+        async_register_websocket_commands(hass)
+        async_register_feed_view(hass)
+
+        # Fetch all kinds concurrently in the background, setup doesn't wait
+        for kind, kind_coordinator in coordinators.items():
+            entry.async_create_background_task(
+                hass, kind_coordinator.async_refresh(), f"{DOMAIN} first {kind} refresh"
+            )
+
+        _LOGGER.info("Gramps HA setup completed successfully")
+        return True
+
+    except Exception as err:
+        _LOGGER.error("Failed to setup Gramps HA: %s", err, exc_info=True)
+        return False
+
+
+async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Unload a config entry."""
+    try:
+        if unload_ok := await hass.config_entries.async_unload_platforms(
+            entry, PLATFORMS
+        ):
+            hass.data[DOMAIN].pop(entry.entry_id)
+
+            from .services import async_unload_services
+
+            async_unload_services(hass)
+
+        return unload_ok
+    except Exception as err:
+        _LOGGER.error("Failed to unload Gramps HA: %s", err)
+        return False
+
+
+class GrampsWebCoordinator(DataUpdateCoordinator):
+    """Fetch the upcoming records of one kind on its own schedule.
+
+    There is one coordinator per kind (birthdays, deathdays, anniversaries,
+    events), all sharing the API client and its object cache. The birthdays
+    coordinator is the one stored in hass.data; it reaches the others
+    through `coordinators`. The data of a coordinator is an immutable
+    Snapshot, replaced on every refresh and at midnight. Until the first
+    refresh finished it is the stored snapshot of the last run, if any, or
+    else the partial results of the running refresh. A failed refresh keeps
+    the last snapshot, stores and fires nothing and is retried after
+    RETRY_INTERVAL.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api,
+        entry: ConfigEntry,
+        scan_interval_hours: int = None,
+        kind: str = "birthdays",
+    ) -> None:
+        """Initialize."""
+        if scan_interval_hours is None:
+            scan_interval_hours = DEFAULT_SCAN_INTERVAL
+
+        self._scan_interval = timedelta(hours=scan_interval_hours)
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN}_{kind}",
+            update_interval=self._scan_interval,
+        )
+        self.api = api
+        self.entry = entry
+        self.kind = kind
+        self.coordinators = {kind: self}  # shared between the kinds of an entry
+        self.last_records = None  # previous result, to fire only the changes
+        self.notifier = None
+        self.store = None
+        self.restored_from: date | None = None  # day of the restored snapshot
+        self.progress: dict = {"phase": "pending"}  # of the current refresh
+        self.partial = False  # data holds the partial result of a refresh
+
+    @callback
+    def async_restore(self, snapshot: Snapshot) -> None:
+        """Show a stored snapshot, recomputed for today, until the first fetch.
+
+        Today's events of the stored day were already fired before the
+        restart, so only events that became due since are fired.
+        """
+        today = dt_util.now().date()
+        _LOGGER.debug(
+            "Restoring %s %s from %s", len(snapshot), self.kind, snapshot.today
+        )
+        self.restored_from = snapshot.today
+        self.last_records = snapshot.records
+        # Fetch the people of the restored dates first
+        self.api.remember_dates(self.kind, snapshot.records)
+        self.data = self._publish(snapshot.at(today))
+
+    async def _async_update_data(self):
+        """Fetch data from API."""
+        started = dt_util.utcnow()
+        self.progress = {"phase": "fetching", "started": started.isoformat()}
+        try:
+            _LOGGER.debug("Fetching %s from Gramps Web", self.kind)
+            today = dt_util.now().date()
+            # Count the days in the Home Assistant time zone, not the system's
+            data = await self.hass.async_add_executor_job(
+                partial(
+                    getattr(self.api, f"get_{self.kind}"),
+                    on_batch=self._on_batch,
+                    today=today,
+                )
+            )
+            data = data or []
+            _LOGGER.debug(
+                "%s fetched: %s entries%s",
+                self.kind.capitalize(),
+                len(data),
+                f" | first: {data[0]}" if data else "",
+            )
+            statistics = None
+            if self.kind == "birthdays":
+                statistics = await self.hass.async_add_executor_job(
+                    self.api.get_statistics, self.kind, today
+                )
+
+            snapshot = self._publish(Snapshot.create(self.kind, today, data, statistics))
+            self.partial = False
+            self.update_interval = self._scan_interval
+        except Exception as err:
+            self.progress = {**self.progress, "phase": "failed", "error": str(err)}
+            self.update_interval = min(self._scan_interval, RETRY_INTERVAL)
+            _LOGGER.error("Error fetching %s: %s", self.kind, err, exc_info=True)
+            raise UpdateFailed(f"Error communicating with API: {err}") from err
+
+        finished = dt_util.utcnow()
+        self.progress = {
+            "phase": "done",
+            "started": started.isoformat(),
+            "finished": finished.isoformat(),
+            "seconds": round((finished - started).total_seconds(), 1),
+            "records": len(snapshot),
+        }
+        return snapshot
+
+    def _on_batch(self, records: list, done: int, total: int) -> None:
+        """Pass a partial result from the fetching thread to the event loop."""
+        self.hass.add_job(self._async_partial, records, done, total)
+
+    @callback
+    def _async_partial(self, records: list, done: int, total: int) -> None:
+        """Show the nearest records found so far while a refresh is running.
+
+        Only if there is nothing better to show, i.e. no finished or
+        restored snapshot. Partial results fire no bus events, schedule no
+        notifications and are not stored; that happens for the final one.
+        """
+        if self.progress.get("phase") != "fetching":
+            return  # arrived after the refresh finished
+        self.progress = {**self.progress, "processed": done, "total": total}
+        if self.data is not None and not self.partial:
+            return
+        _LOGGER.debug(
+            "Partial %s after %s of %s: %s entries", self.kind, done, total, len(records)
+        )
+        self.partial = True
+        self.data = Snapshot.create(self.kind, dt_util.now().date(), records)
+        self.async_update_listeners()
+
+    async def async_midnight_rollover(self, now: datetime) -> None:
+        """Recompute days until, ages and next dates for the new day.
+
+        Uses the indexed dates cached by the API client only, so no request
+        is made to Gramps Web; the fetch schedule is left untouched. Only if
+        a fetch window no longer covers the upcoming dates, the kind is
+        fetched again. Walking the index of a large tree takes a while, so
+        it runs in the executor. A partial result is left for its refresh
+        to replace.
+        """
+        if self.data is None or self.partial:
+            return
+
+        today = dt_util.as_local(now).date()
+        if self.api.get_index(self.kind) is None:
+            # Still the restored snapshot, the first fetch didn't finish yet
+            snapshot = self.data.at(today)
+        else:
+            data = await self.hass.async_add_executor_job(
+                self.api.get_upcoming, self.kind, today
+            )
+            if data is None:
+                _LOGGER.debug("Fetch window of %s passed, fetching again", self.kind)
+                await self.async_refresh()
+                return
+            statistics = None
+            if self.kind == "birthdays":
+                statistics = await self.hass.async_add_executor_job(
+                    self.api.get_statistics, self.kind, today
+                )
+            snapshot = Snapshot.create(self.kind, today, data, statistics)
+
+        _LOGGER.debug("Midnight rollover for %s: %s %s", today, len(snapshot), self.kind)
+        self.data = self._publish(snapshot)
+        self.async_update_listeners()
+
+    @callback
+    def _publish(self, snapshot: Snapshot) -> Snapshot:
+        """Fire the bus events, schedule the notifications and store a new snapshot."""
+        self._fire_changes(snapshot.records)
+        # Schedule the "tomorrow" notifications
+        self._schedule_notifications(snapshot.records)
+        if self.store is not None:
+            self.store.async_save(snapshot)
+        return snapshot
+
+    @callback
+    def _fire_changes(self, records: tuple) -> None:
+        """Fire bus events for today's events and changes since the last result.
+
+        Nothing but today's events is fired for the first result, as there
+        is nothing to compare it with.
+        """
+        previous = self.last_records
+        self.last_records = records
+
+        for record in new_today(previous, records):
+            self.hass.bus.async_fire(
+                EVENT_TODAY,
+                {"entry_id": self.entry.entry_id, "kind": self.kind, **record.as_dict()},
+            )
+
+        if previous is None:
+            return
+        if diff := upcoming_diff(previous, records):
+            _LOGGER.debug(
+                "Upcoming %s changed: %s added, %s removed, %s changed",
+                self.kind, len(diff["added"]), len(diff["removed"]), len(diff["changed"]),
+            )
+            self.hass.bus.async_fire(
+                EVENT_UPCOMING_CHANGED,
+                {"entry_id": self.entry.entry_id, "kind": self.kind, **diff},
+            )
+
+    def _schedule_notifications(self, records) -> None:
+        """Hand the current birthdays, deathdays and anniversaries to the notifier."""
+        if self.notifier is None:
+            return
+        records_by_kind = {
+            kind: records if coordinator is self else list(coordinator.data or ())
+            for kind, coordinator in self.coordinators.items()
+            if kind != "events"
+        }
+        self.notifier.async_schedule(records_by_kind)
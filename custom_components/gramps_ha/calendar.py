@@ -0,0 +1,124 @@
+"""Calendar platform for Gramps Web integration.
+
+One calendar per entry shows the yearly recurrences of birthdays and, if
+enabled, deathdays, anniversaries and further event types. Range queries
+are answered from the in-memory date indexes, so any horizon can be shown
+without more entities or requests to Gramps Web.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+
+from homeassistant.components.calendar import CalendarEntity, CalendarEvent
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .records import AnniversaryRecord, BirthdayRecord, DeathdayRecord
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the Gramps Web calendar from a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    async_add_entities([GrampsWebCalendar(coordinator, entry)])
+
+
+def event_summary(record) -> str:
+    """Return the title of the calendar event of a record."""
+    if isinstance(record, BirthdayRecord):
+        return f"🎂 {record.person_name} ({record.age})"
+    if isinstance(record, DeathdayRecord):
+        return f"🕯️ {record.person_name} ({record.years_ago})"
+    if isinstance(record, AnniversaryRecord):
+        return f"💍 {record.person_name} ({record.years_together})"
+    return f"{record.event_type}: {record.person_name} ({record.years})"
+
+
+def _event(kind: str, day: date, record) -> CalendarEvent:
+    """Return the all-day calendar event of a recurrence."""
+    return CalendarEvent(
+        start=day,
+        end=day + timedelta(days=1),
+        summary=event_summary(record),
+        description="Approximate date" if record.approximate else None,
+        uid=f"{kind}:{record.key}:{day.isoformat()}",
+    )
+
+
+class GrampsWebCalendar(CoordinatorEntity, CalendarEntity):
+    """Yearly recurring family dates of all enabled kinds."""
+
+    _attr_icon = "mdi:calendar-heart"
+
+    def __init__(self, coordinator, entry: ConfigEntry) -> None:
+        super().__init__(coordinator)
+        self._entry = entry
+        self._attr_name = "Family Dates"
+        self._attr_unique_id = f"{entry.entry_id}_calendar"
+        self._event: CalendarEvent | None = None
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        return DeviceInfo(identifiers={(DOMAIN, self._entry.entry_id)})
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        # The other kinds update on schedules of their own
+        for coordinator in self.coordinator.coordinators.values():
+            if coordinator is not self.coordinator:
+                self.async_on_remove(
+                    coordinator.async_add_listener(self._handle_coordinator_update)
+                )
+        self._event = self._next_event()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self._event = self._next_event()
+        self.async_write_ha_state()
+
+    def _next_event(self) -> CalendarEvent | None:
+        """Return the next event of all kinds from the current snapshots."""
+        upcoming = [
+            (snapshot.today + timedelta(days=snapshot[0].days_until), kind, snapshot[0])
+            for kind, coordinator in self.coordinator.coordinators.items()
+            if (snapshot := coordinator.data)
+        ]
+        if not upcoming:
+            return None
+        day, kind, record = min(upcoming, key=lambda item: item[0])
+        return _event(kind, day, record)
+
+    @property
+    def event(self) -> CalendarEvent | None:
+        """Return the next upcoming event."""
+        return self._event
+
+    async def async_get_events(
+        self, hass: HomeAssistant, start_date: datetime, end_date: datetime
+    ) -> list[CalendarEvent]:
+        """Return the events between two points in time from the indexes."""
+        start = dt_util.as_local(start_date).date()
+        end = dt_util.as_local(end_date)
+        # All-day events on the end day only count if the range reaches into it
+        end_day = end.date() + timedelta(days=0 if end.time() == time.min else 1)
+
+        events = []
+        for kind in self.coordinator.coordinators:
+            index = self.coordinator.api.get_index(kind)
+            if index is None:
+                continue
+            events.extend(
+                _event(kind, day, record)
+                for day, record in index.between(start, end_day)
+            )
+        events.sort(key=lambda event: event.start)
+        return events
@@ -0,0 +1,49 @@
+"""Differences between two results of upcoming records.
+
+Used to fire Home Assistant bus events for events happening today and for
+changes of the upcoming lists, so automations don't need to watch the
+state of many sensors. Records are matched by their `key` (see records.py).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+
+def _compared(record) -> dict:
+    """Return the attributes compared between results.
+
+    days_until counts down every day and is not a change by itself.
+    """
+    result = record.as_dict()
+    result.pop("days_until", None)
+    return result
+
+
+def new_today(previous: Sequence | None, current: Sequence) -> list:
+    """Return the records happening today that weren't already today before."""
+    already = {
+        record.key for record in previous or () if record.days_until == 0
+    }
+    return [
+        record
+        for record in current
+        if record.days_until == 0 and record.key not in already
+    ]
+
+
+def upcoming_diff(previous: Sequence, current: Sequence) -> dict | None:
+    """Return added, removed and changed records, or None if nothing changed."""
+    before = {record.key: record for record in previous}
+    after = {record.key: record for record in current}
+
+    added = [record.as_dict() for key, record in after.items() if key not in before]
+    removed = [record.as_dict() for key, record in before.items() if key not in after]
+    changed = [
+        record.as_dict()
+        for key, record in after.items()
+        if key in before and _compared(record) != _compared(before[key])
+    ]
+    if not (added or removed or changed):
+        return None
+    return {"added": added, "removed": removed, "changed": changed}
@@ -0,0 +1,119 @@
+"""Columnar store of recurring dates.
+
+When NumPy is installed, the origin dates of an index are kept as year,
+month and day arrays, so next occurrences, days until and years for all
+records are computed in one vectorized pass. Without NumPy the same
+statistics are computed record by record.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import date
+
+from .records import next_occurrence
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+WINDOWS = (7, 30)
+
+
+def _empty_statistics() -> dict:
+    return {
+        "count": 0,
+        "per_month": {month: 0 for month in range(1, 13)},
+        "years_distribution": {},
+        **{f"next_{days}_days": 0 for days in WINDOWS},
+    }
+
+
+def _decade(years: int) -> str:
+    start = max(years, 0) // 10 * 10
+    return f"{start}-{start + 9}"
+
+
+class DateColumns:
+    """Year, month and day arrays of the origin dates of records."""
+
+    __slots__ = ("years", "months", "days")
+
+    def __init__(self, origins: Sequence[date]) -> None:
+        self.years = np.fromiter((d.year for d in origins), np.int32, len(origins))
+        self.months = np.fromiter((d.month for d in origins), np.int32, len(origins))
+        self.days = np.fromiter((d.day for d in origins), np.int32, len(origins))
+
+    def _in_year(self, year: int):
+        """Return the recurrences in a year as datetime64[D].
+
+        February 29 falls back to February 28 in non-leap years.
+        """
+        leap = year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+        days = self.days
+        if not leap:
+            days = np.where((self.months == 2) & (days == 29), 28, days)
+        months = np.datetime64(f"{year:04d}-01", "M") + (self.months - 1)
+        return months.astype("datetime64[D]") + (days - 1)
+
+    def next_occurrences(self, today: date):
+        """Return the next recurrences on or after today as datetime64[D]."""
+        start = np.datetime64(today, "D")
+        this_year = self._in_year(today.year)
+        return np.where(
+            this_year >= start, this_year, self._in_year(today.year + 1)
+        )
+
+    def days_until(self, today: date):
+        """Return the days until the next recurrence of every record."""
+        upcoming = self.next_occurrences(today) - np.datetime64(today, "D")
+        return upcoming.astype(np.int64)
+
+    def years_at_next(self, today: date):
+        """Return the completed years at the next recurrence of every record."""
+        upcoming = self.next_occurrences(today).astype("datetime64[Y]")
+        return upcoming.astype(np.int64) + 1970 - self.years
+
+    def statistics(self, today: date) -> dict:
+        """Return aggregate statistics computed in one vectorized pass."""
+        if not len(self.years):
+            return _empty_statistics()
+
+        days_until = self.days_until(today)
+        years = np.maximum(self.years_at_next(today), 0)
+        per_month = np.bincount(self.months, minlength=13)[1:]
+        decades = np.bincount(years // 10)
+        return {
+            "count": int(len(self.years)),
+            "per_month": {month: int(per_month[month - 1]) for month in range(1, 13)},
+            "years_distribution": {
+                _decade(decade * 10): int(count)
+                for decade, count in enumerate(decades)
+                if count
+            },
+            **{
+                f"next_{days}_days": int(np.count_nonzero(days_until <= days))
+                for days in WINDOWS
+            },
+        }
+
+
+def statistics(origins: Sequence[date], today: date) -> dict:
+    """Return aggregate statistics, record by record (without NumPy)."""
+    result = _empty_statistics()
+    result["count"] = len(origins)
+    distribution = {}
+    for origin in origins:
+        upcoming = next_occurrence(origin, today)
+        days_until = (upcoming - today).days
+        result["per_month"][origin.month] += 1
+        decade = max(upcoming.year - origin.year, 0) // 10
+        distribution[decade] = distribution.get(decade, 0) + 1
+        for days in WINDOWS:
+            if days_until <= days:
+                result[f"next_{days}_days"] += 1
+    result["years_distribution"] = {
+        _decade(decade * 10): distribution[decade] for decade in sorted(distribution)
+    }
+    return result
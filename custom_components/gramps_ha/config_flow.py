@@ -1,65 +1,74 @@
-"""Config flow for Gramps Web integration."""
-from __future__ import annotations
-
-import logging
-from typing import Any
-
-import voluptuous as vol
-
-from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
-from homeassistant.data_entry_flow import FlowResult
-import homeassistant.helpers.config_validation as cv
-
-from .const import DOMAIN, CONF_URL, CONF_USERNAME, CONF_PASSWORD, CONF_NUM_BIRTHDAYS, DEFAULT_NUM_BIRTHDAYS, CONF_SHOW_DEATHDAYS, CONF_SHOW_ANNIVERSARIES, DEFAULT_SHOW_DEATHDAYS, DEFAULT_SHOW_ANNIVERSARIES, CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
-
-_LOGGER = logging.getLogger(__name__)
-
-STEP_USER_DATA_SCHEMA = vol.Schema(
-    {
-        vol.Required(CONF_URL): cv.string,
-        vol.Required(CONF_USERNAME): cv.string,
-        vol.Required(CONF_PASSWORD): cv.string,
-        vol.Optional(CONF_NUM_BIRTHDAYS, default=DEFAULT_NUM_BIRTHDAYS): cv.positive_int,
-        vol.Optional(CONF_SHOW_DEATHDAYS, default=DEFAULT_SHOW_DEATHDAYS): cv.boolean,
-        vol.Optional(CONF_SHOW_ANNIVERSARIES, default=DEFAULT_SHOW_ANNIVERSARIES): cv.boolean,
-        vol.Optional(CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL): cv.positive_int,
-    }
-)
-
-
-class GrampsHAConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
-    """Handle a config flow for Gramps HA."""
-
-    VERSION = 1
-
-    async def async_step_user(
-        self, user_input: dict[str, Any] | None = None
-    ) -> FlowResult:
-        """Handle the initial step."""
-        if user_input is not None:
-            errors = {}
-            
-            # Validate URL format
-            url = user_input.get(CONF_URL, "").strip()
-            if not url:
-                errors[CONF_URL] = "required"
-            elif not url.startswith(("http://", "https://")):
-                errors[CONF_URL] = "invalid_url"
-            
-            if not errors:
-                return self.async_create_entry(
-                    title="Gramps HA",
-                    data=user_input
-                )
-            
-            return self.async_show_form(
-                step_id="user",
-                data_schema=STEP_USER_DATA_SCHEMA,
-                errors=errors,
-            )
-
-        return self.async_show_form(
-            step_id="user",
-            data_schema=STEP_USER_DATA_SCHEMA,
-        )
+"""Config flow for Gramps Web integration."""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant import config_entries
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResult
+import homeassistant.helpers.config_validation as cv
+
+from .const import DOMAIN, CONF_URL, CONF_USERNAME, CONF_PASSWORD, CONF_NUM_BIRTHDAYS, DEFAULT_NUM_BIRTHDAYS, CONF_SHOW_DEATHDAYS, CONF_SHOW_ANNIVERSARIES, DEFAULT_SHOW_DEATHDAYS, DEFAULT_SHOW_ANNIVERSARIES, CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL, CONF_SERVER_FILTERS, DEFAULT_SERVER_FILTERS, CONF_FILTER_TAG, DEFAULT_FILTER_TAG, CONF_FETCH_WINDOW, DEFAULT_FETCH_WINDOW, CONF_EVENT_TYPES, DEFAULT_EVENT_TYPES, CONF_SCAN_INTERVAL_DEATHDAYS, CONF_SCAN_INTERVAL_ANNIVERSARIES, CONF_SCAN_INTERVAL_EVENTS, DEFAULT_KIND_SCAN_INTERVAL, CONF_DYNAMIC_ENTITIES, DEFAULT_DYNAMIC_ENTITIES, CONF_CONSOLIDATED_SENSORS, DEFAULT_CONSOLIDATED_SENSORS
+
+_LOGGER = logging.getLogger(__name__)
+
+STEP_USER_DATA_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_URL): cv.string,
+        vol.Required(CONF_USERNAME): cv.string,
+        vol.Required(CONF_PASSWORD): cv.string,
+        vol.Optional(CONF_NUM_BIRTHDAYS, default=DEFAULT_NUM_BIRTHDAYS): cv.positive_int,
+        vol.Optional(CONF_SHOW_DEATHDAYS, default=DEFAULT_SHOW_DEATHDAYS): cv.boolean,
+        vol.Optional(CONF_SHOW_ANNIVERSARIES, default=DEFAULT_SHOW_ANNIVERSARIES): cv.boolean,
+        vol.Optional(CONF_DYNAMIC_ENTITIES, default=DEFAULT_DYNAMIC_ENTITIES): cv.boolean,
+        vol.Optional(CONF_CONSOLIDATED_SENSORS, default=DEFAULT_CONSOLIDATED_SENSORS): cv.boolean,
+        vol.Optional(CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL): cv.positive_int,
+        vol.Optional(CONF_SCAN_INTERVAL_DEATHDAYS, default=DEFAULT_KIND_SCAN_INTERVAL): cv.positive_int,
+        vol.Optional(CONF_SCAN_INTERVAL_ANNIVERSARIES, default=DEFAULT_KIND_SCAN_INTERVAL): cv.positive_int,
+        vol.Optional(CONF_SCAN_INTERVAL_EVENTS, default=DEFAULT_KIND_SCAN_INTERVAL): cv.positive_int,
+        vol.Optional(CONF_SERVER_FILTERS, default=DEFAULT_SERVER_FILTERS): cv.boolean,
+        vol.Optional(CONF_FILTER_TAG, default=DEFAULT_FILTER_TAG): cv.string,
+        vol.Optional(CONF_FETCH_WINDOW, default=DEFAULT_FETCH_WINDOW): cv.positive_int,
+        vol.Optional(CONF_EVENT_TYPES, default=DEFAULT_EVENT_TYPES): cv.string,
+    }
+)
+
+
+class GrampsHAConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
+    """Handle a config flow for Gramps HA."""
+
+    VERSION = 1
+
+    async def async_step_user(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Handle the initial step."""
+        if user_input is not None:
+            errors = {}
+            
+            # Validate URL format
+            url = user_input.get(CONF_URL, "").strip()
+            if not url:
+                errors[CONF_URL] = "required"
+            elif not url.startswith(("http://", "https://")):
+                errors[CONF_URL] = "invalid_url"
+            
+            if not errors:
+                return self.async_create_entry(
+                    title="Gramps HA",
+                    data=user_input
+                )
+            
+            return self.async_show_form(
+                step_id="user",
+                data_schema=STEP_USER_DATA_SCHEMA,
+                errors=errors,
+            )
+
+        return self.async_show_form(
+            step_id="user",
+            data_schema=STEP_USER_DATA_SCHEMA,
+        )
@@ -1,21 +1,48 @@
-"""Constants for the Gramps HA integration."""
-
-DOMAIN = "gramps_ha"
-DEFAULT_NAME = "Gramps HA"
-
-CONF_URL = "url"
-CONF_USERNAME = "username"
-CONF_PASSWORD = "password"
-CONF_NUM_BIRTHDAYS = "num_birthdays"
-CONF_SHOW_DEATHDAYS = "show_deathdays"
-CONF_SHOW_ANNIVERSARIES = "show_anniversaries"
-CONF_SCAN_INTERVAL = "scan_interval"
-DEFAULT_NUM_BIRTHDAYS = 6
-DEFAULT_SHOW_DEATHDAYS = False
-DEFAULT_SHOW_ANNIVERSARIES = False
-DEFAULT_SCAN_INTERVAL = 7 * 24  # 7 days in hours
-
-ATTR_PERSON_NAME = "person_name"
-ATTR_BIRTH_DATE = "birth_date"
-ATTR_AGE = "age"
-ATTR_DAYS_UNTIL = "days_until"
+"""Constants for the Gramps HA integration."""
+
+DOMAIN = "gramps_ha"
+DEFAULT_NAME = "Gramps HA"
+
+# Kinds of upcoming dates, each with a coordinator of its own
+KINDS = ("birthdays", "deathdays", "anniversaries", "events")
+
+CONF_URL = "url"
+CONF_USERNAME = "username"
+CONF_PASSWORD = "password"
+CONF_NUM_BIRTHDAYS = "num_birthdays"
+CONF_SHOW_DEATHDAYS = "show_deathdays"
+CONF_SHOW_ANNIVERSARIES = "show_anniversaries"
+CONF_SCAN_INTERVAL = "scan_interval"
+CONF_SERVER_FILTERS = "server_filters"
+CONF_FILTER_TAG = "filter_tag"
+CONF_FETCH_WINDOW = "fetch_window_days"
+CONF_EVENT_TYPES = "event_types"
+CONF_SCAN_INTERVAL_DEATHDAYS = "scan_interval_deathdays"
+CONF_SCAN_INTERVAL_ANNIVERSARIES = "scan_interval_anniversaries"
+CONF_SCAN_INTERVAL_EVENTS = "scan_interval_events"
+CONF_DYNAMIC_ENTITIES = "dynamic_entities"
+CONF_CONSOLIDATED_SENSORS = "consolidated_sensors"
+CONF_FEED_TOKEN = "feed_token"  # generated, secret of the iCalendar feed URL
+DEFAULT_NUM_BIRTHDAYS = 6
+DEFAULT_SHOW_DEATHDAYS = False
+DEFAULT_SHOW_ANNIVERSARIES = False
+DEFAULT_SCAN_INTERVAL = 7 * 24  # 7 days in hours
+DEFAULT_SERVER_FILTERS = True
+DEFAULT_FILTER_TAG = ""
+DEFAULT_FETCH_WINDOW = 0  # 0 = scan the whole tree
+DEFAULT_EVENT_TYPES = ""  # comma separated, e.g. "Baptism, Graduation"
+DEFAULT_KIND_SCAN_INTERVAL = 0  # hours, 0 = same as the scan interval
+DEFAULT_DYNAMIC_ENTITIES = False  # False = all slots, also without data
+DEFAULT_CONSOLIDATED_SENSORS = False  # False = one sensor per field and slot
+
+# iCalendar feed of an entry, see ics.py
+FEED_PATH = "/api/gramps_ha/{entry_id}/family_dates.ics"
+
+# Events fired on the Home Assistant bus
+EVENT_TODAY = f"{DOMAIN}_event_today"
+EVENT_UPCOMING_CHANGED = f"{DOMAIN}_upcoming_changed"
+
+ATTR_PERSON_NAME = "person_name"
+ATTR_BIRTH_DATE = "birth_date"
+ATTR_AGE = "age"
+ATTR_DAYS_UNTIL = "days_until"
@@ -0,0 +1,86 @@
+"""Normalization of Gramps dates.
+
+Gramps Web serializes every date with a `sortval`, the Julian day number of
+the (start) date converted to the Gregorian calendar, next to the raw
+`dateval` fields, a `modifier` and a `quality`. The sortval is used directly,
+so no guessing of the field order is needed and dates from other calendars
+are converted correctly.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+
+from .models import Date
+
+# Gramps date modifiers
+MOD_NONE = 0
+MOD_BEFORE = 1
+MOD_AFTER = 2
+MOD_ABOUT = 3
+MOD_RANGE = 4
+MOD_SPAN = 5
+MOD_TEXTONLY = 6
+
+# Gramps date qualities
+QUAL_NONE = 0
+QUAL_ESTIMATED = 1
+QUAL_CALCULATED = 2
+
+# Julian day number of 0001-01-01 minus one, i.e. sortval - ordinal
+SORTVAL_OFFSET = 1721425
+
+
+@dataclass(slots=True, frozen=True)
+class GrampsDate:
+    """A Gramps date normalized to a Gregorian date.
+
+    For ranges and spans the value is the start date.
+    """
+
+    value: date
+    approximate: bool = False
+    is_range: bool = False
+
+    @property
+    def inexact(self) -> bool:
+        """Return True if the date is approximate or a range."""
+        return self.approximate or self.is_range
+
+
+def normalize_date(gramps_date: Date | None) -> GrampsDate | None:
+    """Normalize a Gramps date, or return None if it has no usable day.
+
+    Text-only dates and dates without day, month or year cannot recur
+    yearly and are rejected.
+    """
+    if gramps_date is None or gramps_date.modifier == MOD_TEXTONLY:
+        return None
+
+    dateval = gramps_date.dateval
+    if len(dateval) < 3:
+        return None
+    try:
+        day, month, year = (int(v) for v in dateval[:3])
+    except (TypeError, ValueError):
+        return None
+    if not (day and month and year):
+        return None
+
+    try:
+        if gramps_date.sortval > SORTVAL_OFFSET:
+            value = date.fromordinal(gramps_date.sortval - SORTVAL_OFFSET)
+        else:
+            value = date(year, month, day)
+    except ValueError:
+        return None
+
+    return GrampsDate(
+        value=value,
+        approximate=(
+            gramps_date.modifier in (MOD_BEFORE, MOD_AFTER, MOD_ABOUT)
+            or gramps_date.quality != QUAL_NONE
+        ),
+        is_range=gramps_date.modifier in (MOD_RANGE, MOD_SPAN),
+    )
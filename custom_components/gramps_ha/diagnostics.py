@@ -0,0 +1,47 @@
+"""Diagnostics support for Gramps HA."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_FEED_TOKEN, CONF_PASSWORD, CONF_URL, CONF_USERNAME, DOMAIN
+
+TO_REDACT = {CONF_FEED_TOKEN, CONF_PASSWORD, CONF_URL, CONF_USERNAME}
+
+
+def _kind_diagnostics(coordinator) -> dict[str, Any]:
+    """Return the state and refresh progress of the coordinator of a kind."""
+    snapshot = coordinator.data
+    index = coordinator.api.get_index(coordinator.kind)
+    return {
+        "update_interval": str(coordinator.update_interval),
+        "last_update_success": coordinator.last_update_success,
+        "last_exception": (
+            str(coordinator.last_exception) if coordinator.last_exception else None
+        ),
+        "refresh": dict(coordinator.progress),
+        "restored_from": (
+            coordinator.restored_from.isoformat() if coordinator.restored_from else None
+        ),
+        "snapshot_day": snapshot.today.isoformat() if snapshot is not None else None,
+        "upcoming": len(snapshot) if snapshot is not None else None,
+        "indexed": len(index) if index is not None else None,
+    }
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    return {
+        "entry": async_redact_data(dict(entry.data), TO_REDACT),
+        "kinds": {
+            kind: _kind_diagnostics(kind_coordinator)
+            for kind, kind_coordinator in coordinator.coordinators.items()
+        },
+    }
@@ -1,1357 +1,1890 @@
-"""API client for Gramps Web."""
-
-import logging
-from datetime import datetime, date, timedelta
-import requests
-import hashlib
-import os
-
-_LOGGER = logging.getLogger(__name__)
-
-
-class GrampsWebAPI:
-    """Class to interact with Gramps Web API."""
-
-    def __init__(
-        self,
-        url: str,
-        username: str = None,
-        password: str = None,
-        hass_config_path: str = None,
-    ):
-        """Initialize the API client."""
-        self.url = url.rstrip("/")
-        self.username = username
-        self.password = password
-        self.token = None
-        self._session = requests.Session()
-        self.hass_config_path = hass_config_path
-
-        # Create images directory
-        if self.hass_config_path:
-            self.images_dir = os.path.join(self.hass_config_path, "www", "gramps")
-            os.makedirs(self.images_dir, exist_ok=True)
-        
-        # Caching: Store fetched data with timestamps
-        self._cache = {
-            "people": None,
-            "people_timestamp": None,
-            "birthdays": None,
-            "birthdays_timestamp": None,
-            "deathdays": None,
-            "deathdays_timestamp": None,
-            "anniversaries": None,
-            "anniversaries_timestamp": None,
-        }
-        self._cache_ttl_seconds = 3600  # Cache for 1 hour
-
-    def _authenticate(self):
-        """Authenticate with the Gramps Web API."""
-        if not self.username or not self.password:
-            return True
-
-        try:
-            response = self._session.post(
-                f"{self.url}/api/token/",
-                json={
-                    "username": self.username,
-                    "password": self.password,
-                },
-                timeout=10,
-            )
-            response.raise_for_status()
-            data = response.json()
-            self.token = data.get("access_token")
-
-            if self.token:
-                self._session.headers.update({"Authorization": f"Bearer {self.token}"})
-            return True
-        except Exception as err:
-            _LOGGER.warning("Failed to authenticate with Gramps Web: %s", err)
-            return False
-
-    def _get(self, endpoint: str, params: dict = None):
-        """Make a GET request to the API."""
-        if not self.token and self.username:
-            self._authenticate()
-
-        try:
-            url = f"{self.url}/api/{endpoint}"
-            _LOGGER.debug("GET request to: %s", url)
-
-            response = self._session.get(
-                url,
-                params=params,
-                timeout=30,
-            )
-            response.raise_for_status()
-
-            _LOGGER.debug("Response status: %s", response.status_code)
-            return response.json()
-        except Exception as err:
-            _LOGGER.error("API request to %s failed: %s", endpoint, err, exc_info=True)
-            raise
-
-    def _resolve_event_handle(self, event_ref: dict) -> str | None:
-        """Resolve an event handle from different possible keys."""
-        if not event_ref:
-            return None
-
-        # Gramps may provide the event reference under different keys
-        handle = None
-        for key in ("ref", "handle", "hlink"):
-            candidate = event_ref.get(key)
-            if candidate:
-                handle = candidate
-                break
-
-        if not handle or not isinstance(handle, str):
-            return None
-
-        # If the handle looks like a URL/path, keep only the last segment
-        if "/" in handle:
-            handle = handle.rstrip("/").split("/")[-1]
-
-        return handle
-
-    async def get_event_types(self) -> list[dict]:
-        """Fetch all available event types from Gramps Web."""
-        try:
-            _LOGGER.info("Fetching all event types from Gramps Web...")
-
-            # Try to fetch event types
-            # Gramps Web API endpoint for event types
-            event_types = self._get("event_types")
-
-            if isinstance(event_types, list):
-                _LOGGER.info("Found %s event types", len(event_types))
-                for et in event_types:
-                    _LOGGER.info("  - %s", et)
-                return event_types
-            elif isinstance(event_types, dict):
-                # Sometimes returns dict with 'types' key
-                types_list = event_types.get("types", event_types.get("results", []))
-                _LOGGER.info("Found %s event types", len(types_list))
-                for et in types_list:
-                    _LOGGER.info("  - %s", et)
-                return types_list
-
-            _LOGGER.warning(
-                "Unexpected event types response format: %s", type(event_types)
-            )
-            return []
-
-        except Exception as err:
-            _LOGGER.error("Failed to fetch event types: %s", err)
-            return []
-
-    async def get_all_events(self) -> list[dict]:
-        """Fetch all events (not just birthdays) from Gramps Web."""
-        try:
-            _LOGGER.info("Fetching all events from Gramps Web...")
-
-            events = self._get("events")
-
-            if isinstance(events, dict):
-                results = events.get("results", [])
-                _LOGGER.info("Found %s events", len(results))
-                return results
-            elif isinstance(events, list):
-                _LOGGER.info("Found %s events", len(events))
-                return events
-
-            return []
-
-        except Exception as err:
-            _LOGGER.error("Failed to fetch events: %s", err)
-            return []
-
-        return handle
-
-    def _parse_dateval(self, dateval):
-        """Convert Gramps date structures into a Python date using safe heuristics."""
-        try:
-            # Accept dict structures: {"val": [year, month, day]} or start/end
-            if isinstance(dateval, dict):
-                if "val" in dateval:
-                    dateval = dateval.get("val")
-                elif "start" in dateval:  # sometimes ranges
-                    dateval = dateval.get("start")
-
-            if not isinstance(dateval, (list, tuple)):
-                return None
-
-            # We only need the first three entries for day/month/year
-            vals = list(dateval[:3])
-            if len(vals) < 3:
-                return None
-
-            # Ensure all are integers
-            try:
-                vals = [int(v) for v in vals]
-            except Exception:
-                return None
-
-            # Try combinations with a plausible year (>= 100)
-            combinations = [
-                (2, 1, 0),  # dateval = [day, month, year]
-                (0, 1, 2),  # dateval = [year, month, day]
-                (0, 2, 1),  # dateval = [year, day, month]
-            ]
-
-            for y_idx, m_idx, d_idx in combinations:
-                year, month, day = vals[y_idx], vals[m_idx], vals[d_idx]
-                if year < 100:
-                    continue
-                if not (1 <= month <= 12 and 1 <= day <= 31):
-                    continue
-                return date(year, month, day)
-
-            return None
-        except Exception:
-            return None
-
-    def _ensure_person_events(self, person: dict) -> dict:
-        """Ensure a person dict has event_ref_list by refetching details if needed."""
-        try:
-            event_ref_list = person.get("event_ref_list", []) or []
-            birth_ref_index = person.get("birth_ref_index", -1)
-
-            # If we already have events and a birth ref index, keep as is
-            if event_ref_list:
-                return person
-
-            handle = person.get("handle")
-            if not handle:
-                return person
-
-            try:
-                detailed = self._get(f"people/{handle}")
-                # Only update the minimal fields we care about
-                if detailed:
-                    person["event_ref_list"] = detailed.get(
-                        "event_ref_list", event_ref_list
-                    )
-                    person["birth_ref_index"] = detailed.get(
-                        "birth_ref_index", birth_ref_index
-                    )
-                    person["death_ref_index"] = detailed.get(
-                        "death_ref_index", person.get("death_ref_index", -1)
-                    )
-            except Exception as err:
-                _LOGGER.debug("Could not fetch detailed person %s: %s", handle, err)
-
-            return person
-        except Exception:
-            return person
-
-    def _is_cache_valid(self, cache_key: str) -> bool:
-        """Check if cached data is still valid."""
-        timestamp_key = f"{cache_key}_timestamp"
-        if self._cache[cache_key] is None or self._cache[timestamp_key] is None:
-            return False
-        
-        age = datetime.now() - self._cache[timestamp_key]
-        return age.total_seconds() < self._cache_ttl_seconds
-
-    def get_people(self):
-        """Get all people from Gramps Web with caching."""
-        # Check cache first
-        if self._is_cache_valid("people"):
-            _LOGGER.debug("Returning cached people data")
-            return self._cache["people"]
-        
-        _LOGGER.debug("Fetching people from %s (cache miss)", self.url)
-        try:
-            result = self._get("people/")
-            _LOGGER.debug("API response type: %s", type(result))
-            
-            # Update cache
-            self._cache["people"] = result
-            self._cache["people_timestamp"] = datetime.now()
-            
-            return result
-        except Exception as err:
-            _LOGGER.error("Failed to get people: %s", err, exc_info=True)
-            raise
-
-    def get_birthdays(self, limit: int = 50):
-        """Get upcoming birthdays from Gramps Web with caching."""
-        # Check cache first
-        if self._is_cache_valid("birthdays"):
-            _LOGGER.debug("Returning cached birthdays data")
-            return self._cache["birthdays"]
-        
-        try:
-            _LOGGER.info("Fetching birthdays from Gramps Web API (cache miss)")
-
-            # Get all people
-            try:
-                all_people = self.get_people()
-                _LOGGER.info(
-                    "Fetched %s people from Gramps Web",
-                    len(all_people) if isinstance(all_people, list) else "unknown",
-                )
-            except Exception as people_err:
-                _LOGGER.error("Failed to fetch people: %s", people_err, exc_info=True)
-                return []
-
-            if not all_people:
-                _LOGGER.warning("No people data returned from Gramps Web")
-                return []
-
-            # Diagnostics: check sample people (first 5) for events
-            _LOGGER.info("Running diagnostics on first 5 people...")
-            for idx, person in enumerate(all_people[:5]):
-                name = self._get_person_name(person)
-                handle = person.get("handle")
-                _LOGGER.info(
-                    "Person %s (%s): event_ref_list=%s, birth_ref_index=%s",
-                    idx + 1,
-                    name,
-                    len(person.get("event_ref_list", [])),
-                    person.get("birth_ref_index", -1),
-                )
-
-                # Try fetching detailed info
-                if handle:
-                    try:
-                        detailed = self._get(f"people/{handle}")
-                        detailed_events = detailed.get("event_ref_list", [])
-                        _LOGGER.info(
-                            "  -> After detail fetch: event_ref_list=%s, birth_ref_index=%s",
-                            len(detailed_events),
-                            detailed.get("birth_ref_index", -1),
-                        )
-                        if detailed_events:
-                            _LOGGER.info("  -> First event ref: %s", detailed_events[0])
-                    except Exception as diag_err:
-                        _LOGGER.warning("  -> Could not fetch details: %s", diag_err)
-
-            # Filter to only include people with a birth date
-            _LOGGER.info("Filtering %s people for birth dates...", len(all_people))
-            people_data = []
-            for idx, person in enumerate(all_people):
-                if idx % 50 == 0:
-                    _LOGGER.debug("Processed %s/%s people...", idx, len(all_people))
-                person = self._ensure_person_events(person)
-                if self._has_birth_date(person):
-                    people_data.append(person)
-            _LOGGER.info(
-                "Filtered to %s people with birth dates (from %s total)",
-                len(people_data),
-                len(all_people),
-            )
-
-            if not people_data:
-                _LOGGER.warning("No people with birth dates found")
-                return []
-
-            birthdays = []
-            people_with_birth = 0
-            living_people = 0
-            deceased_people = 0
-
-            today = date.today()
-            current_year = today.year
-
-            # Sample first person for debugging
-            if people_data:
-                sample = people_data[0]
-                _LOGGER.debug("Sample person data: %s", sample)
-                _LOGGER.debug(
-                    "Sample birth_ref_index: %s", sample.get("birth_ref_index")
-                )
-                _LOGGER.debug(
-                    "Sample event_ref_list length: %s",
-                    len(sample.get("event_ref_list", [])),
-                )
-                if sample.get("event_ref_list"):
-                    _LOGGER.debug(
-                        "Sample first event: %s", sample.get("event_ref_list")[0]
-                    )
-
-            # Search for specific person: Erdal Akkaya
-            for p in people_data:
-                pname = self._get_person_name(p)
-                if "erdal" in pname.lower() and "akkaya" in pname.lower():
-                    _LOGGER.info("Found Erdal Akkaya:")
-                    _LOGGER.info("  Full data: %s", p)
-                    _LOGGER.info("  birth_ref_index: %s", p.get("birth_ref_index"))
-                    _LOGGER.info("  death_ref_index: %s", p.get("death_ref_index"))
-                    _LOGGER.info("  event_ref_list: %s", p.get("event_ref_list"))
-                    break
-
-            for person in people_data:
-                # Get name
-                name = self._get_person_name(person)
-
-                # Get birth event
-                birth_date = self._extract_birth_date(person)
-                if not birth_date:
-                    # Should not happen since we pre-filtered, but handle it
-                    continue
-
-                people_with_birth += 1
-
-                # Check if person is still alive
-                is_alive = self._is_person_alive(person)
-
-                if is_alive:
-                    living_people += 1
-                else:
-                    deceased_people += 1
-                    _LOGGER.debug("Skipping deceased person: %s", name)
-                    continue
-
-                # Calculate next birthday (pass person data for image)
-                next_birthday_info = self._calculate_next_birthday(
-                    birth_date, name, person
-                )
-
-                if next_birthday_info:
-                    birthdays.append(next_birthday_info)
-
-            _LOGGER.info(
-                "Summary - Total with birth date: %s, Living: %s, Deceased: %s",
-                people_with_birth,
-                living_people,
-                deceased_people,
-            )
-            _LOGGER.info("Found %s birthdays from living people", len(birthdays))
-
-            # Sort by days until birthday
-            birthdays.sort(key=lambda x: x["days_until"])
-
-            result = birthdays[:limit]
-            
-            # Update cache
-            self._cache["birthdays"] = result
-            self._cache["birthdays_timestamp"] = datetime.now()
-            
-            return result
-
-        except Exception as err:
-            _LOGGER.error("Failed to fetch birthdays: %s", err, exc_info=True)
-            return []
-
-    def _has_birth_date(self, person: dict) -> bool:
-        """Check if person has a birth date set."""
-        try:
-            person = self._ensure_person_events(person)
-            # Check birth_ref_index
-            birth_ref_index = person.get("birth_ref_index", -1)
-            event_ref_list = person.get("event_ref_list", [])
-
-            # If birth_ref_index is valid, we have a birth date
-            if birth_ref_index >= 0 and birth_ref_index < len(event_ref_list):
-                event_handle = self._resolve_event_handle(
-                    event_ref_list[birth_ref_index]
-                )
-                if event_handle:
-                    parsed = self._fetch_event_date(event_handle)
-                    if parsed:
-                        return True
-
-            # Otherwise, check if there's a birth event in the list
-            for event_ref in event_ref_list:
-                event_handle = self._resolve_event_handle(event_ref)
-                if not event_handle:
-                    continue
-                try:
-                    parsed = self._fetch_event_date(event_handle)
-                    if parsed:
-                        return True
-                except Exception:
-                    continue
-
-            return False
-
-        except Exception as err:
-            _LOGGER.debug("Error checking birth date: %s", err)
-            return False
-
-    def _extract_birth_date(self, person: dict):
-        """Extract birth date from person data."""
-        try:
-            person = self._ensure_person_events(person)
-            birth_ref_index = person.get("birth_ref_index", -1)
-            event_ref_list = person.get("event_ref_list", [])
-
-            # If birth_ref_index is valid, try that reference first
-            if birth_ref_index >= 0 and birth_ref_index < len(event_ref_list):
-                event_handle = self._resolve_event_handle(
-                    event_ref_list[birth_ref_index]
-                )
-                if event_handle:
-                    parsed = self._fetch_event_date(event_handle, require_birth=True)
-                    if parsed:
-                        return parsed
-
-            # Otherwise, scan all events for a birth event
-            for event_ref in event_ref_list:
-                event_handle = self._resolve_event_handle(event_ref)
-                if not event_handle:
-                    continue
-                try:
-                    parsed = self._fetch_event_date(event_handle, require_birth=True)
-                    if parsed:
-                        return parsed
-                except Exception as event_err:
-                    _LOGGER.debug(
-                        "Could not fetch event %s: %s", event_handle, event_err
-                    )
-                    continue
-
-            return None
-
-        except Exception as err:
-            _LOGGER.debug("Could not extract birth date: %s", err)
-            return None
-
-    def _fetch_event_date(self, event_handle: str, require_birth: bool = False):
-        """Fetch and parse an event date, optionally requiring a birth event."""
-        try:
-            if not event_handle:
-                return None
-
-            # Clean up handle if it's a path-like string
-            handle = event_handle
-            if "/" in handle:
-                handle = handle.rstrip("/").split("/")[-1]
-
-            event_data = self._get(f"events/{handle}")
-
-            if require_birth:
-                event_type = event_data.get("type", {})
-                type_string = (
-                    event_type.get("string", "")
-                    if isinstance(event_type, dict)
-                    else str(event_type)
-                )
-                if "birth" not in type_string.lower():
-                    return None
-
-            date_info = event_data.get("date", {})
-            parsed = self._parse_dateval(date_info.get("dateval", []))
-            if parsed:
-                _LOGGER.debug("Parsed event date: %s", parsed)
-                return parsed
-
-            return None
-        except Exception as err:
-            _LOGGER.debug("Could not fetch event date: %s", err)
-            return None
-
-    def _is_person_alive(self, person: dict) -> bool:
-        """Check if person is still alive (no death date)."""
-        try:
-            # Check death_ref_index
-            death_ref_index = person.get("death_ref_index", -1)
-
-            if death_ref_index == -1:
-                # No death event, person is alive
-                return True
-
-            # Person has a death event, they are deceased
-            _LOGGER.debug("Person has death_ref_index: %s", death_ref_index)
-            return False
-
-        except Exception as err:
-            _LOGGER.debug("Could not determine if person is alive: %s", err)
-            # If we can't determine, assume person is alive
-            return True
-
-    def _parse_gramps_date(self, date_str: str):
-        """Parse Gramps date format to Python date."""
-        try:
-            # Gramps can have various date formats
-            # Common format: "1990-01-15" or "15 Jan 1990"
-            if "-" in date_str and len(date_str) == 10:
-                return datetime.strptime(date_str, "%Y-%m-%d").date()
-            # Add more parsing logic as needed
-            return None
-        except Exception:
-            return None
-
-    def _get_person_name(self, person: dict):
-        """Get person's display name."""
-        try:
-            primary_name = person.get("primary_name", {})
-            first_name = primary_name.get("first_name", "")
-
-            # Get surname from surname_list
-            surname_list = primary_name.get("surname_list", [])
-            surname = ""
-            if surname_list:
-                surname = surname_list[0].get("surname", "")
-
-            full_name = f"{first_name} {surname}".strip()
-            return full_name if full_name else "Unknown"
-        except Exception:
-            return "Unknown"
-
-    def _get_person_image_url(self, person: dict) -> str | None:
-        """Get the URL for a person's profile image."""
-        try:
-            # Get person handle
-            person_handle = person.get("handle", "")
-            if not person_handle:
-                _LOGGER.debug("No person handle found")
-                return None
-
-            # Check media_list for images
-            media_list = person.get("media_list", [])
-            if not media_list:
-                _LOGGER.debug("No media_list for person %s", person_handle)
-                return None
-
-            # Get first media reference
-            media_ref = media_list[0]
-            media_handle = None
-
-            # Extract media handle from various possible keys
-            for key in ("ref", "handle", "hlink"):
-                candidate = media_ref.get(key)
-                if candidate:
-                    media_handle = candidate
-                    break
-
-            if not media_handle:
-                _LOGGER.debug("Could not extract media handle from: %s", media_ref)
-                return None
-
-            # Clean handle if it's a path
-            if "/" in media_handle:
-                media_handle = media_handle.rstrip("/").split("/")[-1]
-
-            # Construct thumbnail URL
-            thumbnail_url = f"{self.url}/api/media/{media_handle}/thumbnail/200"
-
-            # Download and save image locally
-            if self.hass_config_path:
-                return self._download_image(thumbnail_url, person_handle, media_handle)
-
-            # Fallback to remote URL
-            _LOGGER.debug("Image URL for person: %s", thumbnail_url)
-            return thumbnail_url
-
-        except Exception as err:
-            _LOGGER.debug("Could not get person image: %s", err)
-            return None
-
-    def _download_image(
-        self, image_url: str, person_handle: str, media_handle: str
-    ) -> str | None:
-        """Download image and return local path."""
-        try:
-            # Create filename from handles
-            filename_hash = hashlib.md5(
-                f"{person_handle}_{media_handle}".encode()
-            ).hexdigest()
-            filename = f"{filename_hash}.jpg"
-            filepath = os.path.join(self.images_dir, filename)
-
-            # Check if already downloaded
-            if os.path.exists(filepath):
-                _LOGGER.debug("Image already cached: %s", filepath)
-                return f"/local/gramps/{filename}"
-
-            # Download image
-            _LOGGER.debug("Downloading image from: %s", image_url)
-            response = self._session.get(image_url, timeout=10)
-            response.raise_for_status()
-
-            # Save to file
-            with open(filepath, "wb") as f:
-                f.write(response.content)
-
-            _LOGGER.info("Downloaded image to: %s", filepath)
-            return f"/local/gramps/{filename}"
-
-        except Exception as err:
-            _LOGGER.warning("Failed to download image: %s", err)
-            return image_url  # Fallback to remote URL
-
-    def _calculate_next_birthday(
-        self, birth_date: date, name: str, person: dict = None
-    ):
-        """Calculate next birthday occurrence."""
-        try:
-            today = date.today()
-            current_year = today.year
-
-            # Calculate this year's birthday
-            this_year_birthday = birth_date.replace(year=current_year)
-
-            # If birthday already passed this year, use next year
-            if this_year_birthday < today:
-                next_birthday = birth_date.replace(year=current_year + 1)
-            else:
-                next_birthday = this_year_birthday
-
-            days_until = (next_birthday - today).days
-            age = next_birthday.year - birth_date.year
-
-            # Get image URL and handle if person data is provided
-            image_url = None
-            person_handle = None
-            if person:
-                image_url = self._get_person_image_url(person)
-                person_handle = person.get("handle")
-
-            result = {
-                "person_name": name,
-                "birth_date": birth_date.isoformat(),
-                "next_birthday": next_birthday.isoformat(),
-                "age": age,
-                "days_until": days_until,
-            }
-
-            if image_url:
-                result["image_url"] = image_url
-            if person_handle:
-                result["person_handle"] = person_handle
-
-            return result
-
-        except Exception as err:
-            _LOGGER.debug("Could not calculate birthday for %s: %s", name, err)
-            return None
-
-    def get_deathdays(self, limit: int = 50):
-        """Get upcoming deathdays/memorial dates from Gramps Web with caching."""
-        # Check cache first
-        if self._is_cache_valid("deathdays"):
-            _LOGGER.debug("Returning cached deathdays data")
-            return self._cache["deathdays"]
-        
-        try:
-            _LOGGER.info("Fetching deathdays from Gramps Web API (cache miss)")
-
-            all_people = self.get_people()
-            if not isinstance(all_people, list):
-                _LOGGER.warning(
-                    "Unexpected response type for people: %s", type(all_people)
-                )
-                return []
-
-            _LOGGER.info("Checking %s people for death dates...", len(all_people))
-
-            # Diagnostics: check sample people (first 5) for death events
-            _LOGGER.info("Running diagnostics on first 5 people for death events...")
-            for idx, person in enumerate(all_people[:5]):
-                name = self._get_person_name(person)
-                death_ref_index = person.get("death_ref_index", -1)
-                event_ref_list = person.get("event_ref_list", [])
-                _LOGGER.info(
-                    "Person %s (%s): death_ref_index=%s, event_ref_list length=%s",
-                    idx + 1,
-                    name,
-                    death_ref_index,
-                    len(event_ref_list),
-                )
-
-                # Log all events to see their types
-                if event_ref_list:
-                    for event_idx, event_ref in enumerate(event_ref_list):
-                        event_handle = (
-                            event_ref.get("ref")
-                            or event_ref.get("handle")
-                            or event_ref.get("hlink")
-                        )
-                        if event_handle:
-                            try:
-                                event = self._get_event(event_handle)
-                                if event:
-                                    event_type = event.get("type", {})
-                                    type_string = (
-                                        event_type.get("string", "")
-                                        if isinstance(event_type, dict)
-                                        else str(event_type)
-                                    )
-                                    _LOGGER.info(
-                                        "  Event %s: type=%s, has date=%s",
-                                        event_idx,
-                                        type_string,
-                                        "date" in event,
-                                    )
-                            except Exception as e:
-                                _LOGGER.debug(
-                                    "Could not fetch event %s: %s", event_handle, e
-                                )
-
-            deathdays = []
-            candidates = 0
-            no_death_ref = 0
-            failed_calculation = 0
-
-            for idx, person in enumerate(all_people):
-                if idx % 50 == 0:
-                    _LOGGER.debug(
-                        "Processed %s/%s people for deathdays...", idx, len(all_people)
-                    )
-
-                self._ensure_person_events(person)
-
-                if self._has_death_date(person):
-                    candidates += 1
-                    deathday = self._calculate_next_deathday(person)
-                    if deathday:
-                        deathdays.append(deathday)
-                    else:
-                        failed_calculation += 1
-                else:
-                    no_death_ref += 1
-
-            # Sort by days until deathday
-            deathdays.sort(key=lambda x: x.get("days_until", 999))
-
-            _LOGGER.info(
-                "Deathdays result: %s total people, %s without death_ref_index, %s candidates with death dates, %s failed calculation, %s entries after success%s",
-                len(all_people),
-                no_death_ref,
-                candidates,
-                failed_calculation,
-                len(deathdays),
-                f" | first: {deathdays[0]}" if deathdays else "",
-            )
-
-            # Return limited list
-            result = deathdays[:limit]
-            
-            # Update cache
-            self._cache["deathdays"] = result
-            self._cache["deathdays_timestamp"] = datetime.now()
-            
-            return result
-
-        except Exception as err:
-            _LOGGER.error("Failed to get deathdays: %s", err, exc_info=True)
-            return []
-
-    def get_anniversaries(self, limit: int = 50):
-        """Get upcoming anniversaries from Gramps Web with caching."""
-        # Check cache first
-        if self._is_cache_valid("anniversaries"):
-            _LOGGER.debug("Returning cached anniversaries data")
-            return self._cache["anniversaries"]
-        
-        try:
-            _LOGGER.info("Fetching anniversaries from Gramps Web API (cache miss)")
-
-            all_people = self.get_people()
-            if not isinstance(all_people, list):
-                _LOGGER.warning(
-                    "Unexpected response type for people: %s", type(all_people)
-                )
-                return []
-
-            # First pass: collect all anniversaries with event handles
-            anniversaries_with_events = {}  # key: (marriage_date, event_handle)
-            person_by_handle = {}  # key: person_handle, value: person_obj
-            marriage_events = 0
-
-            for person in all_people:
-                self._ensure_person_events(person)
-                person_handle = person.get("handle", "")
-                person_name = self._get_person_name(person)
-                person_by_handle[person_handle] = person
-
-                # Look for marriage events
-                marriage_dates = self._get_marriage_dates(person)
-                marriage_events += len(marriage_dates)
-                for spouse_name, marriage_date, event_handle, family_handle in marriage_dates:
-                    key = (str(marriage_date), event_handle)
-                    
-                    if key not in anniversaries_with_events:
-                        anniversaries_with_events[key] = {
-                            "person_names": set(),
-                            "person_handles": [],
-                            "marriage_date": marriage_date,
-                            "event_handle": event_handle,
-                            "spouse_name": spouse_name,
-                            "family_handle": family_handle,
-                        }
-                    
-                    anniversaries_with_events[key]["person_names"].add(person_name)
-                    if person_handle not in anniversaries_with_events[key]["person_handles"]:
-                        anniversaries_with_events[key]["person_handles"].append(person_handle)
-
-            # Second pass: create anniversary entries and find partners
-            anniversaries = []
-            seen_events = set()
-            
-            for (date_str, event_handle), data in anniversaries_with_events.items():
-                # Skip if we already processed this event
-                if event_handle in seen_events:
-                    continue
-                seen_events.add(event_handle)
-                
-                # Get the list of people for this event
-                person_names = sorted(data["person_names"])
-                person_handles = data.get("person_handles", [])
-                marriage_date = data["marriage_date"]
-                family_handle = data.get("family_handle")
-                
-                # Create anniversary entry
-                if len(person_names) >= 2:
-                    # We have both partners, combine them
-                    combined_name = " & ".join(person_names[:2])
-                    person1_handle = person_handles[0] if len(person_handles) > 0 else None
-                    person2_handle = person_handles[1] if len(person_handles) > 1 else None
-                else:
-                    # We only have one person, use the spouse name if available
-                    combined_name = f"{person_names[0]}"
-                    if data["spouse_name"]:
-                        combined_name = f"{person_names[0]} & {data['spouse_name']}"
-                    person1_handle = person_handles[0] if len(person_handles) > 0 else None
-                    person2_handle = None
-                
-                anniversary = self._calculate_anniversary(
-                    combined_name.split(" & ")[0],
-                    combined_name.split(" & ")[1] if " & " in combined_name else data["spouse_name"] or "Unknown",
-                    marriage_date,
-                    family_handle,
-                    person1_handle,
-                    person2_handle,
-                    person_by_handle
-                )
-                if anniversary:
-                    # Update the person_name to the combined version
-                    anniversary["person_name"] = combined_name
-                    anniversaries.append(anniversary)
-
-            # Sort by days until anniversary
-            anniversaries.sort(key=lambda x: x.get("days_until", 999))
-
-            _LOGGER.info(
-                "Anniversaries result: %s marriage events, %s entries after deduplication%s",
-                marriage_events,
-                len(anniversaries),
-                f" | first: {anniversaries[0]}" if anniversaries else "",
-            )
-
-            # Return limited list
-            result = anniversaries[:limit]
-            
-            # Update cache
-            self._cache["anniversaries"] = result
-            self._cache["anniversaries_timestamp"] = datetime.now()
-            
-            return result
-
-        except Exception as err:
-            _LOGGER.error("Failed to get anniversaries: %s", err, exc_info=True)
-            return []
-
-    def _has_death_date(self, person: dict) -> bool:
-        """Check if person has a death date."""
-        try:
-            person_name = self._get_person_name(person)
-            death_ref_index = person.get("death_ref_index", -1)
-
-            if death_ref_index < 0:
-                _LOGGER.debug(
-                    "Person %s: no death_ref_index (value: %s)",
-                    person_name,
-                    death_ref_index,
-                )
-                return False
-
-            event_ref_list = person.get("event_ref_list", [])
-            if death_ref_index >= len(event_ref_list):
-                _LOGGER.debug(
-                    "Person %s: death_ref_index %s out of range (event_ref_list length: %s)",
-                    person_name,
-                    death_ref_index,
-                    len(event_ref_list),
-                )
-                return False
-
-            death_ref = event_ref_list[death_ref_index]
-            handle = (
-                death_ref.get("ref")
-                or death_ref.get("handle")
-                or death_ref.get("hlink")
-            )
-
-            if not handle:
-                _LOGGER.debug("Person %s: no handle in death_ref", person_name)
-                return False
-
-            event = self._get_event(handle)
-            if not event:
-                _LOGGER.debug(
-                    "Person %s: could not fetch event with handle %s",
-                    person_name,
-                    handle,
-                )
-                return False
-
-            # Verify this is actually a Death event
-            event_type = event.get("type", {})
-            type_string = (
-                event_type.get("string", "")
-                if isinstance(event_type, dict)
-                else str(event_type)
-            )
-            if "death" not in type_string.lower():
-                _LOGGER.debug(
-                    "Person %s: event type is '%s', not Death", person_name, type_string
-                )
-                return False
-
-            dateval = event.get("date", {})
-            raw_dateval = None
-            if isinstance(dateval, dict):
-                raw_dateval = (
-                    dateval.get("dateval") or dateval.get("val") or dateval.get("start")
-                )
-            else:
-                raw_dateval = dateval
-
-            parsed = self._parse_dateval(raw_dateval)
-
-            if not parsed:
-                _LOGGER.debug(
-                    "Person %s: could not parse death date from %s (raw=%s)",
-                    person_name,
-                    dateval,
-                    raw_dateval,
-                )
-                return False
-
-            _LOGGER.debug(
-                "Person %s: has death date %s (event type: %s)",
-                person_name,
-                parsed,
-                type_string,
-            )
-            return bool(parsed)
-
-        except Exception as err:
-            _LOGGER.debug(
-                "Error checking death date for %s: %s",
-                person.get("handle", "unknown"),
-                err,
-            )
-            return False
-
-    def _get_marriage_dates(self, person: dict) -> list:
-        """Get all marriage dates from person and family events.
-        
-        Returns list of tuples: (spouse_name_or_none, marriage_date, event_handle, family_handle)
-        where event_handle is used to find the partner later.
-        """
-        marriage_dates = []
-        try:
-            person_handle = person.get("handle", "")
-            event_ref_list = person.get("event_ref_list", [])
-            families = person.get("family_list", [])
-
-            # Collect possible spouse handles from families
-            # family_list contains STRINGS (handles), not dictionaries!
-            spouse_handles = set()
-            for family_handle_or_ref in families:
-                # If it's a dict, extract handle; if it's a string, use directly
-                if isinstance(family_handle_or_ref, dict):
-                    family_handle = (
-                        family_handle_or_ref.get("ref")
-                        or family_handle_or_ref.get("handle")
-                        or family_handle_or_ref.get("hlink")
-                    )
-                else:
-                    # It's a string (the handle directly)
-                    family_handle = family_handle_or_ref
-
-                if not family_handle:
-                    continue
-
-                family = self._get_family(family_handle)
-                if not family:
-                    continue
-
-                for parent_rel in family.get("parent_rel_list", []):
-                    spouse_handle = parent_rel.get("ref") or parent_rel.get("handle")
-                    if spouse_handle and spouse_handle != person_handle:
-                        spouse_handles.add(spouse_handle)
-
-                # Process marriage events attached to the family
-                for event_ref in family.get("event_ref_list", []):
-                    ev_handle = (
-                        event_ref.get("ref")
-                        or event_ref.get("handle")
-                        or event_ref.get("hlink")
-                    )
-                    if not ev_handle:
-                        continue
-                    event = self._get_event(ev_handle)
-                    if not event:
-                        continue
-
-                    event_type = event.get("type", {})
-                    type_string = (
-                        event_type.get("string", "")
-                        if isinstance(event_type, dict)
-                        else str(event_type)
-                    )
-                    if "marriage" not in type_string.lower() and "engagement" not in type_string.lower():
-                        continue
-
-                    dateval = event.get("date", {})
-                    raw_dateval = None
-                    if isinstance(dateval, dict):
-                        raw_dateval = (
-                            dateval.get("dateval")
-                            or dateval.get("val")
-                            or dateval.get("start")
-                        )
-                    else:
-                        raw_dateval = dateval
-
-                    parsed_dateval = self._parse_dateval(raw_dateval)
-                    if not parsed_dateval:
-                        continue
-
-                    for spouse_handle in spouse_handles or [None]:
-                        spouse_name = None
-                        if spouse_handle:
-                            try:
-                                spouse_person = self._get(f"people/{spouse_handle}")
-                                if spouse_person:
-                                    spouse_name = self._get_person_name(spouse_person)
-                            except Exception:
-                                spouse_name = None
-                        marriage_dates.append((spouse_name, parsed_dateval, ev_handle, family_handle))
-
-            # Also process any marriage events directly attached to the person
-            for event_ref in event_ref_list:
-                # event_ref_list should contain dicts with .get() method
-                if not isinstance(event_ref, dict):
-                    continue
-
-                event_handle = (
-                    event_ref.get("ref")
-                    or event_ref.get("handle")
-                    or event_ref.get("hlink")
-                )
-                if not event_handle:
-                    continue
-
-                event = self._get_event(event_handle)
-                if not event:
-                    continue
-
-                event_type = event.get("type", {})
-                type_string = (
-                    event_type.get("string", "")
-                    if isinstance(event_type, dict)
-                    else str(event_type)
-                )
-                if "marriage" not in type_string.lower() and "engagement" not in type_string.lower():
-                    continue
-
-                dateval = event.get("date", {})
-                raw_dateval = None
-                if isinstance(dateval, dict):
-                    raw_dateval = (
-                        dateval.get("dateval")
-                        or dateval.get("val")
-                        or dateval.get("start")
-                    )
-                else:
-                    raw_dateval = dateval
-
-                parsed_dateval = self._parse_dateval(raw_dateval)
-                if not parsed_dateval:
-                    continue
-
-                # If we know spouses, emit one entry per spouse; otherwise None
-                if spouse_handles:
-                    for spouse_handle in spouse_handles:
-                        spouse_name = None
-                        try:
-                            spouse_person = self._get(f"people/{spouse_handle}")
-                            if spouse_person:
-                                spouse_name = self._get_person_name(spouse_person)
-                        except Exception:
-                            spouse_name = None
-                        marriage_dates.append((spouse_name, parsed_dateval, event_handle))
-                else:
-                    # Return None for spouse_name to signal we need to find the partner
-                    marriage_dates.append((None, parsed_dateval, event_handle))
-
-            return marriage_dates
-
-        except Exception as err:
-            _LOGGER.debug("Error getting marriage dates: %s", err)
-            return []
-
-    def _get_event(self, handle: str):
-        """Get event details from API."""
-        try:
-            if not handle:
-                return None
-            event = self._get(f"events/{handle}")
-            if event:
-                _LOGGER.debug(
-                    "Fetched event %s: type=%s", handle, event.get("type", {})
-                )
-            return event
-        except Exception as err:
-            _LOGGER.debug("Could not fetch event %s: %s", handle, err)
-            return None
-
-    def _get_family(self, handle: str):
-        """Get family details from API."""
-        try:
-            return self._get(f"families/{handle}")
-        except Exception:
-            return None
-
-    def _calculate_next_deathday(self, person: dict) -> dict | None:
-        """Calculate next deathday for a person."""
-        try:
-            death_ref_index = person.get("death_ref_index", -1)
-            if death_ref_index < 0:
-                return None
-
-            event_ref_list = person.get("event_ref_list", [])
-            if death_ref_index >= len(event_ref_list):
-                return None
-
-            death_ref = event_ref_list[death_ref_index]
-            handle = (
-                death_ref.get("ref")
-                or death_ref.get("handle")
-                or death_ref.get("hlink")
-            )
-
-            event = self._get_event(handle)
-            if not event:
-                return None
-
-            # Verify this is actually a Death event
-            event_type = event.get("type", {})
-            type_string = (
-                event_type.get("string", "")
-                if isinstance(event_type, dict)
-                else str(event_type)
-            )
-            if "death" not in type_string.lower():
-                name = self._get_person_name(person)
-                _LOGGER.debug(
-                    "Person %s: death_ref_index points to non-Death event type: %s",
-                    name,
-                    type_string,
-                )
-                return None
-
-            dateval = event.get("date", {})
-            raw_dateval = None
-            if isinstance(dateval, dict):
-                raw_dateval = (
-                    dateval.get("dateval") or dateval.get("val") or dateval.get("start")
-                )
-            else:
-                raw_dateval = dateval
-
-            death_date = self._parse_dateval(raw_dateval)
-
-            if not death_date:
-                return None
-
-            today = date.today()
-            next_deathday = death_date.replace(year=today.year)
-
-            if next_deathday < today:
-                next_deathday = next_deathday.replace(year=today.year + 1)
-
-            days_until = (next_deathday - today).days
-
-            name = self._get_person_name(person)
-            years_ago = today.year - death_date.year
-            person_handle = person.get("handle")
-            
-            # Get image URL if person data is provided
-            image_url = self._get_person_image_url(person)
-
-            result = {
-                "person_name": name,
-                "death_date": death_date.isoformat(),
-                "next_deathday": next_deathday.isoformat(),
-                "years_ago": years_ago,
-                "days_until": days_until,
-                "person_handle": person_handle,
-            }
-            
-            if image_url:
-                result["image_url"] = image_url
-            
-            return result
-
-        except Exception as err:
-            _LOGGER.debug("Could not calculate deathday: %s", err)
-            return None
-
-    def _calculate_anniversary(
-        self, person1_name: str, person2_name: str, dateval, family_handle: str = None, 
-        person1_handle: str = None, person2_handle: str = None, person_by_handle: dict = None
-    ) -> dict | None:
-        """Calculate next anniversary for a couple."""
-        try:
-            # dateval can already be a date object (from _get_marriage_dates)
-            # or it can be a dict/list that needs parsing
-            if isinstance(dateval, date):
-                marriage_date = dateval
-            else:
-                marriage_date = self._parse_dateval(dateval)
-
-            if not marriage_date:
-                return None
-
-            today = date.today()
-            next_anniversary = marriage_date.replace(year=today.year)
-
-            if next_anniversary < today:
-                next_anniversary = next_anniversary.replace(year=today.year + 1)
-
-            days_until = (next_anniversary - today).days
-            years_together = today.year - marriage_date.year
-
-            # Build person_name string
-            if person2_name and person2_name != "Unknown":
-                person_name_str = f"{person1_name} & {person2_name}"
-            else:
-                person_name_str = person1_name
-
-            result = {
-                "person_name": person_name_str,
-                "marriage_date": marriage_date.isoformat(),
-                "next_anniversary": next_anniversary.isoformat(),
-                "years_together": years_together,
-                "days_until": days_until,
-            }
-
-            if family_handle:
-                result["family_handle"] = family_handle
-            
-            # Get images for both partners if available
-            if person_by_handle and person1_handle and person1_handle in person_by_handle:
-                person1 = person_by_handle[person1_handle]
-                image1 = self._get_person_image_url(person1)
-                if image1:
-                    result["image_url_person1"] = image1
-            
-            if person_by_handle and person2_handle and person2_handle in person_by_handle:
-                person2 = person_by_handle[person2_handle]
-                image2 = self._get_person_image_url(person2)
-                if image2:
-                    result["image_url_person2"] = image2
-
-            return result
-
-        except Exception as err:
-            _LOGGER.debug("Could not calculate anniversary: %s", err)
-            return None
+"""API client for Gramps Web."""
+
+import logging
+from collections import Counter
+from collections.abc import Callable
+from datetime import datetime, date, timedelta
+import requests
+import hashlib
+import json
+import os
+import threading
+from dataclasses import replace
+
+from .dates import GrampsDate, normalize_date
+from .index import DateIndex, NearestRecords
+from .models import Event, EventRef, Family, Person, PersonSummary, decode
+from .records import (
+    AnniversaryRecord,
+    BirthdayRecord,
+    DeathdayRecord,
+    EventRecord,
+    next_occurrence,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+MARRIAGE_EVENT_TYPES = ("Marriage", "Engagement")
+BATCH_SIZE = 50  # people or events between two partial results
+
+# Called from the fetching thread with the nearest records found so far and
+# the number of processed and total people or events
+BatchCallback = Callable[[list, int, int], None]
+
+
+class GrampsWebAPI:
+    """Class to interact with Gramps Web API."""
+
+    def __init__(
+        self,
+        url: str,
+        username: str = None,
+        password: str = None,
+        hass_config_path: str = None,
+        server_filters: bool = True,
+        filter_tag: str = None,
+        window_days: int = 0,
+        event_types: list[str] = None,
+    ):
+        """Initialize the API client."""
+        self.url = url.rstrip("/")
+        self.username = username
+        self.password = password
+        self.token = None
+        self._session = requests.Session()
+        self.hass_config_path = hass_config_path
+        self.server_filters = server_filters
+        self.filter_tag = (filter_tag or "").strip() or None
+        self.window_days = max(int(window_days or 0), 0)
+        self.event_types = [t.strip() for t in event_types or [] if t.strip()]
+        self._known_event_types = None
+        # Normalized dates keyed by (event handle, change stamp)
+        self._date_cache: dict[tuple[str, int], GrampsDate | None] = {}
+
+        # Create images directory
+        if self.hass_config_path:
+            self.images_dir = os.path.join(self.hass_config_path, "www", "gramps")
+            os.makedirs(self.images_dir, exist_ok=True)
+        
+        # Caching: Store fetched data with timestamps
+        self._cache = {
+            "people": None,
+            "people_timestamp": None,
+            "people_birthdays": None,
+            "people_birthdays_timestamp": None,
+            "people_deathdays": None,
+            "people_deathdays_timestamp": None,
+            "people_anniversaries": None,
+            "people_anniversaries_timestamp": None,
+            "window_events": None,
+            "window_events_timestamp": None,
+            "window_events_until": None,
+            "person_details": None,
+            "person_details_timestamp": None,
+            "marriage_events": None,
+            "marriage_events_timestamp": None,
+            "typed_events": None,
+            "typed_events_timestamp": None,
+            "birthdays": None,
+            "birthdays_timestamp": None,
+            "deathdays": None,
+            "deathdays_timestamp": None,
+            "anniversaries": None,
+            "anniversaries_timestamp": None,
+            "events": None,
+            "events_timestamp": None,
+            "tag_handle": None,
+            "tag_handle_timestamp": None,
+        }
+        self._cache_ttl_seconds = 3600  # Cache for 1 hour
+
+        # The kinds are fetched concurrently from executor threads; a lock per
+        # shared cache key lets them wait for one download instead of each
+        # making its own.
+        self._fetch_locks: dict[str, threading.RLock] = {}
+        self._fetch_locks_guard = threading.Lock()
+
+        # Negative cache: people without a usable birth/death date, keyed by
+        # kind and person handle with the change stamp at the time of the
+        # check. Editing an event does not touch the person's change stamp,
+        # so entries also expire after a day.
+        self._undated: dict[str, dict[str, tuple[int, datetime]]] = {
+            "birth": {},
+            "death": {},
+        }
+        self._undated_ttl_seconds = 86400
+
+        # Dates per person handle known from an earlier run, see remember_dates
+        self._known_dates: dict[str, dict[str, date]] = {}
+
+    def _authenticate(self):
+        """Authenticate with the Gramps Web API."""
+        if not self.username or not self.password:
+            return True
+
+        try:
+            response = self._session.post(
+                f"{self.url}/api/token/",
+                json={
+                    "username": self.username,
+                    "password": self.password,
+                },
+                timeout=10,
+            )
+            response.raise_for_status()
+            data = response.json()
+            self.token = data.get("access_token")
+
+            if self.token:
+                self._session.headers.update({"Authorization": f"Bearer {self.token}"})
+            return True
+        except Exception as err:
+            _LOGGER.warning("Failed to authenticate with Gramps Web: %s", err)
+            return False
+
+    def _get(
+        self, endpoint: str, params: dict = None, model: type = None, many: bool = False
+    ):
+        """Make a GET request to the API.
+
+        With a model, the response is decoded into typed objects (a list of
+        them if many is set) instead of plain dicts.
+        """
+        if not self.token and self.username:
+            self._authenticate()
+
+        try:
+            url = f"{self.url}/api/{endpoint}"
+            _LOGGER.debug("GET request to: %s", url)
+
+            response = self._session.get(
+                url,
+                params=params,
+                timeout=30,
+            )
+            response.raise_for_status()
+
+            _LOGGER.debug("Response status: %s", response.status_code)
+            if model is not None:
+                return decode(response.content, model, many)
+            return response.json()
+        except Exception as err:
+            _LOGGER.error("API request to %s failed: %s", endpoint, err, exc_info=True)
+            raise
+
+    def _resolve_event_handle(self, event_ref: EventRef) -> str | None:
+        """Resolve the event handle of an event reference."""
+        if not event_ref:
+            return None
+
+        handle = event_ref.ref
+        if not handle or not isinstance(handle, str):
+            return None
+
+        # If the handle looks like a URL/path, keep only the last segment
+        if "/" in handle:
+            handle = handle.rstrip("/").split("/")[-1]
+
+        return handle
+
+    def get_event_types(self) -> list[str]:
+        """Fetch the default and custom event types known to Gramps Web."""
+        if self._known_event_types is not None:
+            return self._known_event_types
+
+        try:
+            types = self._get("types/")
+            event_types = []
+            for group in ("default", "custom"):
+                for event_type in (types.get(group) or {}).get("event_types", []):
+                    if event_type and event_type not in event_types:
+                        event_types.append(event_type)
+            _LOGGER.debug("Found %s event types", len(event_types))
+            self._known_event_types = event_types
+        except Exception as err:
+            _LOGGER.warning("Failed to fetch event types: %s", err)
+            return []
+
+        return self._known_event_types
+
+    def _canonical_event_types(self) -> list[str]:
+        """Match the configured event types against the types known to Gramps Web.
+
+        The HasType rule compares exactly, so "baptism" is sent as "Baptism".
+        Unknown types are kept as configured.
+        """
+        if not self.event_types:
+            return []
+        known = {t.lower(): t for t in self.get_event_types()}
+        canonical = []
+        for event_type in self.event_types:
+            if event_type.lower() not in known:
+                _LOGGER.warning("Unknown event type configured: %s", event_type)
+            canonical.append(known.get(event_type.lower(), event_type))
+        return canonical
+
+    def get_all_events(self, event_types: list[str]) -> list[Event]:
+        """Fetch all events of the given types including their backlinks.
+
+        A single rule-filtered request on /api/events/ serves every
+        configured type, however many there are.
+        """
+        with self._fetch_lock("typed_events"):
+            if self._is_cache_valid("typed_events"):
+                _LOGGER.debug("Returning cached typed events")
+                return self._cache["typed_events"]
+
+            rules = {
+                "function": "or",
+                "rules": [
+                    {"name": "HasType", "values": [event_type]}
+                    for event_type in event_types
+                ],
+            }
+            result = self._get(
+                "events/",
+                params={"rules": json.dumps(rules), "backlinks": 1},
+                model=Event,
+                many=True,
+            )
+
+            # The server may ignore unknown rules, so double check the type
+            wanted = {event_type.lower() for event_type in event_types}
+            events = [event for event in result if event.type_string in wanted]
+            _LOGGER.info(
+                "Fetched %s events of types %s with backlinks",
+                len(events),
+                ", ".join(event_types),
+            )
+
+            self._cache["typed_events"] = events
+            self._cache["typed_events_timestamp"] = datetime.now()
+            return events
+
+    def _project_person(self, person: Person) -> PersonSummary:
+        """Project a person into its cached form.
+
+        People listed without events are refetched once in detail, so the
+        projection carries their birth/death references.
+        """
+        if not person.event_ref_list and person.handle:
+            try:
+                detailed = self._get(f"people/{person.handle}", model=Person)
+                if detailed and detailed.event_ref_list:
+                    person = detailed
+            except Exception as err:
+                _LOGGER.debug(
+                    "Could not fetch detailed person %s: %s", person.handle, err
+                )
+        return PersonSummary.from_person(person)
+
+    def _fetch_lock(self, cache_key: str) -> threading.RLock:
+        """Return the lock serializing the fetches of a cache key."""
+        with self._fetch_locks_guard:
+            return self._fetch_locks.setdefault(cache_key, threading.RLock())
+
+    def remember_dates(self, kind: str, records) -> None:
+        """Remember the dates of records of a kind, e.g. of a stored snapshot.
+
+        A full scan then processes these people first, see _soonest_first.
+        """
+        self._known_dates[kind] = {
+            record.person_handle: record.origin
+            for record in records
+            if getattr(record, "person_handle", None)
+        }
+
+    def _soonest_first(
+        self, people: tuple[PersonSummary, ...], kind: str, today: date
+    ) -> list[PersonSummary]:
+        """Order people by the next recurrence of their known date of a kind.
+
+        Dates are known from the previous index (also when expired) and from
+        remember_dates. People without a known date keep their order after
+        the others.
+        """
+        known = dict(self._known_dates.get(kind, {}))
+        if (index := self._cache.get(kind)) is not None:
+            known.update(
+                (record.person_handle, record.origin)
+                for record in index
+                if record.person_handle
+            )
+        if not known:
+            return list(people)
+
+        def days_until(person: PersonSummary) -> int:
+            origin = known.get(person.handle)
+            if origin is None:
+                return 366
+            return (next_occurrence(origin, today) - today).days
+
+        return sorted(people, key=days_until)
+
+    def _events_soonest_first(self, events: list[Event], today: date) -> list[Event]:
+        """Order events by the next recurrence of their date, undated last."""
+
+        def days_until(event: Event) -> int:
+            event_date = self._event_date(event)
+            if event_date is None:
+                return 366
+            return (next_occurrence(event_date.value, today) - today).days
+
+        return sorted(events, key=days_until)
+
+    def _report_batch(
+        self,
+        on_batch: BatchCallback | None,
+        nearest: NearestRecords,
+        done: int,
+        total: int,
+    ) -> None:
+        """Hand the nearest records so far to on_batch after every batch."""
+        if on_batch is None or not done or done % BATCH_SIZE or done >= total:
+            return
+        on_batch(nearest.records(), done, total)
+
+    def _is_cache_valid(self, cache_key: str) -> bool:
+        """Check if cached data is still valid."""
+        timestamp_key = f"{cache_key}_timestamp"
+        if self._cache.get(cache_key) is None or self._cache.get(timestamp_key) is None:
+            return False
+        
+        age = datetime.now() - self._cache[timestamp_key]
+        return age.total_seconds() < self._cache_ttl_seconds
+
+    def _is_known_undated(self, person: PersonSummary, kind: str) -> bool:
+        """Check if a person is known to have no usable date of a kind."""
+        entry = self._undated[kind].get(person.handle)
+        if entry is None:
+            return False
+        change, checked = entry
+        if change != person.change:
+            return False
+        age = datetime.now() - checked
+        return age.total_seconds() < self._undated_ttl_seconds
+
+    def _mark_undated(self, person: PersonSummary, kind: str) -> None:
+        """Remember that a person has no usable date of a kind."""
+        if person.handle:
+            self._undated[kind][person.handle] = (person.change, datetime.now())
+
+    @staticmethod
+    def _is_unreachable(err: Exception) -> bool:
+        """Check if an error means Gramps Web can't be reached right now.
+
+        Scans stop on these instead of skipping one person after the other;
+        other errors (e.g. a missing event) only affect a single person.
+        """
+        if isinstance(err, requests.HTTPError):
+            status = getattr(err.response, "status_code", None)
+            return status is not None and status >= 500
+        return isinstance(err, (requests.ConnectionError, requests.Timeout))
+
+    def _people_rules(self, kind: str = None) -> dict | None:
+        """Build the Gramps filter rules pushed to the server for a data kind.
+
+        Birthdays only need living people with a birth event and deathdays
+        only people with a death event. The optional tag filter applies to
+        every kind. Returns None when no server-side filtering applies.
+        """
+        if not self.server_filters:
+            return None
+
+        rules = []
+        if kind == "birthdays":
+            rules.append({"name": "ProbablyAlive", "values": [""]})
+            rules.append({"name": "HasBirth", "values": ["", "", ""]})
+        elif kind == "deathdays":
+            rules.append({"name": "HasDeath", "values": ["", "", ""]})
+
+        if self.filter_tag:
+            rules.append({"name": "HasTag", "values": [self.filter_tag]})
+
+        if not rules:
+            return None
+        return {"function": "and", "rules": rules}
+
+    def _tagged(self, people: tuple[PersonSummary, ...]) -> tuple[PersonSummary, ...]:
+        """Keep only the people with the configured tag, if one is set.
+
+        The server applies the tag with the people rules, but not when server
+        filters are off or were dropped after the server rejected them, so
+        the people scans always check it here as well.
+        """
+        if not self.filter_tag:
+            return people
+        tag_handle = self._tag_handle()
+        return tuple(person for person in people if tag_handle in person.tag_list)
+
+    def get_people(self, kind: str = None) -> tuple[PersonSummary, ...]:
+        """Get people from Gramps Web with caching.
+
+        When a kind is given and server filters are enabled, the matching
+        Gramps rules are sent along so only the relevant subset is downloaded.
+        Only the projected PersonSummary form is cached, never the payload.
+        """
+        rules = self._people_rules(kind)
+        cache_key = f"people_{kind}" if rules else "people"
+
+        with self._fetch_lock(cache_key):
+            # Check cache first
+            if self._is_cache_valid(cache_key):
+                _LOGGER.debug("Returning cached %s data", cache_key)
+                return self._cache[cache_key]
+
+            _LOGGER.debug("Fetching %s from %s (cache miss)", cache_key, self.url)
+            try:
+                params = {"rules": json.dumps(rules)} if rules else None
+                try:
+                    result = self._get("people/", params=params, model=Person, many=True)
+                except requests.HTTPError as http_err:
+                    status = getattr(http_err.response, "status_code", None)
+                    if not rules or status not in (400, 422):
+                        raise
+                    _LOGGER.warning(
+                        "Gramps Web rejected the people filter (HTTP %s), "
+                        "falling back to client-side filtering",
+                        status,
+                    )
+                    self.server_filters = False
+                    return self.get_people(kind)
+
+                _LOGGER.debug("API response type: %s", type(result))
+                if rules:
+                    _LOGGER.info(
+                        "Server-side filter for %s returned %s people",
+                        kind,
+                        len(result),
+                    )
+
+                people = tuple(self._project_person(person) for person in result)
+
+                # Update cache
+                self._cache[cache_key] = people
+                self._cache[f"{cache_key}_timestamp"] = datetime.now()
+
+                return people
+            except Exception as err:
+                _LOGGER.error("Failed to get people: %s", err, exc_info=True)
+                raise
+
+    def _event_date(self, event: Event) -> GrampsDate | None:
+        """Return the normalized date of an event.
+
+        The result is cached per event handle and change stamp, so an event
+        is only normalized again after it was edited in Gramps.
+        """
+        if not event or not event.date:
+            return None
+        if not event.handle:
+            return normalize_date(event.date)
+
+        key = (event.handle, event.change)
+        if key not in self._date_cache:
+            self._date_cache[key] = normalize_date(event.date)
+        return self._date_cache[key]
+
+    def _window_months(self, today: date, days: int) -> list[int]:
+        """Return the months touched by the window [today, today + days]."""
+        end = today + timedelta(days=days)
+        months = []
+        current = date(today.year, today.month, 1)
+        while current <= end and len(months) < 12:
+            if current.month not in months:
+                months.append(current.month)
+            if current.month == 12:
+                current = date(current.year + 1, 1, 1)
+            else:
+                current = date(current.year, current.month + 1, 1)
+        return months
+
+    def get_window_events(self, today: date = None) -> list[Event]:
+        """Fetch birth, death and marriage events whose month/day fall in the fetch window.
+
+        Uses the Gramps Web `dates` filter with a `*/month/*` pattern for every
+        month touched by the window (wrapping over New Year) and requests the
+        backlinks so the referencing people are known without a people scan.
+        Cached events are only reused for the day they were fetched for.
+        """
+        today = today or date.today()
+        until = today + timedelta(days=self.window_days)
+        with self._fetch_lock("window_events"):
+            if (
+                self._is_cache_valid("window_events")
+                and self._cache["window_events_until"] == until
+            ):
+                _LOGGER.debug("Returning cached window events")
+                return self._cache["window_events"]
+
+            rules = {
+                "function": "or",
+                "rules": [
+                    {"name": "HasType", "values": [event_type]}
+                    for event_type in ("Birth", "Death")
+                    + MARRIAGE_EVENT_TYPES
+                    + tuple(self._canonical_event_types())
+                ],
+            }
+
+            events = []
+            for month in self._window_months(today, self.window_days):
+                result = self._get(
+                    "events/",
+                    params={
+                        "dates": f"*/{month}/*",
+                        "rules": json.dumps(rules),
+                        "backlinks": 1,
+                    },
+                    model=Event,
+                    many=True,
+                )
+                for event in result:
+                    parsed = self._event_date(event)
+                    if not parsed:
+                        continue
+                    days_until = (next_occurrence(parsed.value, today) - today).days
+                    if days_until <= self.window_days:
+                        events.append(event)
+
+            _LOGGER.info(
+                "Window query: %s events in the next %s days",
+                len(events),
+                self.window_days,
+            )
+
+            self._cache["window_events"] = events
+            self._cache["window_events_timestamp"] = datetime.now()
+            self._cache["window_events_until"] = until
+            # Person details are only valid together with the window events
+            self._cache["person_details"] = {}
+            self._cache["person_details_timestamp"] = datetime.now()
+
+            return events
+
+    def _window_until(self) -> date | None:
+        """Return the last day covered by the window events, None without a window.
+
+        An index built from the window events only knows the dates up to this
+        day, see DateIndex.until.
+        """
+        if not self.window_days:
+            return None
+        return self._cache["window_events_until"]
+
+    def _get_person(self, handle: str) -> PersonSummary | None:
+        """Get a single person by handle, cached alongside the window events.
+
+        A person that can't be fetched is None and not cached; errors that
+        mean Gramps Web is unreachable are raised.
+        """
+        if not handle:
+            return None
+
+        if not self._is_cache_valid("person_details"):
+            self._cache["person_details"] = {}
+            self._cache["person_details_timestamp"] = datetime.now()
+
+        details = self._cache["person_details"]
+        if handle not in details:
+            try:
+                details[handle] = PersonSummary.from_person(
+                    self._get(f"people/{handle}", model=Person)
+                )
+            except Exception as err:
+                if self._is_unreachable(err):
+                    raise
+                _LOGGER.debug("Could not fetch person %s: %s", handle, err)
+                return None
+        return details[handle]
+
+    def _tag_handle(self) -> str | None:
+        """Resolve the configured tag name to its Gramps handle.
+
+        The result is cached like the fetched data. A tag that doesn't exist
+        resolves to "" so that no one matches; a failed request raises and is
+        not cached, so it is tried again on the next fetch.
+        """
+        if not self.filter_tag:
+            return None
+        with self._fetch_lock("tag_handle"):
+            if self._is_cache_valid("tag_handle"):
+                return self._cache["tag_handle"]
+
+            tag_handle = next(
+                (
+                    tag.get("handle", "")
+                    for tag in self._get("tags/") or []
+                    if tag.get("name") == self.filter_tag
+                ),
+                "",
+            )
+            if not tag_handle:
+                _LOGGER.warning(
+                    "Tag %s not found in Gramps Web, no one matches the tag filter",
+                    self.filter_tag,
+                )
+
+            self._cache["tag_handle"] = tag_handle
+            self._cache["tag_handle_timestamp"] = datetime.now()
+            return tag_handle
+
+    def _window_people_for_event(
+        self, event: Event, ref_key: str
+    ) -> list[PersonSummary]:
+        """Return the people whose birth/death reference points to an event.
+
+        The event backlinks list every person referencing the event; only
+        those with the event as their own birth or death (ref_key) and
+        matching the optional tag filter are returned.
+        """
+        event_handle = event.handle
+        backlinks = event.backlinks or {}
+        tag_handle = self._tag_handle()
+
+        people = []
+        for person_handle in backlinks.get("person", []) or []:
+            person = self._get_person(person_handle)
+            if not person:
+                continue
+
+            if self.filter_tag and tag_handle not in person.tag_list:
+                continue
+
+            if getattr(person, ref_key) == event_handle:
+                people.append(person)
+        return people
+
+    def _get_birthdays_windowed(
+        self, today: date, on_batch: BatchCallback | None = None, limit: int = 50
+    ) -> DateIndex:
+        """Build upcoming birthdays from the windowed event query only.
+
+        The nearest events are processed first, so every partial result
+        handed to on_batch already holds the nearest birthdays.
+        """
+        birthdays = []
+        nearest = NearestRecords(limit)
+        events = [
+            event
+            for event in self.get_window_events(today)
+            if "birth" in event.type_string
+        ]
+        events = self._events_soonest_first(events, today)
+        for idx, event in enumerate(events):
+            self._report_batch(on_batch, nearest, idx, len(events))
+            birth_date = self._event_date(event)
+            if not birth_date:
+                continue
+            for person in self._window_people_for_event(event, "birth_ref"):
+                if not self._is_person_alive(person):
+                    continue
+                info = self._calculate_next_birthday(
+                    birth_date, self._get_person_name(person), person, today
+                )
+                if info:
+                    birthdays.append(info)
+                    nearest.add(info)
+
+        _LOGGER.info("Found %s birthdays in the fetch window", len(birthdays))
+        return DateIndex(birthdays, until=self._window_until())
+
+    def _get_deathdays_windowed(
+        self, today: date, on_batch: BatchCallback | None = None, limit: int = 50
+    ) -> DateIndex:
+        """Build upcoming deathdays from the windowed event query only."""
+        deathdays = []
+        nearest = NearestRecords(limit)
+        events = [
+            event
+            for event in self.get_window_events(today)
+            if "death" in event.type_string
+        ]
+        events = self._events_soonest_first(events, today)
+        for idx, event in enumerate(events):
+            self._report_batch(on_batch, nearest, idx, len(events))
+            for person in self._window_people_for_event(event, "death_ref"):
+                deathday = self._calculate_next_deathday(person, today)
+                if deathday:
+                    deathdays.append(deathday)
+                    nearest.add(deathday)
+
+        _LOGGER.info("Found %s deathdays in the fetch window", len(deathdays))
+        return DateIndex(deathdays, until=self._window_until())
+
+    def get_marriage_events(self, today: date = None) -> list[Event]:
+        """Fetch all marriage and engagement events including their backlinks.
+
+        In window mode the events come from the windowed query, otherwise a
+        single rule-filtered request on /api/events/ is made.
+        """
+        if self.window_days:
+            return [
+                event
+                for event in self.get_window_events(today)
+                if self._is_marriage_event(event)
+            ]
+
+        with self._fetch_lock("marriage_events"):
+            if self._is_cache_valid("marriage_events"):
+                _LOGGER.debug("Returning cached marriage events")
+                return self._cache["marriage_events"]
+
+            rules = {
+                "function": "or",
+                "rules": [
+                    {"name": "HasType", "values": [event_type]}
+                    for event_type in MARRIAGE_EVENT_TYPES
+                ],
+            }
+            result = self._get(
+                "events/",
+                params={"rules": json.dumps(rules), "backlinks": 1},
+                model=Event,
+                many=True,
+            )
+
+            # The server may ignore unknown rules, so double check the type
+            events = [event for event in result if self._is_marriage_event(event)]
+            _LOGGER.info("Fetched %s marriage events with backlinks", len(events))
+
+            self._cache["marriage_events"] = events
+            self._cache["marriage_events_timestamp"] = datetime.now()
+            return events
+
+    def _is_marriage_event(self, event: Event) -> bool:
+        """Check if an event is a marriage or engagement."""
+        type_string = event.type_string
+        return "marriage" in type_string or "engagement" in type_string
+
+    def _get_anniversaries_from_events(
+        self, today: date, on_batch: BatchCallback | None = None, limit: int = 50
+    ) -> DateIndex:
+        """Build anniversaries from marriage events and their backlinks.
+
+        The nearest marriage dates are processed first for on_batch.
+        """
+        tag_handle = self._tag_handle()
+        anniversaries = []
+        nearest = NearestRecords(limit)
+
+        events = self._events_soonest_first(self.get_marriage_events(today), today)
+        for idx, event in enumerate(events):
+            self._report_batch(on_batch, nearest, idx, len(events))
+            marriage_date = self._event_date(event)
+            if not marriage_date:
+                continue
+
+            people, family_handle = self._event_participants(event)
+            if not people:
+                continue
+            person_by_handle = {person.handle: person for person in people}
+
+            if self.filter_tag and not any(
+                tag_handle in person.tag_list
+                for person in person_by_handle.values()
+            ):
+                continue
+
+            handles = list(person_by_handle)
+            names = [self._get_person_name(person_by_handle[h]) for h in handles]
+            anniversary = self._calculate_anniversary(
+                names[0],
+                names[1] if len(names) > 1 else "Unknown",
+                marriage_date,
+                family_handle,
+                handles[0],
+                handles[1] if len(handles) > 1 else None,
+                person_by_handle,
+                today=today,
+            )
+            if anniversary:
+                anniversaries.append(anniversary)
+                nearest.add(anniversary)
+
+        _LOGGER.info(
+            "Anniversaries result: %s entries from marriage event backlinks",
+            len(anniversaries),
+        )
+        return DateIndex(anniversaries, until=self._window_until())
+
+    def _event_participants(
+        self, event: Event
+    ) -> tuple[list[PersonSummary], str | None]:
+        """Resolve the people an event belongs to from its backlinks.
+
+        Family events belong to both partners; person events only to the
+        people referencing them in the primary role (not witnesses,
+        officiants etc.). Also returns the handle of the family the event
+        is attached to, if any.
+        """
+        backlinks = event.backlinks or {}
+        handles = []
+        family_handle = None
+
+        for handle in backlinks.get("family", []) or []:
+            family = self._get_family(handle)
+            if not family:
+                continue
+            family_handle = family_handle or handle
+            for partner in (family.father_handle, family.mother_handle):
+                if partner and partner not in handles:
+                    handles.append(partner)
+
+        people = [self._get_person(handle) for handle in handles]
+        for handle in backlinks.get("person", []) or []:
+            if handle in handles:
+                continue
+            person = self._get_person(handle)
+            if person and event.handle in person.primary_events:
+                people.append(person)
+
+        return [person for person in people if person], family_handle
+
+    def get_events(
+        self,
+        limit: int = 50,
+        on_batch: BatchCallback | None = None,
+        today: date = None,
+    ) -> list[EventRecord]:
+        """Get upcoming recurrences of the configured event types.
+
+        All types are served from one bulk event pass (or the windowed
+        query), so adding a type does not add another pass over the people.
+        The next limit records of every type are returned. The nearest
+        events are processed first and the nearest records of every type so
+        far are handed to on_batch after every batch. Days until are counted from today, the
+        system day if not given. Errors are raised rather than returned as
+        no records, so a failed fetch doesn't replace the last result.
+        """
+        if not self.event_types:
+            return []
+
+        today = today or date.today()
+        if self._is_cache_valid("events"):
+            _LOGGER.debug("Returning cached events data")
+            return self._upcoming("events", self._cache["events"], today, limit)
+
+        try:
+            event_types = self._canonical_event_types()
+            type_names = {event_type.lower(): event_type for event_type in event_types}
+            if self.window_days:
+                events = [
+                    event
+                    for event in self.get_window_events(today)
+                    if event.type_string in type_names
+                ]
+            else:
+                events = self.get_all_events(event_types)
+
+            tag_handle = self._tag_handle()
+            records = []
+            nearest = NearestRecords(limit, self._event_group)
+            events = self._events_soonest_first(events, today)
+            for idx, event in enumerate(events):
+                self._report_batch(on_batch, nearest, idx, len(events))
+                event_date = self._event_date(event)
+                if not event_date:
+                    continue
+
+                people, _family_handle = self._event_participants(event)
+                if not people:
+                    continue
+                if self.filter_tag and not any(
+                    tag_handle in person.tag_list for person in people
+                ):
+                    continue
+
+                record = EventRecord.create(
+                    type_names[event.type_string],
+                    " & ".join(self._get_person_name(p) for p in people),
+                    event_date.value,
+                    today,
+                    event_handle=event.handle,
+                    person_handle=people[0].handle,
+                    image_url=self._get_person_image_url(people[0]),
+                    approximate=event_date.inexact,
+                )
+                records.append(record)
+                nearest.add(record)
+
+            _LOGGER.info(
+                "Events result: %s upcoming events of types %s",
+                len(records),
+                ", ".join(event_types),
+            )
+
+            index = DateIndex(records, until=self._window_until())
+            self._cache["events"] = index
+            self._cache["events_timestamp"] = datetime.now()
+            return self._upcoming("events", index, today, limit)
+
+        except Exception as err:
+            _LOGGER.error("Failed to get events: %s", err, exc_info=True)
+            raise
+
+    def get_statistics(self, kind: str = "birthdays", today: date = None) -> dict:
+        """Return aggregate statistics over all cached records of a kind.
+
+        Covers every indexed record, not only the upcoming ones returned by
+        the get_* methods. Empty if the kind was not fetched yet.
+        """
+        index = self._cache.get(kind)
+        if index is None:
+            return {}
+        return index.statistics(today or date.today())
+
+    def get_index(self, kind: str) -> DateIndex | None:
+        """Return the cached index of a kind, or None if not fetched yet.
+
+        Never makes an API request.
+        """
+        return self._cache.get(kind)
+
+    def get_upcoming(self, kind: str, today: date, limit: int = 50) -> list | None:
+        """Return the upcoming records of a kind for a day from the index.
+
+        Never makes an API request, also not after the cache expired; used
+        to roll the countdowns over at midnight. Returns None if the index
+        was built from a fetch window that no longer covers these records,
+        see _window_covers; the kind then has to be fetched again.
+        """
+        index = self._cache.get(kind)
+        if index is None:
+            return []
+        records = self._upcoming(kind, index, today, limit)
+        if not self._window_covers(kind, index, records, today, limit):
+            _LOGGER.debug("Fetch window of %s no longer covers %s", kind, today)
+            self._cache[f"{kind}_timestamp"] = None
+            return None
+        return records
+
+    def _window_covers(
+        self, kind: str, index: DateIndex, records: list, today: date, limit: int
+    ) -> bool:
+        """Check if an index still holds every record a fetch for today would.
+
+        A window index only knows the dates up to index.until. Once the day
+        moved on, dates entering the window at its far end are missing, so
+        the records are only complete if every group (event type, or the
+        whole kind) got limit records ending on or before that day.
+        """
+        if index.until is None:
+            return True
+        if index.until >= today + timedelta(days=self.window_days):
+            return True
+        horizon = (index.until - today).days
+        if any(record.days_until > horizon for record in records):
+            return False
+        if kind == "events":
+            groups = [event_type.lower() for event_type in self.event_types]
+            counts = Counter(map(self._event_group, records))
+        else:
+            groups = [None]
+            counts = {None: len(records)}
+        return all(counts.get(group, 0) >= limit for group in groups)
+
+    def _upcoming(self, kind: str, index: DateIndex, today: date, limit: int) -> list:
+        """Return the next records of a kind from its index.
+
+        Events are limited per event type, so the sensor of a rare type
+        still gets its records next to a frequent one.
+        """
+        if kind == "events":
+            return index.upcoming_per(today, self._event_group, limit)
+        return index.upcoming(today, limit)
+
+    @staticmethod
+    def _event_group(record: EventRecord) -> str:
+        """Return the event type the records of a type are limited by."""
+        return record.event_type.lower()
+
+    def get_birthdays(
+        self,
+        limit: int = 50,
+        on_batch: BatchCallback | None = None,
+        today: date = None,
+    ):
+        """Get upcoming birthdays from Gramps Web with caching.
+
+        While fetching, the nearest birthdays found so far are handed to
+        on_batch after every BATCH_SIZE people or events. Days until are
+        counted from today, the system day if not given. Errors are raised
+        rather than returned as no records, so a failed fetch doesn't
+        replace the last result.
+        """
+        today = today or date.today()
+        # Check cache first
+        if self._is_cache_valid("birthdays"):
+            _LOGGER.debug("Returning cached birthdays data")
+            return self._cache["birthdays"].upcoming(today, limit)
+        
+        if self.window_days:
+            try:
+                index = self._get_birthdays_windowed(today, on_batch, limit)
+                self._cache["birthdays"] = index
+                self._cache["birthdays_timestamp"] = datetime.now()
+                return index.upcoming(today, limit)
+            except Exception as err:
+                if self._is_unreachable(err):
+                    raise
+                _LOGGER.warning(
+                    "Windowed birthday query failed, falling back to full scan: %s", err
+                )
+
+        try:
+            _LOGGER.info("Fetching birthdays from Gramps Web API (cache miss)")
+
+            # Get all people
+            try:
+                all_people = self._tagged(self.get_people("birthdays"))
+                _LOGGER.info("Fetched %s people from Gramps Web", len(all_people))
+            except Exception as people_err:
+                _LOGGER.error("Failed to fetch people: %s", people_err, exc_info=True)
+                raise
+
+            if not all_people:
+                _LOGGER.warning("No people data returned from Gramps Web")
+                return []
+
+            # Diagnostics: check sample people (first 5) for events
+            _LOGGER.info("Running diagnostics on first 5 people...")
+            for idx, person in enumerate(all_people[:5]):
+                name = self._get_person_name(person)
+                handle = person.handle
+                _LOGGER.info(
+                    "Person %s (%s): event_refs=%s, birth_ref=%s",
+                    idx + 1,
+                    name,
+                    len(person.event_refs),
+                    person.birth_ref,
+                )
+
+                # Try fetching detailed info
+                if handle:
+                    try:
+                        detailed = self._get(f"people/{handle}", model=Person)
+                        detailed_events = detailed.event_ref_list
+                        _LOGGER.info(
+                            "  -> After detail fetch: event_ref_list=%s, birth_ref_index=%s",
+                            len(detailed_events),
+                            detailed.birth_ref_index,
+                        )
+                        if detailed_events:
+                            _LOGGER.info("  -> First event ref: %s", detailed_events[0])
+                    except Exception as diag_err:
+                        _LOGGER.warning("  -> Could not fetch details: %s", diag_err)
+
+            birthdays = []
+            nearest = NearestRecords(limit)
+            people_with_birth = 0
+            living_people = 0
+            deceased_people = 0
+            with_birth_date = 0
+            skipped_undated = 0
+            fetch_failed = 0
+
+            # Sample first person for debugging
+            sample = all_people[0]
+            _LOGGER.debug("Sample person data: %s", sample)
+            _LOGGER.debug("Sample birth_ref: %s", sample.birth_ref)
+            _LOGGER.debug("Sample event_refs length: %s", len(sample.event_refs))
+            if sample.event_refs:
+                _LOGGER.debug("Sample first event: %s", sample.event_refs[0])
+
+            # Search for specific person: Erdal Akkaya
+            for p in all_people:
+                pname = self._get_person_name(p)
+                if "erdal" in pname.lower() and "akkaya" in pname.lower():
+                    _LOGGER.info("Found Erdal Akkaya:")
+                    _LOGGER.info("  Full data: %s", p)
+                    _LOGGER.info("  birth_ref: %s", p.birth_ref)
+                    _LOGGER.info("  death_ref: %s", p.death_ref)
+                    _LOGGER.info("  event_refs: %s", p.event_refs)
+                    break
+
+            # Filter to people with a birth date and build their birthdays in
+            # one pass, nearest known birthdays first, so the partial results
+            # handed to on_batch are the nearest ones early on
+            all_people = self._soonest_first(all_people, "birthdays", today)
+            _LOGGER.info("Filtering %s people for birth dates...", len(all_people))
+            for idx, person in enumerate(all_people):
+                self._report_batch(on_batch, nearest, idx, len(all_people))
+                if idx % 50 == 0:
+                    _LOGGER.debug("Processed %s/%s people...", idx, len(all_people))
+                if self._is_known_undated(person, "birth"):
+                    skipped_undated += 1
+                    continue
+                try:
+                    has_birth_date = self._has_birth_date(person)
+                    # Get birth event
+                    birth_date = has_birth_date and self._extract_birth_date(person)
+                except Exception as err:
+                    if self._is_unreachable(err):
+                        raise
+                    # Not known to be undated, checked again on the next fetch
+                    fetch_failed += 1
+                    _LOGGER.debug(
+                        "Could not fetch the events of %s: %s", person.handle, err
+                    )
+                    continue
+                if not has_birth_date:
+                    self._mark_undated(person, "birth")
+                    continue
+                with_birth_date += 1
+
+                # Get name
+                name = self._get_person_name(person)
+
+                if not birth_date:
+                    # A date exists but is not a birth date
+                    self._mark_undated(person, "birth")
+                    continue
+
+                people_with_birth += 1
+
+                # Check if person is still alive
+                is_alive = self._is_person_alive(person)
+
+                if is_alive:
+                    living_people += 1
+                else:
+                    deceased_people += 1
+                    _LOGGER.debug("Skipping deceased person: %s", name)
+                    continue
+
+                # Calculate next birthday (pass person data for image)
+                next_birthday_info = self._calculate_next_birthday(
+                    birth_date, name, person, today
+                )
+
+                if next_birthday_info:
+                    birthdays.append(next_birthday_info)
+                    nearest.add(next_birthday_info)
+
+            _LOGGER.info(
+                "Filtered to %s people with birth dates (from %s total, "
+                "%s skipped as known without date, %s failed to fetch)",
+                with_birth_date,
+                len(all_people),
+                skipped_undated,
+                fetch_failed,
+            )
+
+            if not with_birth_date:
+                _LOGGER.warning("No people with birth dates found")
+                return []
+
+            _LOGGER.info(
+                "Summary - Total with birth date: %s, Living: %s, Deceased: %s",
+                people_with_birth,
+                living_people,
+                deceased_people,
+            )
+            _LOGGER.info("Found %s birthdays from living people", len(birthdays))
+
+            # Index all birthdays by day of year, keep the nearest
+            index = DateIndex(birthdays)
+            result = index.upcoming(today, limit)
+            
+            # Update cache
+            self._cache["birthdays"] = index
+            self._cache["birthdays_timestamp"] = datetime.now()
+            
+            return result
+
+        except Exception as err:
+            _LOGGER.error("Failed to fetch birthdays: %s", err, exc_info=True)
+            raise
+
+    def _has_birth_date(self, person: PersonSummary) -> bool:
+        """Check if person has a birth date set.
+
+        Errors fetching the events are raised, they don't mean there is no date.
+        """
+        # If the birth reference is set, we have a birth date
+        if person.birth_ref and self._fetch_event_date(person.birth_ref):
+            return True
+
+        # Otherwise, check if there's a birth event in the list
+        return any(
+            self._fetch_event_date(event_handle) for event_handle in person.event_refs
+        )
+
+    def _extract_birth_date(self, person: PersonSummary):
+        """Extract birth date from person data.
+
+        Errors fetching the events are raised, they don't mean there is no date.
+        """
+        # If the birth reference is set, try it first
+        if person.birth_ref:
+            parsed = self._fetch_event_date(person.birth_ref, require_birth=True)
+            if parsed:
+                return parsed
+
+        # Otherwise, scan all events for a birth event
+        for event_handle in person.event_refs:
+            parsed = self._fetch_event_date(event_handle, require_birth=True)
+            if parsed:
+                return parsed
+
+        return None
+
+    def _fetch_event_date(
+        self, event_handle: str, require_birth: bool = False
+    ) -> GrampsDate | None:
+        """Fetch and parse an event date, optionally requiring a birth event.
+
+        Returns None if the event has no usable date; errors fetching the
+        event are raised.
+        """
+        if not event_handle:
+            return None
+
+        # Clean up handle if it's a path-like string
+        handle = event_handle
+        if "/" in handle:
+            handle = handle.rstrip("/").split("/")[-1]
+
+        event_data = self._get(f"events/{handle}", model=Event)
+
+        if require_birth and "birth" not in event_data.type_string:
+            return None
+
+        parsed = self._event_date(event_data)
+        if parsed:
+            _LOGGER.debug("Parsed event date: %s", parsed)
+            return parsed
+
+        return None
+
+    def _is_person_alive(self, person: PersonSummary) -> bool:
+        """Check if person is still alive (no death date)."""
+        try:
+            if person.death_ref is None:
+                # No death event, person is alive
+                return True
+
+            # Person has a death event, they are deceased
+            _LOGGER.debug("Person has death_ref: %s", person.death_ref)
+            return False
+
+        except Exception as err:
+            _LOGGER.debug("Could not determine if person is alive: %s", err)
+            # If we can't determine, assume person is alive
+            return True
+
+    def _parse_gramps_date(self, date_str: str):
+        """Parse Gramps date format to Python date."""
+        try:
+            # Gramps can have various date formats
+            # Common format: "1990-01-15" or "15 Jan 1990"
+            if "-" in date_str and len(date_str) == 10:
+                return datetime.strptime(date_str, "%Y-%m-%d").date()
+            # Add more parsing logic as needed
+            return None
+        except Exception:
+            return None
+
+    def _get_person_name(self, person: PersonSummary):
+        """Get person's display name."""
+        try:
+            return person.name
+        except Exception:
+            return "Unknown"
+
+    def _get_person_image_url(self, person: PersonSummary) -> str | None:
+        """Get the URL for a person's profile image."""
+        try:
+            # Get person handle
+            person_handle = person.handle
+            if not person_handle:
+                _LOGGER.debug("No person handle found")
+                return None
+
+            # The projection keeps the first media reference only
+            media_handle = person.media_handle
+            if not media_handle:
+                _LOGGER.debug("No media for person %s", person_handle)
+                return None
+
+            # Construct thumbnail URL
+            thumbnail_url = f"{self.url}/api/media/{media_handle}/thumbnail/200"
+
+            # Download and save image locally
+            if self.hass_config_path:
+                return self._download_image(thumbnail_url, person_handle, media_handle)
+
+            # Fallback to remote URL
+            _LOGGER.debug("Image URL for person: %s", thumbnail_url)
+            return thumbnail_url
+
+        except Exception as err:
+            _LOGGER.debug("Could not get person image: %s", err)
+            return None
+
+    def _download_image(
+        self, image_url: str, person_handle: str, media_handle: str
+    ) -> str | None:
+        """Download image and return local path."""
+        try:
+            # Create filename from handles
+            filename_hash = hashlib.md5(
+                f"{person_handle}_{media_handle}".encode()
+            ).hexdigest()
+            filename = f"{filename_hash}.jpg"
+            filepath = os.path.join(self.images_dir, filename)
+
+            # Check if already downloaded
+            if os.path.exists(filepath):
+                _LOGGER.debug("Image already cached: %s", filepath)
+                return f"/local/gramps/{filename}"
+
+            # Download image
+            _LOGGER.debug("Downloading image from: %s", image_url)
+            response = self._session.get(image_url, timeout=10)
+            response.raise_for_status()
+
+            # Save to file
+            with open(filepath, "wb") as f:
+                f.write(response.content)
+
+            _LOGGER.info("Downloaded image to: %s", filepath)
+            return f"/local/gramps/{filename}"
+
+        except Exception as err:
+            _LOGGER.warning("Failed to download image: %s", err)
+            return image_url  # Fallback to remote URL
+
+    def _calculate_next_birthday(
+        self,
+        birth_date: GrampsDate,
+        name: str,
+        person: PersonSummary | None,
+        today: date,
+    ) -> BirthdayRecord | None:
+        """Calculate next birthday occurrence after today."""
+        try:
+            # Get image URL and handle if person data is provided
+            image_url = None
+            person_handle = None
+            if person:
+                image_url = self._get_person_image_url(person)
+                person_handle = person.handle
+
+            return BirthdayRecord.create(
+                name,
+                birth_date.value,
+                today,
+                image_url=image_url,
+                person_handle=person_handle,
+                approximate=birth_date.inexact,
+            )
+
+        except Exception as err:
+            _LOGGER.debug("Could not calculate birthday for %s: %s", name, err)
+            return None
+
+    def get_deathdays(
+        self,
+        limit: int = 50,
+        on_batch: BatchCallback | None = None,
+        today: date = None,
+    ):
+        """Get upcoming deathdays/memorial dates from Gramps Web with caching.
+
+        While fetching, the nearest deathdays found so far are handed to
+        on_batch after every BATCH_SIZE people or events. Days until are
+        counted from today, the system day if not given. Errors are raised
+        rather than returned as no records, so a failed fetch doesn't
+        replace the last result.
+        """
+        today = today or date.today()
+        # Check cache first
+        if self._is_cache_valid("deathdays"):
+            _LOGGER.debug("Returning cached deathdays data")
+            return self._cache["deathdays"].upcoming(today, limit)
+        
+        if self.window_days:
+            try:
+                index = self._get_deathdays_windowed(today, on_batch, limit)
+                self._cache["deathdays"] = index
+                self._cache["deathdays_timestamp"] = datetime.now()
+                return index.upcoming(today, limit)
+            except Exception as err:
+                if self._is_unreachable(err):
+                    raise
+                _LOGGER.warning(
+                    "Windowed deathday query failed, falling back to full scan: %s", err
+                )
+
+        try:
+            _LOGGER.info("Fetching deathdays from Gramps Web API (cache miss)")
+
+            all_people = self._tagged(self.get_people("deathdays"))
+            if not isinstance(all_people, tuple):
+                _LOGGER.warning(
+                    "Unexpected response type for people: %s", type(all_people)
+                )
+                return []
+
+            _LOGGER.info("Checking %s people for death dates...", len(all_people))
+
+            # Diagnostics: check sample people (first 5) for death events
+            _LOGGER.info("Running diagnostics on first 5 people for death events...")
+            for idx, person in enumerate(all_people[:5]):
+                name = self._get_person_name(person)
+                _LOGGER.info(
+                    "Person %s (%s): death_ref=%s, event_refs length=%s",
+                    idx + 1,
+                    name,
+                    person.death_ref,
+                    len(person.event_refs),
+                )
+
+                # Log all events to see their types
+                if person.event_refs:
+                    for event_idx, event_handle in enumerate(person.event_refs):
+                        if event_handle:
+                            try:
+                                event = self._get_event(event_handle)
+                                if event:
+                                    _LOGGER.info(
+                                        "  Event %s: type=%s, has date=%s",
+                                        event_idx,
+                                        event.type_string,
+                                        event.date is not None,
+                                    )
+                            except Exception as e:
+                                _LOGGER.debug(
+                                    "Could not fetch event %s: %s", event_handle, e
+                                )
+
+            deathdays = []
+            nearest = NearestRecords(limit)
+            candidates = 0
+            no_death_ref = 0
+            failed_calculation = 0
+            fetch_failed = 0
+
+            # Nearest known deathdays first for the partial results
+            all_people = self._soonest_first(all_people, "deathdays", today)
+            for idx, person in enumerate(all_people):
+                self._report_batch(on_batch, nearest, idx, len(all_people))
+                if idx % 50 == 0:
+                    _LOGGER.debug(
+                        "Processed %s/%s people for deathdays...", idx, len(all_people)
+                    )
+
+                if self._is_known_undated(person, "death"):
+                    no_death_ref += 1
+                    continue
+
+                try:
+                    has_death_date = self._has_death_date(person)
+                except Exception as err:
+                    if self._is_unreachable(err):
+                        raise
+                    # Not known to be undated, checked again on the next fetch
+                    fetch_failed += 1
+                    _LOGGER.debug(
+                        "Could not fetch the death event of %s: %s", person.handle, err
+                    )
+                    continue
+
+                if has_death_date:
+                    candidates += 1
+                    deathday = self._calculate_next_deathday(person, today)
+                    if deathday:
+                        deathdays.append(deathday)
+                        nearest.add(deathday)
+                    else:
+                        failed_calculation += 1
+                else:
+                    no_death_ref += 1
+                    self._mark_undated(person, "death")
+
+            # Index all deathdays by day of year, keep the nearest
+            index = DateIndex(deathdays)
+            result = index.upcoming(today, limit)
+
+            _LOGGER.info(
+                "Deathdays result: %s total people, %s without death reference, %s candidates with death dates, %s failed calculation, %s failed to fetch, %s entries after success%s",
+                len(all_people),
+                no_death_ref,
+                candidates,
+                failed_calculation,
+                fetch_failed,
+                len(deathdays),
+                f" | first: {result[0]}" if result else "",
+            )
+            
+            # Update cache
+            self._cache["deathdays"] = index
+            self._cache["deathdays_timestamp"] = datetime.now()
+            
+            return result
+
+        except Exception as err:
+            _LOGGER.error("Failed to get deathdays: %s", err, exc_info=True)
+            raise
+
+    def get_anniversaries(
+        self,
+        limit: int = 50,
+        on_batch: BatchCallback | None = None,
+        today: date = None,
+    ):
+        """Get upcoming anniversaries from Gramps Web with caching.
+
+        The nearest anniversaries found so far are handed to on_batch while
+        the marriage events are processed; the people scan fallback only
+        returns the final result. Days until are counted from today, the
+        system day if not given. Errors are raised rather than returned as
+        no records, so a failed fetch doesn't replace the last result.
+        """
+        today = today or date.today()
+        # Check cache first
+        if self._is_cache_valid("anniversaries"):
+            _LOGGER.debug("Returning cached anniversaries data")
+            return self._cache["anniversaries"].upcoming(today, limit)
+        
+        try:
+            index = self._get_anniversaries_from_events(today, on_batch, limit)
+            self._cache["anniversaries"] = index
+            self._cache["anniversaries_timestamp"] = datetime.now()
+            return index.upcoming(today, limit)
+        except Exception as err:
+            if self._is_unreachable(err):
+                raise
+            _LOGGER.warning(
+                "Marriage event query failed, falling back to people scan: %s", err
+            )
+
+        try:
+            _LOGGER.info("Fetching anniversaries from Gramps Web API (cache miss)")
+
+            all_people = self._tagged(self.get_people("anniversaries"))
+            if not isinstance(all_people, tuple):
+                _LOGGER.warning(
+                    "Unexpected response type for people: %s", type(all_people)
+                )
+                return []
+
+            # First pass: collect all anniversaries with event handles
+            anniversaries_with_events = {}  # key: (marriage_date, event_handle)
+            person_by_handle = {}  # key: person_handle, value: person_obj
+            marriage_events = 0
+
+            for person in all_people:
+                person_handle = person.handle
+                person_name = self._get_person_name(person)
+                person_by_handle[person_handle] = person
+
+                # Look for marriage events
+                marriage_dates = self._get_marriage_dates(person)
+                marriage_events += len(marriage_dates)
+                for spouse_name, marriage_date, event_handle, family_handle in marriage_dates:
+                    key = (marriage_date.value, event_handle)
+                    
+                    if key not in anniversaries_with_events:
+                        anniversaries_with_events[key] = {
+                            "person_names": set(),
+                            "person_handles": [],
+                            "marriage_date": marriage_date,
+                            "event_handle": event_handle,
+                            "spouse_name": spouse_name,
+                            "family_handle": family_handle,
+                        }
+                    
+                    anniversaries_with_events[key]["person_names"].add(person_name)
+                    if person_handle not in anniversaries_with_events[key]["person_handles"]:
+                        anniversaries_with_events[key]["person_handles"].append(person_handle)
+
+            # Second pass: create anniversary entries and find partners
+            anniversaries = []
+            seen_events = set()
+            
+            for (date_str, event_handle), data in anniversaries_with_events.items():
+                # Skip if we already processed this event
+                if event_handle in seen_events:
+                    continue
+                seen_events.add(event_handle)
+                
+                # Get the list of people for this event
+                person_names = sorted(data["person_names"])
+                person_handles = data.get("person_handles", [])
+                marriage_date = data["marriage_date"]
+                family_handle = data.get("family_handle")
+                
+                # Create anniversary entry
+                if len(person_names) >= 2:
+                    # We have both partners, combine them
+                    combined_name = " & ".join(person_names[:2])
+                    person1_handle = person_handles[0] if len(person_handles) > 0 else None
+                    person2_handle = person_handles[1] if len(person_handles) > 1 else None
+                else:
+                    # We only have one person, use the spouse name if available
+                    combined_name = f"{person_names[0]}"
+                    if data["spouse_name"]:
+                        combined_name = f"{person_names[0]} & {data['spouse_name']}"
+                    person1_handle = person_handles[0] if len(person_handles) > 0 else None
+                    person2_handle = None
+                
+                anniversary = self._calculate_anniversary(
+                    combined_name.split(" & ")[0],
+                    combined_name.split(" & ")[1] if " & " in combined_name else data["spouse_name"] or "Unknown",
+                    marriage_date,
+                    family_handle,
+                    person1_handle,
+                    person2_handle,
+                    person_by_handle,
+                    today=today,
+                )
+                if anniversary:
+                    # Update the person_name to the combined version
+                    anniversaries.append(replace(anniversary, person_name=combined_name))
+
+            # Index all anniversaries by day of year, keep the nearest
+            index = DateIndex(anniversaries)
+            result = index.upcoming(today, limit)
+
+            _LOGGER.info(
+                "Anniversaries result: %s marriage events, %s entries after deduplication%s",
+                marriage_events,
+                len(anniversaries),
+                f" | first: {result[0]}" if result else "",
+            )
+            
+            # Update cache
+            self._cache["anniversaries"] = index
+            self._cache["anniversaries_timestamp"] = datetime.now()
+            
+            return result
+
+        except Exception as err:
+            _LOGGER.error("Failed to get anniversaries: %s", err, exc_info=True)
+            raise
+
+    def _has_death_date(self, person: PersonSummary) -> bool:
+        """Check if person has a death date.
+
+        Errors fetching the death event are raised, they don't mean there is
+        no date.
+        """
+        person_name = self._get_person_name(person)
+        handle = person.death_ref
+
+        if not handle:
+            _LOGGER.debug("Person %s: no death reference", person_name)
+            return False
+
+        event = self._get(f"events/{handle}", model=Event)
+
+        # Verify this is actually a Death event
+        type_string = event.type_string
+        if "death" not in type_string:
+            _LOGGER.debug(
+                "Person %s: event type is '%s', not Death", person_name, type_string
+            )
+            return False
+
+        parsed = self._event_date(event)
+
+        if not parsed:
+            _LOGGER.debug(
+                "Person %s: could not parse death date from %s",
+                person_name,
+                event.date,
+            )
+            return False
+
+        _LOGGER.debug(
+            "Person %s: has death date %s (event type: %s)",
+            person_name,
+            parsed,
+            type_string,
+        )
+        return bool(parsed)
+
+    def _marriage_event_date(self, ev_handle: str) -> GrampsDate | None:
+        """Return the date of a marriage/engagement event, if it is one."""
+        event = self._get_event(ev_handle)
+        if not event or not self._is_marriage_event(event):
+            return None
+        return self._event_date(event)
+
+    def _get_marriage_dates(self, person: PersonSummary) -> list:
+        """Get all marriage dates from person and family events.
+        
+        Returns list of tuples: (spouse_name_or_none, marriage_date, event_handle, family_handle)
+        where event_handle is used to find the partner later.
+        """
+        marriage_dates = []
+        try:
+            person_handle = person.handle
+
+            # Collect possible spouse handles from families
+            spouse_handles = set()
+            for family_handle in person.family_list:
+                if not family_handle:
+                    continue
+
+                family = self._get_family(family_handle)
+                if not family:
+                    continue
+
+                for spouse_handle in (family.father_handle, family.mother_handle):
+                    if spouse_handle and spouse_handle != person_handle:
+                        spouse_handles.add(spouse_handle)
+
+                # Process marriage events attached to the family
+                for event_ref in family.event_ref_list:
+                    ev_handle = self._resolve_event_handle(event_ref)
+                    if not ev_handle:
+                        continue
+
+                    parsed_dateval = self._marriage_event_date(ev_handle)
+                    if not parsed_dateval:
+                        continue
+
+                    for spouse_handle in spouse_handles or [None]:
+                        spouse_name = None
+                        if spouse_handle:
+                            spouse_person = self._get_person(spouse_handle)
+                            if spouse_person:
+                                spouse_name = self._get_person_name(spouse_person)
+                        marriage_dates.append((spouse_name, parsed_dateval, ev_handle, family_handle))
+
+            # Also process any marriage events directly attached to the person
+            for event_handle in person.event_refs:
+                parsed_dateval = self._marriage_event_date(event_handle)
+                if not parsed_dateval:
+                    continue
+
+                # If we know spouses, emit one entry per spouse; otherwise None
+                if spouse_handles:
+                    for spouse_handle in spouse_handles:
+                        spouse_name = None
+                        spouse_person = self._get_person(spouse_handle)
+                        if spouse_person:
+                            spouse_name = self._get_person_name(spouse_person)
+                        marriage_dates.append((spouse_name, parsed_dateval, event_handle, None))
+                else:
+                    # Return None for spouse_name to signal we need to find the partner
+                    marriage_dates.append((None, parsed_dateval, event_handle, None))
+
+            return marriage_dates
+
+        except Exception as err:
+            if self._is_unreachable(err):
+                raise
+            _LOGGER.debug("Error getting marriage dates: %s", err)
+            return []
+
+    def _get_event(self, handle: str) -> Event | None:
+        """Get event details from API, None if the event can't be fetched."""
+        try:
+            if not handle:
+                return None
+            event = self._get(f"events/{handle}", model=Event)
+            if event:
+                _LOGGER.debug("Fetched event %s: type=%s", handle, event.type)
+            return event
+        except Exception as err:
+            if self._is_unreachable(err):
+                raise
+            _LOGGER.debug("Could not fetch event %s: %s", handle, err)
+            return None
+
+    def _get_family(self, handle: str) -> Family | None:
+        """Get family details from API, None if the family can't be fetched."""
+        try:
+            return self._get(f"families/{handle}", model=Family)
+        except Exception as err:
+            if self._is_unreachable(err):
+                raise
+            _LOGGER.debug("Could not fetch family %s: %s", handle, err)
+            return None
+
+    def _calculate_next_deathday(
+        self, person: PersonSummary, today: date
+    ) -> DeathdayRecord | None:
+        """Calculate next deathday for a person after today."""
+        try:
+            if not person.death_ref:
+                return None
+
+            event = self._get_event(person.death_ref)
+            if not event:
+                return None
+
+            # Verify this is actually a Death event
+            type_string = event.type_string
+            if "death" not in type_string:
+                name = self._get_person_name(person)
+                _LOGGER.debug(
+                    "Person %s: death_ref points to non-Death event type: %s",
+                    name,
+                    type_string,
+                )
+                return None
+
+            death_date = self._event_date(event)
+
+            if not death_date:
+                return None
+
+            return DeathdayRecord.create(
+                self._get_person_name(person),
+                death_date.value,
+                today,
+                image_url=self._get_person_image_url(person),
+                person_handle=person.handle,
+                approximate=death_date.inexact,
+            )
+
+        except Exception as err:
+            if self._is_unreachable(err):
+                raise
+            _LOGGER.debug("Could not calculate deathday: %s", err)
+            return None
+
+    def _calculate_anniversary(
+        self, person1_name: str, person2_name: str, marriage_date: GrampsDate, family_handle: str = None, 
+        person1_handle: str = None, person2_handle: str = None, person_by_handle: dict = None,
+        *, today: date,
+    ) -> AnniversaryRecord | None:
+        """Calculate next anniversary for a couple after today."""
+        try:
+            if not marriage_date:
+                return None
+
+            # Build person_name string
+            if person2_name and person2_name != "Unknown":
+                person_name_str = f"{person1_name} & {person2_name}"
+            else:
+                person_name_str = person1_name
+
+            # Get images for both partners if available
+            image1 = None
+            image2 = None
+            if person_by_handle and person1_handle and person1_handle in person_by_handle:
+                image1 = self._get_person_image_url(person_by_handle[person1_handle])
+
+            if person_by_handle and person2_handle and person2_handle in person_by_handle:
+                image2 = self._get_person_image_url(person_by_handle[person2_handle])
+
+            return AnniversaryRecord.create(
+                person_name_str,
+                marriage_date.value,
+                today,
+                family_handle=family_handle,
+                image_url_person1=image1,
+                image_url_person2=image2,
+                approximate=marriage_date.inexact,
+            )
+
+        except Exception as err:
+            _LOGGER.debug("Could not calculate anniversary: %s", err)
+            return None
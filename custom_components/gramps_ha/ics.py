@@ -0,0 +1,215 @@
+"""iCalendar feed of the family dates.
+
+`/api/gramps_ha/<entry_id>/family_dates.ics` serves the recurrences of all
+enabled kinds as all-day events. Phone calendar apps can't send an
+Authorization header, so besides Home Assistant authentication the secret
+feed token of the entry is accepted as `?token=` query parameter. Only
+administrators get the subscribable URL and can regenerate the token, see
+services.py. The body is generated in
+the executor once per fetched data and day and served from memory with an
+ETag, so polling clients mostly get a 304 for nothing.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import secrets
+from datetime import date, timedelta
+from http import HTTPStatus
+
+from aiohttp import web
+
+from homeassistant.components.http import KEY_AUTHENTICATED, HomeAssistantView
+from homeassistant.components.http.ban import process_wrong_login
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.network import NoURLAvailableError, get_url
+
+from .calendar import event_summary
+from .const import CONF_FEED_TOKEN, DOMAIN, FEED_PATH
+from .services import snapshot_day
+
+DAYS_BACK = 30
+DAYS_AHEAD = 365
+CONTENT_TYPE = "text/calendar"
+
+
+def _escape(text: str) -> str:
+    """Escape a TEXT value (RFC 5545, 3.3.11)."""
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line: str) -> str:
+    """Fold a content line into lines of at most 75 octets (RFC 5545, 3.1)."""
+    if len(line.encode()) <= 75:
+        return line
+    parts = []
+    current, size = "", 0
+    for char in line:
+        octets = len(char.encode())
+        if size + octets > 75:
+            parts.append(current)
+            current, size = " ", 1  # continuation lines start with a space
+        current += char
+        size += octets
+    parts.append(current)
+    return "\r\n".join(parts)
+
+
+def build_feed(name: str, entry_id: str, indexes: dict, today: date) -> bytes:
+    """Return the iCalendar body of the recurrences around a day.
+
+    Covers DAYS_BACK days before until DAYS_AHEAD days after today. The
+    body only depends on the indexes and the day, so equal data gives an
+    equal body and ETag.
+    """
+    start = today - timedelta(days=DAYS_BACK)
+    end = today + timedelta(days=DAYS_AHEAD)
+    occurrences = sorted(
+        (
+            (day, kind, record)
+            for kind, index in indexes.items()
+            for day, record in index.between(start, end)
+        ),
+        key=lambda item: item[0],
+    )
+
+    stamp = f"{today:%Y%m%d}T000000Z"
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//Gramps HA//Family Dates//EN",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{_escape(name)}",
+    ]
+    for day, kind, record in occurrences:
+        lines += [
+            "BEGIN:VEVENT",
+            f"UID:{_escape(f'{kind}:{record.key}:{day.isoformat()}')}@{DOMAIN}.{entry_id}",
+            f"DTSTAMP:{stamp}",
+            f"DTSTART;VALUE=DATE:{day:%Y%m%d}",
+            f"DTEND;VALUE=DATE:{day + timedelta(days=1):%Y%m%d}",
+            f"SUMMARY:{_escape(event_summary(record))}",
+        ]
+        if record.approximate:
+            lines.append("DESCRIPTION:Approximate date")
+        lines += ["TRANSP:TRANSPARENT", "END:VEVENT"]
+    lines.append("END:VCALENDAR")
+    return ("\r\n".join(_fold(line) for line in lines) + "\r\n").encode()
+
+
+class _Feed:
+    """Cached body of the feed of an entry and the data it was built from."""
+
+    __slots__ = ("today", "indexes", "body", "etag")
+
+    def __init__(self, today: date, indexes: dict, body: bytes) -> None:
+        self.today = today
+        self.indexes = indexes
+        self.body = body
+        self.etag = f'"{hashlib.sha1(body).hexdigest()}"'
+
+    def matches(self, today: date, indexes: dict) -> bool:
+        """Return True if built from the same index objects on the same day."""
+        return (
+            self.today == today
+            and self.indexes.keys() == indexes.keys()
+            and all(self.indexes[kind] is index for kind, index in indexes.items())
+        )
+
+
+class GrampsWebFeedView(HomeAssistantView):
+    """Serve the iCalendar feed of an entry."""
+
+    url = FEED_PATH
+    name = "api:gramps_ha:family_dates"
+    requires_auth = False  # checked in get, the feed token is accepted too
+
+    def __init__(self) -> None:
+        self._feeds: dict[str, _Feed] = {}
+
+    async def get(self, request: web.Request, entry_id: str) -> web.Response:
+        """Return the feed, or 304 if the client has the current one."""
+        hass: HomeAssistant = request.app["hass"]
+        coordinator = hass.data.get(DOMAIN, {}).get(entry_id)
+        token = request.query.get("token")
+        if not request[KEY_AUTHENTICATED]:
+            expected = coordinator and coordinator.entry.data.get(CONF_FEED_TOKEN)
+            if not token or not expected or not hmac.compare_digest(token, expected):
+                if token:
+                    await process_wrong_login(request)
+                return web.Response(status=HTTPStatus.UNAUTHORIZED)
+        if coordinator is None:
+            self._feeds.pop(entry_id, None)
+            return web.Response(status=HTTPStatus.NOT_FOUND)
+
+        feed = await self._feed(hass, coordinator)
+        headers = {"ETag": feed.etag, "Cache-Control": "private, no-cache"}
+        if feed.etag in request.headers.get("If-None-Match", ""):
+            return web.Response(status=HTTPStatus.NOT_MODIFIED, headers=headers)
+        return web.Response(
+            body=feed.body, content_type=CONTENT_TYPE, charset="utf-8", headers=headers
+        )
+
+    async def _feed(self, hass: HomeAssistant, coordinator) -> _Feed:
+        """Return the cached feed of an entry, rebuilt if its data changed.
+
+        Building walks a year of every index, so it runs in the executor.
+        """
+        entry_id = coordinator.entry.entry_id
+        today = snapshot_day(coordinator)
+        indexes = {
+            kind: index
+            for kind in coordinator.coordinators
+            if (index := coordinator.api.get_index(kind)) is not None
+        }
+        feed = self._feeds.get(entry_id)
+        if feed is None or not feed.matches(today, indexes):
+            name = coordinator.entry.title or "Family Dates"
+            body = await hass.async_add_executor_job(
+                build_feed, name, entry_id, indexes, today
+            )
+            feed = _Feed(today, indexes, body)
+            self._feeds[entry_id] = feed
+        return feed
+
+
+def feed_url(hass: HomeAssistant, entry: ConfigEntry) -> str:
+    """Return the subscribable URL of the feed of an entry, with its token."""
+    path = FEED_PATH.format(entry_id=entry.entry_id)
+    path = f"{path}?token={entry.data.get(CONF_FEED_TOKEN, '')}"
+    try:
+        return get_url(hass, prefer_external=True) + path
+    except NoURLAvailableError:
+        return path
+
+
+@callback
+def async_ensure_feed_token(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Generate the secret feed token of an entry once."""
+    if not entry.data.get(CONF_FEED_TOKEN):
+        async_regenerate_feed_token(hass, entry)
+
+
+@callback
+def async_regenerate_feed_token(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Replace the feed token of an entry; URLs with the old one stop working."""
+    hass.config_entries.async_update_entry(
+        entry, data={**entry.data, CONF_FEED_TOKEN: secrets.token_urlsafe(32)}
+    )
+
+
+@callback
+def async_register_feed_view(hass: HomeAssistant) -> None:
+    """Register the feed view once per Home Assistant instance."""
+    key = f"{DOMAIN}_feed_view"
+    if key not in hass.data:
+        hass.data[key] = GrampsWebFeedView()
+        hass.http.register_view(hass.data[key])
@@ -0,0 +1,180 @@
+"""Day-of-year index of recurring dates.
+
+Records are kept sorted by the month and day of their original date. The
+next K recurrences after any day are then a bisect plus a wrap-around
+slice, and the same index answers queries for every day until the data is
+fetched again, including after midnight.
+"""
+
+from __future__ import annotations
+
+import heapq
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Iterator
+from datetime import date, timedelta
+from itertools import chain, count, islice
+
+from . import columnar
+from .records import next_occurrence
+
+
+def month_day(value: date) -> int:
+    """Return a sortable month/day key of a date."""
+    return value.month * 100 + value.day
+
+
+class NearestRecords:
+    """The limit records with the fewest days until, kept while records come in.
+
+    Each group(record) (or all records, without group) keeps a bounded
+    max-heap of size limit, so adding a record costs O(log limit) and the
+    nearest records so far are at hand at any time. Of records as near as
+    each other the first added is kept.
+    """
+
+    __slots__ = ("_limit", "_group", "_heaps", "_order")
+
+    def __init__(
+        self, limit: int, group: Callable[[object], object] | None = None
+    ) -> None:
+        self._limit = limit
+        self._group = group
+        self._heaps: dict = {}
+        self._order = count()
+
+    def add(self, record) -> None:
+        """Add a record, dropping the farthest one of its group if full."""
+        if self._limit <= 0:
+            return
+        key = self._group(record) if self._group is not None else None
+        heap = self._heaps.setdefault(key, [])
+        # Negated so the root is the farthest and, of those, the latest record
+        item = (-record.days_until, -next(self._order), record)
+        if len(heap) < self._limit:
+            heapq.heappush(heap, item)
+        else:
+            heapq.heappushpop(heap, item)
+
+    def records(self) -> list:
+        """Return the kept records, nearest first."""
+        items = sorted(
+            (item for heap in self._heaps.values() for item in heap), reverse=True
+        )
+        return [record for _days, _order, record in items]
+
+
+class DateIndex:
+    """Records sorted by the month and day of their origin date.
+
+    Records need an `origin` date and an `at(today)` method returning the
+    record recomputed for that day (see records.py). An index built from a
+    fetch window only holds the recurrences up to `until`; None means all.
+    """
+
+    __slots__ = ("_keys", "_records", "_columns", "until")
+
+    def __init__(self, records: Iterable, until: date | None = None) -> None:
+        ordered = sorted(records, key=lambda record: month_day(record.origin))
+        self._keys = [month_day(record.origin) for record in ordered]
+        self._records = ordered
+        self._columns = None
+        self.until = until
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator:
+        """Iterate over the records as built, not recomputed for a day."""
+        return iter(self._records)
+
+    def _from(self, today: date) -> Iterator:
+        """Iterate over the records in order of their next recurrence."""
+        start = bisect_left(self._keys, month_day(today))
+        return chain(
+            islice(self._records, start, None), islice(self._records, 0, start)
+        )
+
+    def upcoming(self, today: date, limit: int | None = None) -> list:
+        """Return the next limit recurrences on or after today."""
+        return [record.at(today) for record in islice(self._from(today), limit)]
+
+    def upcoming_per(
+        self, today: date, group: Callable[[object], object], limit: int
+    ) -> list:
+        """Return the next limit recurrences of every group on or after today.
+
+        Records are grouped by group(record), so a frequent group does not
+        push the records of a rarer one out. The whole index is walked.
+        """
+        counts: dict = {}
+        result = []
+        for record in self._from(today):
+            key = group(record)
+            if counts.get(key, 0) < limit:
+                counts[key] = counts.get(key, 0) + 1
+                result.append(record.at(today))
+        return result
+
+    def statistics(self, today: date) -> dict:
+        """Return counts per month, years distribution and near-term counts.
+
+        Uses the NumPy columnar store if available, built on first use.
+        """
+        origins = [record.origin for record in self._records]
+        if columnar.np is None:
+            return columnar.statistics(origins, today)
+        if self._columns is None:
+            self._columns = columnar.DateColumns(origins)
+        return self._columns.statistics(today)
+
+    def within(self, today: date, days: int) -> list:
+        """Return all recurrences in the next days days, today included."""
+        result = []
+        for record in self._from(today):
+            current = record.at(today)
+            if current.days_until > days:
+                break
+            result.append(current)
+        return result
+
+    def between(self, start: date, end: date) -> Iterator[tuple[date, object]]:
+        """Yield (day, record) for every recurrence from start until before end.
+
+        The range may span several years; it is walked one year at a time
+        and every record is recomputed for the day of its recurrence.
+        """
+        chunk = start
+        while chunk < end:
+            boundary = min(end, next_occurrence(chunk, chunk + timedelta(days=1)))
+            for record in self._from(chunk):
+                day = chunk + timedelta(days=record.at(chunk).days_until)
+                if day >= boundary:
+                    break
+                yield day, record.at(day)
+            chunk = boundary
+
+    def query(
+        self,
+        today: date,
+        days: int | None = None,
+        match: Callable[[object], bool] | None = None,
+        offset: int = 0,
+        limit: int | None = None,
+    ) -> tuple[list, int]:
+        """Return a page of the matching recurrences and their total count.
+
+        Only records within days days (if given) that pass match (if given)
+        are counted; the page starts at offset and has at most limit records.
+        """
+        page = []
+        total = 0
+        for record in self._from(today):
+            current = record.at(today)
+            if days is not None and current.days_until > days:
+                break
+            if match is not None and not match(current):
+                continue
+            if total >= offset and (limit is None or len(page) < limit):
+                page.append(current)
+            total += 1
+        return page, total
@@ -0,0 +1,331 @@
+"""Typed models for the Gramps Web API responses.
+
+Only the fields the integration actually uses are declared. When msgspec is
+installed, JSON payloads are decoded straight into these classes without
+building the intermediate dicts; otherwise orjson (shipped with Home
+Assistant) or the standard json module is used and the dicts are projected.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sys
+from dataclasses import dataclass, field
+
+try:
+    import msgspec
+except ImportError:  # optional dependency
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _handle_from_ref(ref) -> str:
+    """Return the handle of a Gramps reference given as dict or string."""
+    if isinstance(ref, str):
+        return ref
+    if not isinstance(ref, dict):
+        return ""
+    for key in ("ref", "handle", "hlink"):
+        candidate = ref.get(key)
+        if candidate and isinstance(candidate, str):
+            return candidate
+    return ""
+
+
+def _strip_path(handle: str) -> str:
+    """Return the last path segment if a handle was given as URL/path."""
+    if "/" in handle:
+        return handle.rstrip("/").split("/")[-1]
+    return handle
+
+
+def _int(value, default: int = -1) -> int:
+    """Return value as int, or default if it is missing or invalid."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _type_string(value) -> str:
+    """Return the string of a Gramps type given as dict or string."""
+    if isinstance(value, dict):
+        return value.get("string", "") or ""
+    return str(value or "")
+
+
+def _intern(value: str) -> str:
+    """Intern a frequently repeated string such as a surname or tag."""
+    return sys.intern(value) if value else ""
+
+
+@dataclass(slots=True)
+class Surname:
+    """A single surname of a name."""
+
+    surname: str = ""
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Surname:
+        return cls(surname=data.get("surname", "") or "")
+
+
+@dataclass(slots=True)
+class Name:
+    """The parts of a name the integration displays."""
+
+    first_name: str = ""
+    surname_list: list[Surname] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Name:
+        return cls(
+            first_name=data.get("first_name", "") or "",
+            surname_list=[
+                Surname.from_dict(s)
+                for s in data.get("surname_list", []) or []
+                if isinstance(s, dict)
+            ],
+        )
+
+
+@dataclass(slots=True)
+class EventRef:
+    """Reference from a person or family to an event."""
+
+    ref: str = ""
+    role: str | dict = ""
+
+    @classmethod
+    def from_dict(cls, data: dict) -> EventRef:
+        return cls(ref=_handle_from_ref(data), role=data.get("role", "") or "")
+
+
+@dataclass(slots=True)
+class MediaRef:
+    """Reference from a person to a media object."""
+
+    ref: str = ""
+
+    @classmethod
+    def from_dict(cls, data: dict) -> MediaRef:
+        return cls(ref=_handle_from_ref(data))
+
+
+@dataclass(slots=True)
+class Date:
+    """A Gramps date as serialized by Gramps Web."""
+
+    dateval: list = field(default_factory=list)
+    sortval: int = 0
+    modifier: int = 0
+    quality: int = 0
+    calendar: int = 0
+    text: str = ""
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Date:
+        return cls(
+            dateval=list(data.get("dateval") or data.get("val") or []),
+            sortval=_int(data.get("sortval"), 0),
+            modifier=_int(data.get("modifier"), 0),
+            quality=_int(data.get("quality"), 0),
+            calendar=_int(data.get("calendar"), 0),
+            text=data.get("text", "") or "",
+        )
+
+
+@dataclass(slots=True)
+class Person:
+    """A Gramps person."""
+
+    handle: str = ""
+    change: int = 0
+    primary_name: Name = field(default_factory=Name)
+    event_ref_list: list[EventRef] = field(default_factory=list)
+    birth_ref_index: int = -1
+    death_ref_index: int = -1
+    media_list: list[MediaRef] = field(default_factory=list)
+    family_list: list[str] = field(default_factory=list)
+    tag_list: list[str] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Person:
+        return cls(
+            handle=data.get("handle", "") or "",
+            change=_int(data.get("change"), 0),
+            primary_name=Name.from_dict(data.get("primary_name") or {}),
+            event_ref_list=[
+                EventRef.from_dict(r)
+                for r in data.get("event_ref_list", []) or []
+                if isinstance(r, dict)
+            ],
+            birth_ref_index=_int(data.get("birth_ref_index")),
+            death_ref_index=_int(data.get("death_ref_index")),
+            media_list=[
+                MediaRef.from_dict(r)
+                for r in data.get("media_list", []) or []
+                if isinstance(r, dict)
+            ],
+            family_list=[
+                h for h in map(_handle_from_ref, data.get("family_list", []) or []) if h
+            ],
+            tag_list=list(data.get("tag_list", []) or []),
+        )
+
+
+@dataclass(slots=True)
+class Event:
+    """A Gramps event, optionally with its backlinks."""
+
+    handle: str = ""
+    change: int = 0
+    type: str | dict = ""
+    date: Date | None = None
+    backlinks: dict[str, list[str]] = field(default_factory=dict)
+
+    @property
+    def type_string(self) -> str:
+        """Return the lower-cased event type."""
+        return _intern(_type_string(self.type).lower())
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Event:
+        date_data = data.get("date")
+        return cls(
+            handle=data.get("handle", "") or "",
+            change=_int(data.get("change"), 0),
+            type=data.get("type", "") or "",
+            date=Date.from_dict(date_data) if isinstance(date_data, dict) else None,
+            backlinks=data.get("backlinks") or {},
+        )
+
+
+@dataclass(slots=True)
+class Family:
+    """A Gramps family."""
+
+    handle: str = ""
+    change: int = 0
+    father_handle: str | None = None
+    mother_handle: str | None = None
+    event_ref_list: list[EventRef] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Family:
+        return cls(
+            handle=data.get("handle", "") or "",
+            change=_int(data.get("change"), 0),
+            father_handle=data.get("father_handle") or None,
+            mother_handle=data.get("mother_handle") or None,
+            event_ref_list=[
+                EventRef.from_dict(r)
+                for r in data.get("event_ref_list", []) or []
+                if isinstance(r, dict)
+            ],
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class PersonSummary:
+    """The cached projection of a person.
+
+    Event, family and media references are reduced to their handles and
+    repeated strings are interned, so large trees stay small in memory and
+    the cache can be shared without being mutated.
+    """
+
+    handle: str
+    change: int = 0
+    first_name: str = ""
+    surname: str = ""
+    birth_ref: str | None = None
+    death_ref: str | None = None
+    event_refs: tuple[str, ...] = ()
+    primary_events: tuple[str, ...] = ()
+    family_list: tuple[str, ...] = ()
+    media_handle: str | None = None
+    tag_list: tuple[str, ...] = ()
+
+    @property
+    def name(self) -> str:
+        """Return the display name."""
+        return f"{self.first_name} {self.surname}".strip() or "Unknown"
+
+    @classmethod
+    def from_person(cls, person: Person) -> PersonSummary:
+        event_refs = tuple(_strip_path(ref.ref) for ref in person.event_ref_list)
+        primary_events = tuple(
+            handle
+            for handle, ref in zip(event_refs, person.event_ref_list)
+            if handle and _type_string(ref.role) in ("", "Primary")
+        )
+
+        def indexed(index: int) -> str | None:
+            if 0 <= index < len(event_refs):
+                return event_refs[index] or None
+            return None
+
+        name = person.primary_name
+        surname = name.surname_list[0].surname if name.surname_list else ""
+        media_handle = person.media_list[0].ref if person.media_list else ""
+        return cls(
+            handle=person.handle,
+            change=person.change,
+            first_name=_intern(name.first_name),
+            surname=_intern(surname),
+            birth_ref=indexed(person.birth_ref_index),
+            death_ref=indexed(person.death_ref_index),
+            event_refs=tuple(ref for ref in event_refs if ref),
+            primary_events=primary_events,
+            family_list=tuple(person.family_list),
+            media_handle=_strip_path(media_handle) or None,
+            tag_list=tuple(_intern(tag) for tag in person.tag_list),
+        )
+
+
+_DECODERS: dict = {}
+
+
+def _msgspec_decoder(model: type, many: bool):
+    """Return a cached msgspec decoder for a model (or a list of it)."""
+    key = (model, many)
+    if key not in _DECODERS:
+        _DECODERS[key] = msgspec.json.Decoder(list[model] if many else model)
+    return _DECODERS[key]
+
+
+def loads(content: bytes):
+    """Decode a JSON payload into plain Python objects."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def decode(content: bytes, model: type, many: bool = False):
+    """Decode a JSON payload into a model instance or a list of them."""
+    if msgspec is not None:
+        try:
+            return _msgspec_decoder(model, many).decode(content)
+        except msgspec.ValidationError as err:
+            _LOGGER.debug(
+                "Typed decoding of %s failed, using generic decoder: %s",
+                model.__name__,
+                err,
+            )
+
+    data = loads(content)
+    if many:
+        if not isinstance(data, list):
+            raise ValueError(f"Expected a list of {model.__name__}, got {type(data)}")
+        return [model.from_dict(item) for item in data if isinstance(item, dict)]
+    if not isinstance(data, dict):
+        raise ValueError(f"Expected {model.__name__}, got {type(data)}")
+    return model.from_dict(data)
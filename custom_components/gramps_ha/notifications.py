@@ -0,0 +1,134 @@
+"""Scheduled "tomorrow" notifications for birthdays, deathdays and anniversaries."""
+
+from __future__ import annotations
+
+import logging
+from datetime import date, datetime, timedelta
+from functools import partial
+
+from homeassistant.components import persistent_notification
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .records import AnniversaryRecord, BirthdayRecord, DeathdayRecord
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+NOTIFY_HOUR = 9  # local time on the day before the event
+
+
+def _next_date(record) -> date:
+    """Return the next occurrence of any record type."""
+    if isinstance(record, BirthdayRecord):
+        return record.next_birthday
+    if isinstance(record, DeathdayRecord):
+        return record.next_deathday
+    return record.next_anniversary
+
+
+def _message(record) -> tuple[str, str]:
+    """Return title and message of the notification for a record."""
+    if isinstance(record, BirthdayRecord):
+        return (
+            "🎉 Geburtstag morgen!",
+            f"{record.person_name} hat morgen Geburtstag!\n\n"
+            f"Zukünftiges Alter: {record.age} Jahre",
+        )
+    # years_ago and years_together count until today; the notification is
+    # about the next occurrence, which may already be in the next year
+    if isinstance(record, DeathdayRecord):
+        years = record.next_deathday.year - record.death_date.year
+        return (
+            "🕯️ Gedenktag morgen",
+            f"Morgen jährt sich der Todestag von {record.person_name} "
+            f"zum {years}. Mal.",
+        )
+    if isinstance(record, AnniversaryRecord):
+        years = record.next_anniversary.year - record.marriage_date.year
+        return (
+            "💍 Hochzeitstag morgen!",
+            f"{record.person_name} feiern morgen ihren {years}. Hochzeitstag.",
+        )
+    raise TypeError(f"Unsupported record {type(record)}")
+
+
+class GrampsNotifier:
+    """Schedule one notification per event at NOTIFY_HOUR on the day before.
+
+    Sent notifications are persisted, so a restart or a repeated refresh
+    does not notify twice about the same occurrence.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self.hass = hass
+        self._store: Store = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.notifications"
+        )
+        self._sent: set[str] = set()
+        self._unsubs: list[CALLBACK_TYPE] = []
+
+    async def async_load(self) -> None:
+        """Load the sent notifications, dropping those of past days."""
+        data = await self._store.async_load() or {}
+        today = dt_util.now().date().isoformat()
+        self._sent = {
+            key for key in data.get("sent", []) if key.rsplit(":", 1)[-1] >= today
+        }
+
+    @callback
+    def async_cancel(self) -> None:
+        """Cancel all scheduled notifications."""
+        while self._unsubs:
+            self._unsubs.pop()()
+
+    @callback
+    def async_schedule(self, records_by_kind: dict[str, list]) -> None:
+        """(Re)schedule the notifications for events happening tomorrow.
+
+        Called after every refresh and at midnight, so only tomorrow's
+        events need a timer. If the notification time already passed, the
+        notification is sent right away.
+        """
+        self.async_cancel()
+        now = dt_util.now()
+        tomorrow = now.date() + timedelta(days=1)
+
+        for kind, records in records_by_kind.items():
+            for record in records or []:
+                if _next_date(record) != tomorrow:
+                    continue
+                key = f"{kind}:{record.key}:{tomorrow.isoformat()}"
+                if key in self._sent:
+                    continue
+
+                notify_at = dt_util.start_of_local_day(now.date()).replace(
+                    hour=NOTIFY_HOUR
+                )
+                if notify_at <= now:
+                    self.hass.async_create_task(self._async_notify(key, record))
+                else:
+                    self._unsubs.append(
+                        async_track_point_in_time(
+                            self.hass, partial(self._async_fire, key, record), notify_at
+                        )
+                    )
+
+    async def _async_fire(self, key: str, record, _now: datetime) -> None:
+        await self._async_notify(key, record)
+
+    async def _async_notify(self, key: str, record) -> None:
+        """Create the notification unless it was already sent."""
+        if key in self._sent:
+            return
+        title, message = _message(record)
+        persistent_notification.async_create(
+            self.hass, message, title=title, notification_id=f"gramps_tomorrow_{key}"
+        )
+        _LOGGER.info("Tomorrow notification: %s", record.person_name)
+
+        self._sent.add(key)
+        await self._store.async_save({"sent": sorted(self._sent)})
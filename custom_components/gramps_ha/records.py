@@ -0,0 +1,336 @@
+"""Record types for upcoming birthdays, deathdays and anniversaries.
+
+Records built from approximate or range dates (see dates.GrampsDate) carry
+approximate=True, so they can be shown with a hint instead of being dropped.
+Every record exposes its original date as `origin` and can be recomputed for
+another day with `at(today)`, which is what index.DateIndex relies on, and a
+`key` identifying it across refreshes.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+
+
+def next_occurrence(origin: date, today: date) -> date:
+    """Return the next yearly recurrence of a date, on or after today.
+
+    February 29 falls back to February 28 in non-leap years.
+    """
+    for year in (today.year, today.year + 1):
+        try:
+            candidate = origin.replace(year=year)
+        except ValueError:
+            candidate = date(year, 2, 28)
+        if candidate >= today:
+            return candidate
+    return candidate
+
+
+@dataclass(slots=True, frozen=True)
+class BirthdayRecord:
+    """An upcoming birthday of a living person."""
+
+    person_name: str
+    birth_date: date
+    next_birthday: date
+    age: int
+    days_until: int
+    image_url: str | None = None
+    person_handle: str | None = None
+    approximate: bool = False
+
+    @classmethod
+    def create(
+        cls,
+        person_name: str,
+        birth_date: date,
+        today: date,
+        image_url: str | None = None,
+        person_handle: str | None = None,
+        approximate: bool = False,
+    ) -> BirthdayRecord:
+        """Create the record for the next birthday after today."""
+        next_birthday = next_occurrence(birth_date, today)
+        return cls(
+            person_name=person_name,
+            birth_date=birth_date,
+            next_birthday=next_birthday,
+            age=next_birthday.year - birth_date.year,
+            days_until=(next_birthday - today).days,
+            image_url=image_url,
+            person_handle=person_handle,
+            approximate=approximate,
+        )
+
+    @property
+    def origin(self) -> date:
+        return self.birth_date
+
+    @property
+    def key(self) -> str:
+        return self.person_handle or self.person_name
+
+    def at(self, today: date) -> BirthdayRecord:
+        """Return the record recomputed for another day."""
+        return self.create(
+            self.person_name,
+            self.birth_date,
+            today,
+            image_url=self.image_url,
+            person_handle=self.person_handle,
+            approximate=self.approximate,
+        )
+
+    def as_dict(self) -> dict:
+        """Return the record as state attributes with ISO dates."""
+        result = {
+            "person_name": self.person_name,
+            "birth_date": self.birth_date.isoformat(),
+            "next_birthday": self.next_birthday.isoformat(),
+            "age": self.age,
+            "days_until": self.days_until,
+        }
+        if self.image_url:
+            result["image_url"] = self.image_url
+        if self.person_handle:
+            result["person_handle"] = self.person_handle
+        if self.approximate:
+            result["approximate"] = True
+        return result
+
+
+@dataclass(slots=True, frozen=True)
+class DeathdayRecord:
+    """An upcoming memorial date of a deceased person."""
+
+    person_name: str
+    death_date: date
+    next_deathday: date
+    years_ago: int
+    days_until: int
+    image_url: str | None = None
+    person_handle: str | None = None
+    approximate: bool = False
+
+    @classmethod
+    def create(
+        cls,
+        person_name: str,
+        death_date: date,
+        today: date,
+        image_url: str | None = None,
+        person_handle: str | None = None,
+        approximate: bool = False,
+    ) -> DeathdayRecord:
+        """Create the record for the next deathday after today."""
+        next_deathday = next_occurrence(death_date, today)
+        return cls(
+            person_name=person_name,
+            death_date=death_date,
+            next_deathday=next_deathday,
+            years_ago=today.year - death_date.year,
+            days_until=(next_deathday - today).days,
+            image_url=image_url,
+            person_handle=person_handle,
+            approximate=approximate,
+        )
+
+    @property
+    def origin(self) -> date:
+        return self.death_date
+
+    @property
+    def key(self) -> str:
+        return self.person_handle or self.person_name
+
+    def at(self, today: date) -> DeathdayRecord:
+        """Return the record recomputed for another day."""
+        return self.create(
+            self.person_name,
+            self.death_date,
+            today,
+            image_url=self.image_url,
+            person_handle=self.person_handle,
+            approximate=self.approximate,
+        )
+
+    def as_dict(self) -> dict:
+        """Return the record as state attributes with ISO dates."""
+        result = {
+            "person_name": self.person_name,
+            "death_date": self.death_date.isoformat(),
+            "next_deathday": self.next_deathday.isoformat(),
+            "years_ago": self.years_ago,
+            "days_until": self.days_until,
+            "person_handle": self.person_handle,
+        }
+        if self.image_url:
+            result["image_url"] = self.image_url
+        if self.approximate:
+            result["approximate"] = True
+        return result
+
+
+@dataclass(slots=True, frozen=True)
+class AnniversaryRecord:
+    """An upcoming wedding anniversary of a couple."""
+
+    person_name: str
+    marriage_date: date
+    next_anniversary: date
+    years_together: int
+    days_until: int
+    family_handle: str | None = None
+    image_url_person1: str | None = None
+    image_url_person2: str | None = None
+    approximate: bool = False
+
+    @classmethod
+    def create(
+        cls,
+        person_name: str,
+        marriage_date: date,
+        today: date,
+        family_handle: str | None = None,
+        image_url_person1: str | None = None,
+        image_url_person2: str | None = None,
+        approximate: bool = False,
+    ) -> AnniversaryRecord:
+        """Create the record for the next anniversary after today."""
+        next_anniversary = next_occurrence(marriage_date, today)
+        return cls(
+            person_name=person_name,
+            marriage_date=marriage_date,
+            next_anniversary=next_anniversary,
+            years_together=today.year - marriage_date.year,
+            days_until=(next_anniversary - today).days,
+            family_handle=family_handle,
+            image_url_person1=image_url_person1,
+            image_url_person2=image_url_person2,
+            approximate=approximate,
+        )
+
+    @property
+    def origin(self) -> date:
+        return self.marriage_date
+
+    @property
+    def key(self) -> str:
+        return self.family_handle or self.person_name
+
+    def at(self, today: date) -> AnniversaryRecord:
+        """Return the record recomputed for another day."""
+        return self.create(
+            self.person_name,
+            self.marriage_date,
+            today,
+            family_handle=self.family_handle,
+            image_url_person1=self.image_url_person1,
+            image_url_person2=self.image_url_person2,
+            approximate=self.approximate,
+        )
+
+    def as_dict(self) -> dict:
+        """Return the record as state attributes with ISO dates."""
+        result = {
+            "person_name": self.person_name,
+            "marriage_date": self.marriage_date.isoformat(),
+            "next_anniversary": self.next_anniversary.isoformat(),
+            "years_together": self.years_together,
+            "days_until": self.days_until,
+        }
+        if self.family_handle:
+            result["family_handle"] = self.family_handle
+        if self.image_url_person1:
+            result["image_url_person1"] = self.image_url_person1
+        if self.image_url_person2:
+            result["image_url_person2"] = self.image_url_person2
+        if self.approximate:
+            result["approximate"] = True
+        return result
+
+
+@dataclass(slots=True, frozen=True)
+class EventRecord:
+    """An upcoming recurrence of an event of a configured type."""
+
+    event_type: str
+    person_name: str
+    event_date: date
+    next_date: date
+    years: int
+    days_until: int
+    event_handle: str | None = None
+    person_handle: str | None = None
+    image_url: str | None = None
+    approximate: bool = False
+
+    @classmethod
+    def create(
+        cls,
+        event_type: str,
+        person_name: str,
+        event_date: date,
+        today: date,
+        event_handle: str | None = None,
+        person_handle: str | None = None,
+        image_url: str | None = None,
+        approximate: bool = False,
+    ) -> EventRecord:
+        """Create the record for the next recurrence after today."""
+        next_date = next_occurrence(event_date, today)
+        return cls(
+            event_type=event_type,
+            person_name=person_name,
+            event_date=event_date,
+            next_date=next_date,
+            years=next_date.year - event_date.year,
+            days_until=(next_date - today).days,
+            event_handle=event_handle,
+            person_handle=person_handle,
+            image_url=image_url,
+            approximate=approximate,
+        )
+
+    @property
+    def origin(self) -> date:
+        return self.event_date
+
+    @property
+    def key(self) -> str:
+        return f"{self.event_handle}:{self.person_handle or self.person_name}"
+
+    def at(self, today: date) -> EventRecord:
+        """Return the record recomputed for another day."""
+        return self.create(
+            self.event_type,
+            self.person_name,
+            self.event_date,
+            today,
+            event_handle=self.event_handle,
+            person_handle=self.person_handle,
+            image_url=self.image_url,
+            approximate=self.approximate,
+        )
+
+    def as_dict(self) -> dict:
+        """Return the record as state attributes with ISO dates."""
+        result = {
+            "event_type": self.event_type,
+            "person_name": self.person_name,
+            "event_date": self.event_date.isoformat(),
+            "next_date": self.next_date.isoformat(),
+            "years": self.years,
+            "days_until": self.days_until,
+        }
+        if self.event_handle:
+            result["event_handle"] = self.event_handle
+        if self.person_handle:
+            result["person_handle"] = self.person_handle
+        if self.image_url:
+            result["image_url"] = self.image_url
+        if self.approximate:
+            result["approximate"] = True
+        return result
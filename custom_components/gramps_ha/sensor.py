@@ -1,866 +1,873 @@
-"""Sensor platform for Gramps Web integration."""
-
-from __future__ import annotations
-
-import logging
-from datetime import datetime, date
-
-from homeassistant.components.sensor import SensorEntity, SensorDeviceClass
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.device_registry import DeviceInfo, DeviceEntryType
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
-
-from .const import (
-    DOMAIN,
-    ATTR_PERSON_NAME,
-    ATTR_BIRTH_DATE,
-    ATTR_AGE,
-    ATTR_DAYS_UNTIL,
-    CONF_URL,
-    CONF_NUM_BIRTHDAYS,
-    DEFAULT_NUM_BIRTHDAYS,
-    CONF_SHOW_DEATHDAYS,
-    CONF_SHOW_ANNIVERSARIES,
-    DEFAULT_SHOW_DEATHDAYS,
-    DEFAULT_SHOW_ANNIVERSARIES,
-)
-
-_LOGGER = logging.getLogger(__name__)
-
-
-async def async_setup_entry(
-    hass: HomeAssistant,
-    entry: ConfigEntry,
-    async_add_entities: AddEntitiesCallback,
-) -> None:
-    """Set up Gramps Web sensors from a config entry."""
-    coordinator = hass.data[DOMAIN][entry.entry_id]
-    
-    # Get configuration
-    num_birthdays = entry.data.get(CONF_NUM_BIRTHDAYS, DEFAULT_NUM_BIRTHDAYS)
-    show_deathdays = entry.data.get(CONF_SHOW_DEATHDAYS, DEFAULT_SHOW_DEATHDAYS)
-    show_anniversaries = entry.data.get(CONF_SHOW_ANNIVERSARIES, DEFAULT_SHOW_ANNIVERSARIES)
-
-    sensors: list[SensorEntity] = []
-    
-    # Birthday sensors - create as many as configured
-    # even if there aren't enough birthdays. Sensors ohne Daten zeigen Defaultwerte.
-    for i in range(num_birthdays):
-        sensors.append(GrampsWebNextBirthdayNameSensor(coordinator, entry, i))
-        sensors.append(GrampsWebNextBirthdayAgeSensor(coordinator, entry, i))
-        sensors.append(GrampsWebNextBirthdayDateSensor(coordinator, entry, i))
-        sensors.append(GrampsWebNextBirthdayUpcomingDateSensor(coordinator, entry, i))
-        sensors.append(GrampsWebNextBirthdayDaysUntilSensor(coordinator, entry, i))
-        sensors.append(GrampsWebNextBirthdayImageSensor(coordinator, entry, i))
-        sensors.append(GrampsWebNextBirthdayLinkSensor(coordinator, entry, i))
-
-    # Deathday sensors (if enabled) - create as many as configured
-    if show_deathdays:
-        for i in range(num_birthdays):
-            sensors.append(GrampsWebNextDeathdayNameSensor(coordinator, entry, i))
-            sensors.append(GrampsWebNextDeathdayDateSensor(coordinator, entry, i))
-            sensors.append(GrampsWebNextDeathdayUpcomingDateSensor(coordinator, entry, i))
-            sensors.append(GrampsWebNextDeathdayYearsAgoSensor(coordinator, entry, i))
-            sensors.append(GrampsWebNextDeathdayDaysUntilSensor(coordinator, entry, i))
-            sensors.append(GrampsWebNextDeathdayImageSensor(coordinator, entry, i))
-            sensors.append(GrampsWebNextDeathdayLinkSensor(coordinator, entry, i))
-
-    # Anniversary sensors (if enabled) - create as many as configured
-    if show_anniversaries:
-        for i in range(num_birthdays):
-            sensors.append(GrampsWebNextAnniversaryNameSensor(coordinator, entry, i))
-            sensors.append(GrampsWebNextAnniversaryYearsTogetherSensor(coordinator, entry, i))
-            sensors.append(GrampsWebNextAnniversaryDateSensor(coordinator, entry, i))
-            sensors.append(GrampsWebNextAnniversaryUpcomingDateSensor(coordinator, entry, i))
-            sensors.append(GrampsWebNextAnniversaryDaysUntilSensor(coordinator, entry, i))
-            sensors.append(GrampsWebNextAnniversaryImagePerson1Sensor(coordinator, entry, i))
-            sensors.append(GrampsWebNextAnniversaryImagePerson2Sensor(coordinator, entry, i))
-            sensors.append(GrampsWebNextAnniversaryLinkSensor(coordinator, entry, i))
-
-    sensors.append(GrampsWebAllBirthdaysSensor(coordinator, entry))
-
-    async_add_entities(sensors)
-
-
-class GrampsWebNextBirthdayBase(CoordinatorEntity, SensorEntity):
-    """Base class shared by the per-field next birthday sensors."""
-
-    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
-        super().__init__(coordinator)
-        self._index = index
-        self._entry = entry
-
-    def _get_birthday(self) -> dict | None:
-        if not self.coordinator.data:
-            return None
-        if self._index >= len(self.coordinator.data):
-            return None
-        return self.coordinator.data[self._index]
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        config_url = self._entry.data.get(CONF_URL)
-        return DeviceInfo(
-            identifiers={(DOMAIN, f"{self._entry.entry_id}_birthdays")},
-            name="Geburtstage" if self._entry.data.get("language") == "de" else "Birthdays",
-            manufacturer="Gramps Web",
-            model="Birthdays",
-            entry_type=DeviceEntryType.SERVICE,
-            configuration_url=config_url,
-            via_device=(DOMAIN, self._entry.entry_id),
-        )
-
-    @property
-    def extra_state_attributes(self):
-        birthday = self._get_birthday()
-        if not birthday:
-            return {}
-        return {
-            ATTR_PERSON_NAME: birthday.get("person_name"),
-            ATTR_BIRTH_DATE: birthday.get("birth_date"),
-            ATTR_AGE: birthday.get("age"),
-            ATTR_DAYS_UNTIL: birthday.get("days_until"),
-            "next_birthday": birthday.get("next_birthday"),
-            "image_url": birthday.get("image_url"),
-        }
-
-
-class GrampsWebNextBirthdayNameSensor(GrampsWebNextBirthdayBase):
-    """Next birthday sensor showing only the name."""
-
-    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
-        super().__init__(coordinator, entry, index)
-        self._attr_name = f"Next Birthday {index + 1} Name"
-        self._attr_unique_id = f"{entry.entry_id}_birthday_{index}_name"
-
-    @property
-    def native_value(self):
-        birthday = self._get_birthday()
-        if not birthday:
-            return "Keine Daten"
-        return birthday.get("person_name")
-
-    @property
-    def icon(self):
-        return "mdi:account"
-
-
-class GrampsWebNextBirthdayAgeSensor(GrampsWebNextBirthdayBase):
-    """Next birthday sensor showing only the age."""
-
-    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
-        super().__init__(coordinator, entry, index)
-        self._attr_name = f"Next Birthday {index + 1} Age"
-        self._attr_unique_id = f"{entry.entry_id}_birthday_{index}_age"
-
-    @property
-    def native_value(self):
-        birthday = self._get_birthday()
-        if not birthday:
-            return None
-        return birthday.get("age")
-
-    @property
-    def icon(self):
-        return "mdi:numeric"
-
-
-class GrampsWebNextBirthdayDateSensor(GrampsWebNextBirthdayBase):
-    """Next birthday sensor showing only the date."""
-
-    _attr_device_class = SensorDeviceClass.DATE
-
-    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
-        super().__init__(coordinator, entry, index)
-        self._attr_name = f"Next Birthday {index + 1} Date"
-        self._attr_unique_id = f"{entry.entry_id}_birthday_{index}_date"
-
-    @property
-    def native_value(self):
-        birthday = self._get_birthday()
-        if not birthday:
-            return None
-        birth_date = birthday.get("birth_date")
-        # We display the original birth date (not the upcoming birthday)
-        if birth_date:
-            try:
-                dt = datetime.fromisoformat(birth_date)
-                return dt.date()
-            except Exception as e:
-                _LOGGER.error(f"Birthday {self._index}: Error parsing date {birth_date}: {e}")
-                return None
-        return None
-
-    @property
-    def icon(self):
-        return "mdi:calendar"
-
-
-class GrampsWebNextBirthdayUpcomingDateSensor(GrampsWebNextBirthdayBase):
-    """Next birthday sensor showing the upcoming birthday date."""
-
-    _attr_device_class = SensorDeviceClass.DATE
-
-    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
-        super().__init__(coordinator, entry, index)
-        self._attr_name = f"Next Birthday {index + 1} Upcoming Date"
-        self._attr_unique_id = f"{entry.entry_id}_birthday_{index}_upcoming_date"
-
-    @property
-    def native_value(self):
-        birthday = self._get_birthday()
-        if not birthday:
-            return None
-        next_birthday = birthday.get("next_birthday")
-        # Display the upcoming birthday
-        if next_birthday:
-            try:
-                dt = datetime.fromisoformat(next_birthday)
-                return dt.date()
-            except Exception as e:
-                _LOGGER.error(f"Birthday Upcoming {self._index}: Error parsing date {next_birthday}: {e}")
-                return None
-        return None
-
-    @property
-    def icon(self):
-        return "mdi:cake"
-
-
-class GrampsWebNextBirthdayDaysUntilSensor(GrampsWebNextBirthdayBase):
-    """Next birthday sensor showing days until birthday."""
-
-    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
-        super().__init__(coordinator, entry, index)
-        self._attr_name = f"Next Birthday {index + 1} Days Until"
-        self._attr_unique_id = f"{entry.entry_id}_birthday_{index}_days_until"
-        self._attr_native_unit_of_measurement = "days"
-        self._attr_native_value = 999
-
-    @property
-    def native_value(self):
-        birthday = self._get_birthday()
-        result = None
-        if not birthday:
-            result = 999
-            _LOGGER.debug(f"Birthday {self._index + 1} Days Until: No birthday data, returning 999")
-        else:
-            result = birthday.get("days_until", 999)
-            _LOGGER.debug(
-                f"Birthday {self._index + 1} Days Until: "
-                f"Name={birthday.get('person_name')}, "
-                f"Days={result}, "
-                f"Type={type(result)}"
-            )
-        return result
-
-    @property
-    def available(self) -> bool:
-        """Return True if entity is available."""
-        return True
-
-    @property
-    def icon(self):
-        return "mdi:calendar-clock"
-
-
-class GrampsWebNextBirthdayImageSensor(GrampsWebNextBirthdayBase):
-    """Next birthday sensor showing image URL."""
-    
-    _attr_entity_registry_enabled_default = True
-
-    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
-        super().__init__(coordinator, entry, index)
-        self._attr_name = f"Next Birthday {index + 1} Image"
-        self._attr_unique_id = f"{entry.entry_id}_birthday_{index}_image"
-
-    @property
-    def native_value(self):
-        birthday = self._get_birthday()
-        if not birthday:
-            return None
-        return birthday.get("image_url", "No Image")
-
-    @property
-    def icon(self):
-        return "mdi:image-outline"
-
-    @property
-    def entity_picture(self):
-        """Return entity picture from Gramps if available."""
-        birthday = self._get_birthday()
-        if not birthday:
-            return None
-        return birthday.get("image_url")
-
-
-class GrampsWebNextBirthdayLinkSensor(GrampsWebNextBirthdayBase):
-    """Next birthday sensor showing Gramps Web link."""
-    
-    _attr_entity_registry_enabled_default = True
-
-    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
-        super().__init__(coordinator, entry, index)
-        self._attr_name = f"Next Birthday {index + 1} Link"
-        self._attr_unique_id = f"{entry.entry_id}_birthday_{index}_link"
-        self._entry = entry
-
-    @property
-    def native_value(self):
-        birthday = self._get_birthday()
-        if not birthday:
-            return None
-        person_handle = birthday.get("person_handle")
-        if not person_handle:
-            return None
-        base_url = self._entry.data.get(CONF_URL, "").rstrip("/")
-        return f"{base_url}/person/{person_handle}"
-
-    @property
-    def icon(self):
-        return "mdi:link"
-
-
-class GrampsWebAllBirthdaysSensor(CoordinatorEntity, SensorEntity):
-    """Representation of all upcoming birthdays sensor."""
-
-    def __init__(self, coordinator, entry: ConfigEntry) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator)
-        self._attr_name = "All Upcoming Birthdays"
-        self._attr_unique_id = f"{entry.entry_id}_all_birthdays"
-        self._entry = entry
-
-    @property
-    def native_value(self):
-        """Return the state of the sensor."""
-        if not self.coordinator.data:
-            return 0
-
-        return len(self.coordinator.data)
-
-    @property
-    def extra_state_attributes(self):
-        """Return the state attributes."""
-        if not self.coordinator.data:
-            return {"birthdays": []}
-
-        return {
-            "birthdays": self.coordinator.data,
-        }
-
-    @property
-    def icon(self):
-        """Return the icon to use in the frontend."""
-        return "mdi:calendar-multiple"
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return device info for grouping in HA UI."""
-        config_url = self._entry.data.get(CONF_URL)
-        return DeviceInfo(
-            identifiers={(DOMAIN, self._entry.entry_id)},
-            name=self._entry.title or "Gramps HA",
-            manufacturer="Gramps Web",
-            model="Birthdays",
-            entry_type=DeviceEntryType.SERVICE,
-            configuration_url=config_url,
-        )
-
-
-class GrampsWebNextDeathdayBase(CoordinatorEntity, SensorEntity):
-    """Base class for deathday sensors."""
-
-    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
-        super().__init__(coordinator)
-        self._index = index
-        self._entry = entry
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        config_url = self._entry.data.get(CONF_URL)
-        return DeviceInfo(
-            identifiers={(DOMAIN, f"{self._entry.entry_id}_deathdays")},
-            name="Gedenktage" if self._entry.data.get("language") == "de" else "Deathdays",
-            manufacturer="Gramps Web",
-            model="Deathdays",
-            entry_type=DeviceEntryType.SERVICE,
-            configuration_url=config_url,
-            via_device=(DOMAIN, self._entry.entry_id),
-        )
-
-
-class GrampsWebNextAnniversaryBase(CoordinatorEntity, SensorEntity):
-    """Base class for anniversary sensors."""
-
-    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
-        super().__init__(coordinator)
-        self._index = index
-        self._entry = entry
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        config_url = self._entry.data.get(CONF_URL)
-        return DeviceInfo(
-            identifiers={(DOMAIN, f"{self._entry.entry_id}_anniversaries")},
-            name="Hochzeitstage" if self._entry.data.get("language") == "de" else "Anniversaries",
-            manufacturer="Gramps Web",
-            model="Anniversaries",
-            entry_type=DeviceEntryType.SERVICE,
-            configuration_url=config_url,
-            via_device=(DOMAIN, self._entry.entry_id),
-        )
-
-
-class GrampsWebNextDeathdayNameSensor(GrampsWebNextDeathdayBase):
-    """Next deathday sensor showing name."""
-
-    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
-        super().__init__(coordinator, entry, index)
-        self._attr_name = f"Next Deathday {index + 1} Name"
-        self._attr_unique_id = f"{entry.entry_id}_deathday_{index}_name"
-
-    @property
-    def native_value(self):
-        if not self.coordinator.data:
-            return None
-        # Fetch deathday data
-        deathdays = self.coordinator.hass.data.get(f"{DOMAIN}_deathdays", {})
-        deathday_list = deathdays.get(self._entry.entry_id, [])
-        if self._index >= len(deathday_list):
-            return None
-        return deathday_list[self._index].get("person_name")
-
-    @property
-    def icon(self):
-        return "mdi:skull"
-
-
-class GrampsWebNextDeathdayDateSensor(GrampsWebNextDeathdayBase):
-    """Next deathday sensor showing death date."""
-
-    _attr_device_class = SensorDeviceClass.DATE
-
-    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
-        super().__init__(coordinator, entry, index)
-        self._attr_name = f"Next Deathday {index + 1} Date"
-        self._attr_unique_id = f"{entry.entry_id}_deathday_{index}_date"
-
-    @property
-    def native_value(self):
-        if not self.coordinator.data:
-            return None
-        deathdays = self.coordinator.hass.data.get(f"{DOMAIN}_deathdays", {})
-        deathday_list = deathdays.get(self._entry.entry_id, [])
-        if self._index >= len(deathday_list):
-            return None
-        death_date = deathday_list[self._index].get("death_date")
-        if death_date:
-            try:
-                dt = datetime.fromisoformat(death_date)
-                return dt.date()
-            except Exception as e:
-                _LOGGER.error(f"Deathday {self._index}: Error parsing date {death_date}: {e}")
-                return None
-        return None
-
-    @property
-    def icon(self):
-        return "mdi:calendar"
-
-
-class GrampsWebNextDeathdayUpcomingDateSensor(GrampsWebNextDeathdayBase):
-    """Next deathday sensor showing the upcoming deathday date."""
-
-    _attr_device_class = SensorDeviceClass.DATE
-
-    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
-        super().__init__(coordinator, entry, index)
-        self._attr_name = f"Next Deathday {index + 1} Upcoming Date"
-        self._attr_unique_id = f"{entry.entry_id}_deathday_{index}_upcoming_date"
-
-    @property
-    def native_value(self):
-        if not self.coordinator.data:
-            return None
-        deathdays = self.coordinator.hass.data.get(f"{DOMAIN}_deathdays", {})
-        deathday_list = deathdays.get(self._entry.entry_id, [])
-        if self._index >= len(deathday_list):
-            return None
-        next_deathday = deathday_list[self._index].get("next_deathday")
-        if next_deathday:
-            try:
-                dt = datetime.fromisoformat(next_deathday)
-                return dt.date()
-            except Exception as e:
-                _LOGGER.error(f"Deathday Upcoming {self._index}: Error parsing date {next_deathday}: {e}")
-                return None
-        return None
-
-    @property
-    def icon(self):
-        return "mdi:skull"
-
-
-class GrampsWebNextDeathdayYearsAgoSensor(GrampsWebNextDeathdayBase):
-    """Next deathday sensor showing years ago."""
-
-    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
-        super().__init__(coordinator, entry, index)
-        self._attr_name = f"Next Deathday {index + 1} Years Ago"
-        self._attr_unique_id = f"{entry.entry_id}_deathday_{index}_years_ago"
-
-    @property
-    def native_value(self):
-        if not self.coordinator.data:
-            return None
-        deathdays = self.coordinator.hass.data.get(f"{DOMAIN}_deathdays", {})
-        deathday_list = deathdays.get(self._entry.entry_id, [])
-        if self._index >= len(deathday_list):
-            return None
-        return deathday_list[self._index].get("years_ago")
-
-    @property
-    def icon(self):
-        return "mdi:history"
-
-
-class GrampsWebNextDeathdayDaysUntilSensor(GrampsWebNextDeathdayBase):
-    """Next deathday sensor showing days until."""
-
-    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
-        super().__init__(coordinator, entry, index)
-        self._attr_name = f"Next Deathday {index + 1} Days Until"
-        self._attr_unique_id = f"{entry.entry_id}_deathday_{index}_days_until"
-        self._attr_native_unit_of_measurement = "days"
-        self._attr_native_value = 999
-
-    @property
-    def native_value(self):
-        if not self.coordinator.data:
-            return 999
-        deathdays = self.coordinator.hass.data.get(f"{DOMAIN}_deathdays", {})
-        deathday_list = deathdays.get(self._entry.entry_id, [])
-        if self._index >= len(deathday_list):
-            return 999
-        return deathday_list[self._index].get("days_until", 999)
-
-    @property
-    def available(self) -> bool:
-        """Return True if entity is available."""
-        return True
-
-    @property
-    def icon(self):
-        return "mdi:calendar-clock"
-
-
-class GrampsWebNextDeathdayImageSensor(GrampsWebNextDeathdayBase):
-    """Next deathday sensor showing image URL."""
-    
-    _attr_entity_registry_enabled_default = True
-
-    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
-        super().__init__(coordinator, entry, index)
-        self._attr_name = f"Next Deathday {index + 1} Image"
-        self._attr_unique_id = f"{entry.entry_id}_deathday_{index}_image"
-
-    @property
-    def native_value(self):
-        if not self.coordinator.data:
-            return None
-        deathdays = self.coordinator.hass.data.get(f"{DOMAIN}_deathdays", {})
-        deathday_list = deathdays.get(self._entry.entry_id, [])
-        if self._index >= len(deathday_list):
-            return None
-        return deathday_list[self._index].get("image_url", "No Image")
-
-    @property
-    def icon(self):
-        return "mdi:image-outline"
-
-    @property
-    def entity_picture(self):
-        """Return entity picture from Gramps if available."""
-        if not self.coordinator.data:
-            return None
-        deathdays = self.coordinator.hass.data.get(f"{DOMAIN}_deathdays", {})
-        deathday_list = deathdays.get(self._entry.entry_id, [])
-        if self._index >= len(deathday_list):
-            return None
-        return deathday_list[self._index].get("image_url")
-
-
-class GrampsWebNextDeathdayLinkSensor(GrampsWebNextDeathdayBase):
-    """Next deathday sensor showing Gramps Web link."""
-    
-    _attr_entity_registry_enabled_default = True
-
-    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
-        super().__init__(coordinator, entry, index)
-        self._attr_name = f"Next Deathday {index + 1} Link"
-        self._attr_unique_id = f"{entry.entry_id}_deathday_{index}_link"
-
-    @property
-    def native_value(self):
-        if not self.coordinator.data:
-            return None
-        deathdays = self.coordinator.hass.data.get(f"{DOMAIN}_deathdays", {})
-        deathday_list = deathdays.get(self._entry.entry_id, [])
-        if self._index >= len(deathday_list):
-            return None
-        person_handle = deathday_list[self._index].get("person_handle")
-        if not person_handle:
-            return None
-        base_url = self._entry.data.get(CONF_URL, "").rstrip("/")
-        return f"{base_url}/person/{person_handle}"
-
-    @property
-    def icon(self):
-        return "mdi:link"
-
-
-class GrampsWebNextAnniversaryNameSensor(GrampsWebNextAnniversaryBase):
-    """Next anniversary sensor showing names."""
-
-    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
-        super().__init__(coordinator, entry, index)
-        self._attr_name = f"Next Anniversary {index + 1} Name"
-        self._attr_unique_id = f"{entry.entry_id}_anniversary_{index}_name"
-
-    @property
-    def native_value(self):
-        if not self.coordinator.data:
-            return None
-        anniversaries = self.coordinator.hass.data.get(f"{DOMAIN}_anniversaries", {})
-        anniversary_list = anniversaries.get(self._entry.entry_id, [])
-        if self._index >= len(anniversary_list):
-            return None
-        return anniversary_list[self._index].get("person_name")
-
-    @property
-    def icon(self):
-        return "mdi:heart-multiple"
-
-
-class GrampsWebNextAnniversaryYearsTogetherSensor(GrampsWebNextAnniversaryBase):
-    """Next anniversary sensor showing years together."""
-
-    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
-        super().__init__(coordinator, entry, index)
-        self._attr_name = f"Next Anniversary {index + 1} Years Together"
-        self._attr_unique_id = f"{entry.entry_id}_anniversary_{index}_years_together"
-        self._attr_native_unit_of_measurement = "years"
-
-    @property
-    def native_value(self):
-        if not self.coordinator.data:
-            return None
-        anniversaries = self.coordinator.hass.data.get(f"{DOMAIN}_anniversaries", {})
-        anniversary_list = anniversaries.get(self._entry.entry_id, [])
-        if self._index >= len(anniversary_list):
-            return None
-        return anniversary_list[self._index].get("years_together")
-
-    @property
-    def icon(self):
-        return "mdi:numeric"
-
-
-class GrampsWebNextAnniversaryDateSensor(GrampsWebNextAnniversaryBase):
-    """Next anniversary sensor showing marriage date."""
-
-    _attr_device_class = SensorDeviceClass.DATE
-
-    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
-        super().__init__(coordinator, entry, index)
-        self._attr_name = f"Next Anniversary {index + 1} Date"
-        self._attr_unique_id = f"{entry.entry_id}_anniversary_{index}_date"
-
-    @property
-    def native_value(self):
-        if not self.coordinator.data:
-            return None
-        anniversaries = self.coordinator.hass.data.get(f"{DOMAIN}_anniversaries", {})
-        anniversary_list = anniversaries.get(self._entry.entry_id, [])
-        if self._index >= len(anniversary_list):
-            return None
-        marriage_date = anniversary_list[self._index].get("marriage_date")
-        if marriage_date:
-            try:
-                dt = datetime.fromisoformat(marriage_date)
-                return dt.date()
-            except Exception as e:
-                _LOGGER.error(f"Anniversary {self._index}: Error parsing date {marriage_date}: {e}")
-                return None
-        return None
-
-    @property
-    def icon(self):
-        return "mdi:calendar"
-
-
-class GrampsWebNextAnniversaryUpcomingDateSensor(GrampsWebNextAnniversaryBase):
-    """Next anniversary sensor showing the upcoming anniversary date."""
-
-    _attr_device_class = SensorDeviceClass.DATE
-
-    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
-        super().__init__(coordinator, entry, index)
-        self._attr_name = f"Next Anniversary {index + 1} Upcoming Date"
-        self._attr_unique_id = f"{entry.entry_id}_anniversary_{index}_upcoming_date"
-
-    @property
-    def native_value(self):
-        if not self.coordinator.data:
-            return None
-        anniversaries = self.coordinator.hass.data.get(f"{DOMAIN}_anniversaries", {})
-        anniversary_list = anniversaries.get(self._entry.entry_id, [])
-        if self._index >= len(anniversary_list):
-            return None
-        next_anniversary = anniversary_list[self._index].get("next_anniversary")
-        if next_anniversary:
-            try:
-                dt = datetime.fromisoformat(next_anniversary)
-                return dt.date()
-            except Exception as e:
-                _LOGGER.error(f"Anniversary Upcoming {self._index}: Error parsing date {next_anniversary}: {e}")
-                return None
-        return None
-
-    @property
-    def icon(self):
-        return "mdi:heart"
-
-
-class GrampsWebNextAnniversaryDaysUntilSensor(GrampsWebNextAnniversaryBase):
-    """Next anniversary sensor showing days until."""
-
-    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
-        super().__init__(coordinator, entry, index)
-        self._attr_name = f"Next Anniversary {index + 1} Days Until"
-        self._attr_unique_id = f"{entry.entry_id}_anniversary_{index}_days_until"
-        self._attr_native_unit_of_measurement = "days"
-        self._attr_native_value = 999
-
-    @property
-    def native_value(self):
-        if not self.coordinator.data:
-            return 999
-        anniversaries = self.coordinator.hass.data.get(f"{DOMAIN}_anniversaries", {})
-        anniversary_list = anniversaries.get(self._entry.entry_id, [])
-        if self._index >= len(anniversary_list):
-            return 999
-        return anniversary_list[self._index].get("days_until", 999)
-
-    @property
-    def available(self) -> bool:
-        """Return True if entity is available."""
-        return True
-
-    @property
-    def icon(self):
-        return "mdi:calendar-clock"
-
-
-class GrampsWebNextAnniversaryImagePerson1Sensor(GrampsWebNextAnniversaryBase):
-    """Next anniversary sensor showing image of person 1."""
-    
-    _attr_entity_registry_enabled_default = True
-
-    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
-        super().__init__(coordinator, entry, index)
-        self._attr_name = f"Next Anniversary {index + 1} Image Person 1"
-        self._attr_unique_id = f"{entry.entry_id}_anniversary_{index}_image_person1"
-
-    @property
-    def native_value(self):
-        if not self.coordinator.data:
-            return None
-        anniversaries = self.coordinator.hass.data.get(f"{DOMAIN}_anniversaries", {})
-        anniversary_list = anniversaries.get(self._entry.entry_id, [])
-        if self._index >= len(anniversary_list):
-            return None
-        return anniversary_list[self._index].get("image_url_person1", "No Image")
-
-    @property
-    def icon(self):
-        return "mdi:image-outline"
-
-    @property
-    def entity_picture(self):
-        """Return entity picture from Gramps if available."""
-        if not self.coordinator.data:
-            return None
-        anniversaries = self.coordinator.hass.data.get(f"{DOMAIN}_anniversaries", {})
-        anniversary_list = anniversaries.get(self._entry.entry_id, [])
-        if self._index >= len(anniversary_list):
-            return None
-        return anniversary_list[self._index].get("image_url_person1")
-
-
-class GrampsWebNextAnniversaryImagePerson2Sensor(GrampsWebNextAnniversaryBase):
-    """Next anniversary sensor showing image of person 2."""
-    
-    _attr_entity_registry_enabled_default = True
-
-    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
-        super().__init__(coordinator, entry, index)
-        self._attr_name = f"Next Anniversary {index + 1} Image Person 2"
-        self._attr_unique_id = f"{entry.entry_id}_anniversary_{index}_image_person2"
-
-    @property
-    def native_value(self):
-        if not self.coordinator.data:
-            return None
-        anniversaries = self.coordinator.hass.data.get(f"{DOMAIN}_anniversaries", {})
-        anniversary_list = anniversaries.get(self._entry.entry_id, [])
-        if self._index >= len(anniversary_list):
-            return None
-        return anniversary_list[self._index].get("image_url_person2", "No Image")
-
-    @property
-    def icon(self):
-        return "mdi:image-outline"
-
-    @property
-    def entity_picture(self):
-        """Return entity picture from Gramps if available."""
-        if not self.coordinator.data:
-            return None
-        anniversaries = self.coordinator.hass.data.get(f"{DOMAIN}_anniversaries", {})
-        anniversary_list = anniversaries.get(self._entry.entry_id, [])
-        if self._index >= len(anniversary_list):
-            return None
-        return anniversary_list[self._index].get("image_url_person2")
-
-
-class GrampsWebNextAnniversaryLinkSensor(GrampsWebNextAnniversaryBase):
-    """Next anniversary sensor showing Gramps Web link to family."""
-    
-    _attr_entity_registry_enabled_default = True
-
-    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
-        super().__init__(coordinator, entry, index)
-        self._attr_name = f"Next Anniversary {index + 1} Link"
-        self._attr_unique_id = f"{entry.entry_id}_anniversary_{index}_link"
-
-    @property
-    def native_value(self):
-        if not self.coordinator.data:
-            return None
-        anniversaries = self.coordinator.hass.data.get(f"{DOMAIN}_anniversaries", {})
-        anniversary_list = anniversaries.get(self._entry.entry_id, [])
-        if self._index >= len(anniversary_list):
-            return None
-        family_handle = anniversary_list[self._index].get("family_handle")
-        if not family_handle:
-            return None
-        base_url = self._entry.data.get(CONF_URL, "").rstrip("/")
-        return f"{base_url}/family/{family_handle}"
-
-    @property
-    def icon(self):
-        return "mdi:link"
+"""Sensor platform for Gramps Web integration."""
+
+from __future__ import annotations
+
+import logging
+
+from homeassistant.components.sensor import (
+    DOMAIN as SENSOR_DOMAIN,
+    SensorEntity,
+    SensorDeviceClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.device_registry import DeviceInfo, DeviceEntryType
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import slugify
+
+from .const import (
+    DOMAIN,
+    ATTR_PERSON_NAME,
+    ATTR_BIRTH_DATE,
+    ATTR_AGE,
+    ATTR_DAYS_UNTIL,
+    CONF_URL,
+    CONF_NUM_BIRTHDAYS,
+    DEFAULT_NUM_BIRTHDAYS,
+    CONF_DYNAMIC_ENTITIES,
+    DEFAULT_DYNAMIC_ENTITIES,
+    CONF_CONSOLIDATED_SENSORS,
+    DEFAULT_CONSOLIDATED_SENSORS,
+)
+from .records import AnniversaryRecord, BirthdayRecord, DeathdayRecord, EventRecord
+from .snapshot import Snapshot
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Gramps Web sensors from a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    # Deathdays, anniversaries and events have coordinators of their own
+    coordinators = coordinator.coordinators
+
+    # Get configuration
+    num_birthdays = entry.data.get(CONF_NUM_BIRTHDAYS, DEFAULT_NUM_BIRTHDAYS)
+    dynamic = entry.data.get(CONF_DYNAMIC_ENTITIES, DEFAULT_DYNAMIC_ENTITIES)
+    consolidated = entry.data.get(CONF_CONSOLIDATED_SENSORS, DEFAULT_CONSOLIDATED_SENSORS)
+    event_types = coordinator.api.event_types if "events" in coordinators else []
+
+    # The sensors of one position (slot) of the upcoming list, per kind
+    slot_sensors = {
+        "birthdays": (
+            GrampsWebNextBirthdayNameSensor,
+            GrampsWebNextBirthdayAgeSensor,
+            GrampsWebNextBirthdayDateSensor,
+            GrampsWebNextBirthdayUpcomingDateSensor,
+            GrampsWebNextBirthdayDaysUntilSensor,
+            GrampsWebNextBirthdayImageSensor,
+            GrampsWebNextBirthdayLinkSensor,
+        ),
+        "deathdays": (
+            GrampsWebNextDeathdayNameSensor,
+            GrampsWebNextDeathdayDateSensor,
+            GrampsWebNextDeathdayUpcomingDateSensor,
+            GrampsWebNextDeathdayYearsAgoSensor,
+            GrampsWebNextDeathdayDaysUntilSensor,
+            GrampsWebNextDeathdayImageSensor,
+            GrampsWebNextDeathdayLinkSensor,
+        ),
+        "anniversaries": (
+            GrampsWebNextAnniversaryNameSensor,
+            GrampsWebNextAnniversaryYearsTogetherSensor,
+            GrampsWebNextAnniversaryDateSensor,
+            GrampsWebNextAnniversaryUpcomingDateSensor,
+            GrampsWebNextAnniversaryDaysUntilSensor,
+            GrampsWebNextAnniversaryImagePerson1Sensor,
+            GrampsWebNextAnniversaryImagePerson2Sensor,
+            GrampsWebNextAnniversaryLinkSensor,
+        ),
+    }
+    if consolidated:
+        # A single sensor per position, the fields are its attributes
+        slot_sensors = {
+            "birthdays": (GrampsWebBirthdaySlotSensor,),
+            "deathdays": (GrampsWebDeathdaySlotSensor,),
+            "anniversaries": (GrampsWebAnniversarySlotSensor,),
+        }
+
+    sensors: list[SensorEntity] = []
+
+    # Deathdays and anniversaries only if enabled
+    for kind, classes in slot_sensors.items():
+        if kind not in coordinators:
+            continue
+        if dynamic:
+            # Only positions with a record, added and removed as data changes
+            slots = DynamicSlotSensors(
+                hass, coordinators[kind], entry, classes, num_birthdays, async_add_entities
+            )
+            entry.async_on_unload(coordinators[kind].async_add_listener(slots.async_update))
+            slots.async_update()
+            continue
+        # As many as configured, even if there aren't enough records.
+        # Sensors ohne Daten zeigen Defaultwerte.
+        for i in range(num_birthdays):
+            sensors.extend(cls(coordinators[kind], entry, i) for cls in classes)
+
+    # One sensor per further event type (if configured)
+    for event_type in event_types:
+        sensors.append(GrampsWebNextEventSensor(coordinators["events"], entry, event_type))
+
+    sensors.append(GrampsWebAllBirthdaysSensor(coordinators["birthdays"], entry))
+
+    async_add_entities(sensors)
+
+
+class DynamicSlotSensors:
+    """Add and remove the slot sensors of a kind with the number of records.
+
+    Only positions with a record get sensors. Positions that lose their
+    record are removed from the entity registry again, also those left by
+    an earlier run, so small trees keep no placeholder entities. Partial
+    results of a running refresh and an empty result right after records
+    only add sensors: removing the registry entries would lose the user's
+    names, areas and disabled flags.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator,
+        entry: ConfigEntry,
+        classes: tuple[type[GrampsWebSlotSensor], ...],
+        num_slots: int,
+        async_add_entities: AddEntitiesCallback,
+    ) -> None:
+        self._hass = hass
+        self._coordinator = coordinator
+        self._entry = entry
+        self._classes = classes
+        self._num_slots = num_slots
+        self._async_add_entities = async_add_entities
+        self._slots: list[list[GrampsWebSlotSensor]] = []
+        self._cleaned = False  # leftovers of an earlier run were removed
+
+    def _slot(self, index: int) -> list[GrampsWebSlotSensor]:
+        return [cls(self._coordinator, self._entry, index) for cls in self._classes]
+
+    @callback
+    def async_update(self) -> None:
+        """Match the sensors to the number of records of the snapshot."""
+        snapshot = self._coordinator.data
+        if snapshot is None or not self._coordinator.last_update_success:
+            # Keep what was registered until there is data to compare with
+            return
+        wanted = min(self._num_slots, len(snapshot))
+        grow_only = self._coordinator.partial or (not wanted and bool(self._slots))
+        if grow_only:
+            wanted = max(wanted, len(self._slots))
+        if wanted == len(self._slots) and (self._cleaned or grow_only):
+            return
+
+        added = []
+        while len(self._slots) < wanted:
+            slot = self._slot(len(self._slots))
+            self._slots.append(slot)
+            added.extend(slot)
+        if added:
+            self._async_add_entities(added)
+        if grow_only:
+            return
+
+        # Removing the registry entry also removes a running entity
+        registry = er.async_get(self._hass)
+        stale = range(wanted, len(self._slots) if self._cleaned else self._num_slots)
+        self._cleaned = True
+        for index in reversed(stale):
+            slot = self._slots.pop() if index < len(self._slots) else self._slot(index)
+            for entity in slot:
+                if entity_id := registry.async_get_entity_id(
+                    SENSOR_DOMAIN, DOMAIN, entity.unique_id
+                ):
+                    registry.async_remove(entity_id)
+        _LOGGER.debug(
+            "%s slot sensors: %s positions", self._coordinator.kind.capitalize(), wanted
+        )
+
+
+class GrampsWebSnapshotSensor(CoordinatorEntity, SensorEntity):
+    """Base class of sensors computed once per published snapshot.
+
+    The coordinator publishes an immutable Snapshot; the state, attributes
+    and picture are derived from it when it changes, so writing the state
+    only reads precomputed attributes. The state is only written if any of
+    them (or the availability) changed, so an update that leaves a sensor
+    as it was adds no recorder row or state changed event.
+    """
+
+    _attr_extra_state_attributes: dict | None = None
+
+    def __init__(self, coordinator, entry: ConfigEntry) -> None:
+        super().__init__(coordinator)
+        self._entry = entry
+        self._base_url = entry.data.get(CONF_URL, "").rstrip("/")
+
+    @property
+    def available(self) -> bool:
+        """Stay available with the last snapshot while refreshes fail."""
+        return self.coordinator.data is not None or super().available
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self._update_from_snapshot(self.coordinator.data)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        previous = self._written_state()
+        self._update_from_snapshot(self.coordinator.data)
+        if self._written_state() != previous:
+            self.async_write_ha_state()
+
+    def _written_state(self) -> tuple:
+        """Return everything the state write of the sensor depends on."""
+        return (
+            self.available,
+            self._attr_native_value,
+            self._attr_extra_state_attributes,
+            self._attr_entity_picture,
+        )
+
+    def _update_from_snapshot(self, snapshot: Snapshot | None) -> None:
+        raise NotImplementedError
+
+
+class GrampsWebSlotSensor(GrampsWebSnapshotSensor):
+    """Base class of sensors showing one field of the n-th upcoming record."""
+
+    _empty_value = None  # state while there is no record at the position
+
+    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
+        super().__init__(coordinator, entry)
+        self._index = index
+
+    def _update_from_snapshot(self, snapshot: Snapshot | None) -> None:
+        record = snapshot.record(self._index) if snapshot else None
+        if record is None:
+            self._attr_native_value = self._empty_value
+            self._attr_extra_state_attributes = None
+            self._attr_entity_picture = None
+            return
+        self._attr_native_value = self._value(record)
+        self._attr_extra_state_attributes = self._attributes(record)
+        self._attr_entity_picture = self._picture(record)
+
+    def _value(self, record):
+        raise NotImplementedError
+
+    def _attributes(self, record) -> dict | None:
+        return None
+
+    def _picture(self, record) -> str | None:
+        return None
+
+    def _link(self, path: str, handle: str | None) -> str | None:
+        if not handle:
+            return None
+        return f"{self._base_url}/{path}/{handle}"
+
+
+class GrampsWebNextBirthdayBase(GrampsWebSlotSensor):
+    """Base class shared by the per-field next birthday sensors."""
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        config_url = self._entry.data.get(CONF_URL)
+        return DeviceInfo(
+            identifiers={(DOMAIN, f"{self._entry.entry_id}_birthdays")},
+            name="Geburtstage" if self._entry.data.get("language") == "de" else "Birthdays",
+            manufacturer="Gramps Web",
+            model="Birthdays",
+            entry_type=DeviceEntryType.SERVICE,
+            configuration_url=config_url,
+            via_device=(DOMAIN, self._entry.entry_id),
+        )
+
+    def _attributes(self, birthday: BirthdayRecord) -> dict:
+        return {
+            ATTR_PERSON_NAME: birthday.person_name,
+            ATTR_BIRTH_DATE: birthday.birth_date.isoformat(),
+            ATTR_AGE: birthday.age,
+            ATTR_DAYS_UNTIL: birthday.days_until,
+            "next_birthday": birthday.next_birthday.isoformat(),
+            "image_url": birthday.image_url,
+            "approximate": birthday.approximate,
+        }
+
+
+class GrampsWebNextBirthdayNameSensor(GrampsWebNextBirthdayBase):
+    """Next birthday sensor showing only the name."""
+
+    _attr_icon = "mdi:account"
+    _empty_value = "Keine Daten"
+
+    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
+        super().__init__(coordinator, entry, index)
+        self._attr_name = f"Next Birthday {index + 1} Name"
+        self._attr_unique_id = f"{entry.entry_id}_birthday_{index}_name"
+
+    def _value(self, birthday: BirthdayRecord):
+        return birthday.person_name
+
+
+class GrampsWebNextBirthdayAgeSensor(GrampsWebNextBirthdayBase):
+    """Next birthday sensor showing only the age."""
+
+    _attr_icon = "mdi:numeric"
+
+    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
+        super().__init__(coordinator, entry, index)
+        self._attr_name = f"Next Birthday {index + 1} Age"
+        self._attr_unique_id = f"{entry.entry_id}_birthday_{index}_age"
+
+    def _value(self, birthday: BirthdayRecord):
+        return birthday.age
+
+
+class GrampsWebNextBirthdayDateSensor(GrampsWebNextBirthdayBase):
+    """Next birthday sensor showing only the date."""
+
+    _attr_device_class = SensorDeviceClass.DATE
+    _attr_icon = "mdi:calendar"
+
+    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
+        super().__init__(coordinator, entry, index)
+        self._attr_name = f"Next Birthday {index + 1} Date"
+        self._attr_unique_id = f"{entry.entry_id}_birthday_{index}_date"
+
+    def _value(self, birthday: BirthdayRecord):
+        # We display the original birth date (not the upcoming birthday)
+        return birthday.birth_date
+
+
+class GrampsWebNextBirthdayUpcomingDateSensor(GrampsWebNextBirthdayBase):
+    """Next birthday sensor showing the upcoming birthday date."""
+
+    _attr_device_class = SensorDeviceClass.DATE
+    _attr_icon = "mdi:cake"
+
+    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
+        super().__init__(coordinator, entry, index)
+        self._attr_name = f"Next Birthday {index + 1} Upcoming Date"
+        self._attr_unique_id = f"{entry.entry_id}_birthday_{index}_upcoming_date"
+
+    def _value(self, birthday: BirthdayRecord):
+        # Display the upcoming birthday
+        return birthday.next_birthday
+
+
+class GrampsWebNextBirthdayDaysUntilSensor(GrampsWebNextBirthdayBase):
+    """Next birthday sensor showing days until birthday."""
+
+    _attr_icon = "mdi:calendar-clock"
+    _attr_native_unit_of_measurement = "days"
+    _empty_value = 999
+
+    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
+        super().__init__(coordinator, entry, index)
+        self._attr_name = f"Next Birthday {index + 1} Days Until"
+        self._attr_unique_id = f"{entry.entry_id}_birthday_{index}_days_until"
+
+    def _value(self, birthday: BirthdayRecord):
+        _LOGGER.debug(
+            "Birthday %s Days Until: Name=%s, Days=%s",
+            self._index + 1,
+            birthday.person_name,
+            birthday.days_until,
+        )
+        return birthday.days_until
+
+    @property
+    def available(self) -> bool:
+        """Return True if entity is available."""
+        return True
+
+
+class GrampsWebNextBirthdayImageSensor(GrampsWebNextBirthdayBase):
+    """Next birthday sensor showing image URL."""
+
+    _attr_entity_registry_enabled_default = True
+    _attr_icon = "mdi:image-outline"
+
+    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
+        super().__init__(coordinator, entry, index)
+        self._attr_name = f"Next Birthday {index + 1} Image"
+        self._attr_unique_id = f"{entry.entry_id}_birthday_{index}_image"
+
+    def _value(self, birthday: BirthdayRecord):
+        return birthday.image_url or "No Image"
+
+    def _picture(self, birthday: BirthdayRecord) -> str | None:
+        """Return entity picture from Gramps if available."""
+        return birthday.image_url
+
+
+class GrampsWebNextBirthdayLinkSensor(GrampsWebNextBirthdayBase):
+    """Next birthday sensor showing Gramps Web link."""
+
+    _attr_entity_registry_enabled_default = True
+    _attr_icon = "mdi:link"
+
+    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
+        super().__init__(coordinator, entry, index)
+        self._attr_name = f"Next Birthday {index + 1} Link"
+        self._attr_unique_id = f"{entry.entry_id}_birthday_{index}_link"
+
+    def _value(self, birthday: BirthdayRecord):
+        return self._link("person", birthday.person_handle)
+
+
+class GrampsWebAllBirthdaysSensor(GrampsWebSnapshotSensor):
+    """Representation of all upcoming birthdays sensor.
+
+    Only a compact summary is kept in the attributes and the list and
+    statistics are not recorded; the full records are returned by the
+    gramps_ha.get_upcoming service.
+    """
+
+    _attr_icon = "mdi:calendar-multiple"
+    _unrecorded_attributes = frozenset({"birthdays", "statistics"})
+
+    def __init__(self, coordinator, entry: ConfigEntry) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, entry)
+        self._attr_name = "All Upcoming Birthdays"
+        self._attr_unique_id = f"{entry.entry_id}_all_birthdays"
+        self._num_birthdays = entry.data.get(CONF_NUM_BIRTHDAYS, DEFAULT_NUM_BIRTHDAYS)
+
+    def _update_from_snapshot(self, snapshot: Snapshot | None) -> None:
+        if not snapshot:
+            self._attr_native_value = 0
+            self._attr_extra_state_attributes = {"birthdays": []}
+            return
+        statistics = snapshot.statistics
+        self._attr_native_value = len(snapshot)
+        self._attr_extra_state_attributes = {
+            "next_7_days": statistics.get("next_7_days"),
+            "next_30_days": statistics.get("next_30_days"),
+            "birthdays": [
+                {
+                    ATTR_PERSON_NAME: birthday.person_name,
+                    "next_birthday": birthday.next_birthday.isoformat(),
+                    ATTR_AGE: birthday.age,
+                    ATTR_DAYS_UNTIL: birthday.days_until,
+                }
+                for birthday in snapshot.records[: self._num_birthdays]
+            ],
+            "statistics": statistics,
+        }
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return device info for grouping in HA UI."""
+        config_url = self._entry.data.get(CONF_URL)
+        return DeviceInfo(
+            identifiers={(DOMAIN, self._entry.entry_id)},
+            name=self._entry.title or "Gramps HA",
+            manufacturer="Gramps Web",
+            model="Birthdays",
+            entry_type=DeviceEntryType.SERVICE,
+            configuration_url=config_url,
+        )
+
+
+class GrampsWebNextDeathdayBase(GrampsWebSlotSensor):
+    """Base class for deathday sensors."""
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        config_url = self._entry.data.get(CONF_URL)
+        return DeviceInfo(
+            identifiers={(DOMAIN, f"{self._entry.entry_id}_deathdays")},
+            name="Gedenktage" if self._entry.data.get("language") == "de" else "Deathdays",
+            manufacturer="Gramps Web",
+            model="Deathdays",
+            entry_type=DeviceEntryType.SERVICE,
+            configuration_url=config_url,
+            via_device=(DOMAIN, self._entry.entry_id),
+        )
+
+
+class GrampsWebNextAnniversaryBase(GrampsWebSlotSensor):
+    """Base class for anniversary sensors."""
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        config_url = self._entry.data.get(CONF_URL)
+        return DeviceInfo(
+            identifiers={(DOMAIN, f"{self._entry.entry_id}_anniversaries")},
+            name="Hochzeitstage" if self._entry.data.get("language") == "de" else "Anniversaries",
+            manufacturer="Gramps Web",
+            model="Anniversaries",
+            entry_type=DeviceEntryType.SERVICE,
+            configuration_url=config_url,
+            via_device=(DOMAIN, self._entry.entry_id),
+        )
+
+
+class GrampsWebNextDeathdayNameSensor(GrampsWebNextDeathdayBase):
+    """Next deathday sensor showing name."""
+
+    _attr_icon = "mdi:skull"
+
+    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
+        super().__init__(coordinator, entry, index)
+        self._attr_name = f"Next Deathday {index + 1} Name"
+        self._attr_unique_id = f"{entry.entry_id}_deathday_{index}_name"
+
+    def _value(self, deathday: DeathdayRecord):
+        return deathday.person_name
+
+
+class GrampsWebNextDeathdayDateSensor(GrampsWebNextDeathdayBase):
+    """Next deathday sensor showing death date."""
+
+    _attr_device_class = SensorDeviceClass.DATE
+    _attr_icon = "mdi:calendar"
+
+    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
+        super().__init__(coordinator, entry, index)
+        self._attr_name = f"Next Deathday {index + 1} Date"
+        self._attr_unique_id = f"{entry.entry_id}_deathday_{index}_date"
+
+    def _value(self, deathday: DeathdayRecord):
+        return deathday.death_date
+
+
+class GrampsWebNextDeathdayUpcomingDateSensor(GrampsWebNextDeathdayBase):
+    """Next deathday sensor showing the upcoming deathday date."""
+
+    _attr_device_class = SensorDeviceClass.DATE
+    _attr_icon = "mdi:skull"
+
+    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
+        super().__init__(coordinator, entry, index)
+        self._attr_name = f"Next Deathday {index + 1} Upcoming Date"
+        self._attr_unique_id = f"{entry.entry_id}_deathday_{index}_upcoming_date"
+
+    def _value(self, deathday: DeathdayRecord):
+        return deathday.next_deathday
+
+
+class GrampsWebNextDeathdayYearsAgoSensor(GrampsWebNextDeathdayBase):
+    """Next deathday sensor showing years ago."""
+
+    _attr_icon = "mdi:history"
+
+    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
+        super().__init__(coordinator, entry, index)
+        self._attr_name = f"Next Deathday {index + 1} Years Ago"
+        self._attr_unique_id = f"{entry.entry_id}_deathday_{index}_years_ago"
+
+    def _value(self, deathday: DeathdayRecord):
+        return deathday.years_ago
+
+
+class GrampsWebNextDeathdayDaysUntilSensor(GrampsWebNextDeathdayBase):
+    """Next deathday sensor showing days until."""
+
+    _attr_icon = "mdi:calendar-clock"
+    _attr_native_unit_of_measurement = "days"
+    _empty_value = 999
+
+    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
+        super().__init__(coordinator, entry, index)
+        self._attr_name = f"Next Deathday {index + 1} Days Until"
+        self._attr_unique_id = f"{entry.entry_id}_deathday_{index}_days_until"
+
+    def _value(self, deathday: DeathdayRecord):
+        return deathday.days_until
+
+    @property
+    def available(self) -> bool:
+        """Return True if entity is available."""
+        return True
+
+
+class GrampsWebNextDeathdayImageSensor(GrampsWebNextDeathdayBase):
+    """Next deathday sensor showing image URL."""
+
+    _attr_entity_registry_enabled_default = True
+    _attr_icon = "mdi:image-outline"
+
+    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
+        super().__init__(coordinator, entry, index)
+        self._attr_name = f"Next Deathday {index + 1} Image"
+        self._attr_unique_id = f"{entry.entry_id}_deathday_{index}_image"
+
+    def _value(self, deathday: DeathdayRecord):
+        return deathday.image_url or "No Image"
+
+    def _picture(self, deathday: DeathdayRecord) -> str | None:
+        """Return entity picture from Gramps if available."""
+        return deathday.image_url
+
+
+class GrampsWebNextDeathdayLinkSensor(GrampsWebNextDeathdayBase):
+    """Next deathday sensor showing Gramps Web link."""
+
+    _attr_entity_registry_enabled_default = True
+    _attr_icon = "mdi:link"
+
+    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
+        super().__init__(coordinator, entry, index)
+        self._attr_name = f"Next Deathday {index + 1} Link"
+        self._attr_unique_id = f"{entry.entry_id}_deathday_{index}_link"
+
+    def _value(self, deathday: DeathdayRecord):
+        return self._link("person", deathday.person_handle)
+
+
+class GrampsWebNextAnniversaryNameSensor(GrampsWebNextAnniversaryBase):
+    """Next anniversary sensor showing names."""
+
+    _attr_icon = "mdi:heart-multiple"
+
+    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
+        super().__init__(coordinator, entry, index)
+        self._attr_name = f"Next Anniversary {index + 1} Name"
+        self._attr_unique_id = f"{entry.entry_id}_anniversary_{index}_name"
+
+    def _value(self, anniversary: AnniversaryRecord):
+        return anniversary.person_name
+
+
+class GrampsWebNextAnniversaryYearsTogetherSensor(GrampsWebNextAnniversaryBase):
+    """Next anniversary sensor showing years together."""
+
+    _attr_icon = "mdi:numeric"
+    _attr_native_unit_of_measurement = "years"
+
+    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
+        super().__init__(coordinator, entry, index)
+        self._attr_name = f"Next Anniversary {index + 1} Years Together"
+        self._attr_unique_id = f"{entry.entry_id}_anniversary_{index}_years_together"
+
+    def _value(self, anniversary: AnniversaryRecord):
+        return anniversary.years_together
+
+
+class GrampsWebNextAnniversaryDateSensor(GrampsWebNextAnniversaryBase):
+    """Next anniversary sensor showing marriage date."""
+
+    _attr_device_class = SensorDeviceClass.DATE
+    _attr_icon = "mdi:calendar"
+
+    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
+        super().__init__(coordinator, entry, index)
+        self._attr_name = f"Next Anniversary {index + 1} Date"
+        self._attr_unique_id = f"{entry.entry_id}_anniversary_{index}_date"
+
+    def _value(self, anniversary: AnniversaryRecord):
+        return anniversary.marriage_date
+
+
+class GrampsWebNextAnniversaryUpcomingDateSensor(GrampsWebNextAnniversaryBase):
+    """Next anniversary sensor showing the upcoming anniversary date."""
+
+    _attr_device_class = SensorDeviceClass.DATE
+    _attr_icon = "mdi:heart"
+
+    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
+        super().__init__(coordinator, entry, index)
+        self._attr_name = f"Next Anniversary {index + 1} Upcoming Date"
+        self._attr_unique_id = f"{entry.entry_id}_anniversary_{index}_upcoming_date"
+
+    def _value(self, anniversary: AnniversaryRecord):
+        return anniversary.next_anniversary
+
+
+class GrampsWebNextAnniversaryDaysUntilSensor(GrampsWebNextAnniversaryBase):
+    """Next anniversary sensor showing days until."""
+
+    _attr_icon = "mdi:calendar-clock"
+    _attr_native_unit_of_measurement = "days"
+    _empty_value = 999
+
+    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
+        super().__init__(coordinator, entry, index)
+        self._attr_name = f"Next Anniversary {index + 1} Days Until"
+        self._attr_unique_id = f"{entry.entry_id}_anniversary_{index}_days_until"
+
+    def _value(self, anniversary: AnniversaryRecord):
+        return anniversary.days_until
+
+    @property
+    def available(self) -> bool:
+        """Return True if entity is available."""
+        return True
+
+
+class GrampsWebNextAnniversaryImagePerson1Sensor(GrampsWebNextAnniversaryBase):
+    """Next anniversary sensor showing image of person 1."""
+
+    _attr_entity_registry_enabled_default = True
+    _attr_icon = "mdi:image-outline"
+
+    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
+        super().__init__(coordinator, entry, index)
+        self._attr_name = f"Next Anniversary {index + 1} Image Person 1"
+        self._attr_unique_id = f"{entry.entry_id}_anniversary_{index}_image_person1"
+
+    def _value(self, anniversary: AnniversaryRecord):
+        return anniversary.image_url_person1 or "No Image"
+
+    def _picture(self, anniversary: AnniversaryRecord) -> str | None:
+        """Return entity picture from Gramps if available."""
+        return anniversary.image_url_person1
+
+
+class GrampsWebNextAnniversaryImagePerson2Sensor(GrampsWebNextAnniversaryBase):
+    """Next anniversary sensor showing image of person 2."""
+
+    _attr_entity_registry_enabled_default = True
+    _attr_icon = "mdi:image-outline"
+
+    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
+        super().__init__(coordinator, entry, index)
+        self._attr_name = f"Next Anniversary {index + 1} Image Person 2"
+        self._attr_unique_id = f"{entry.entry_id}_anniversary_{index}_image_person2"
+
+    def _value(self, anniversary: AnniversaryRecord):
+        return anniversary.image_url_person2 or "No Image"
+
+    def _picture(self, anniversary: AnniversaryRecord) -> str | None:
+        """Return entity picture from Gramps if available."""
+        return anniversary.image_url_person2
+
+
+class GrampsWebNextAnniversaryLinkSensor(GrampsWebNextAnniversaryBase):
+    """Next anniversary sensor showing Gramps Web link to family."""
+
+    _attr_entity_registry_enabled_default = True
+    _attr_icon = "mdi:link"
+
+    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
+        super().__init__(coordinator, entry, index)
+        self._attr_name = f"Next Anniversary {index + 1} Link"
+        self._attr_unique_id = f"{entry.entry_id}_anniversary_{index}_link"
+
+    def _value(self, anniversary: AnniversaryRecord):
+        return self._link("family", anniversary.family_handle)
+
+
+class GrampsWebSlotSummaryBase(GrampsWebSlotSensor):
+    """One sensor per position instead of one per field.
+
+    The state is the days until the next date, all fields of the record are
+    attributes. This needs a seventh of the entities, listeners and state
+    writes of the per-field sensors.
+    """
+
+    _attr_icon = "mdi:calendar-clock"
+    _attr_native_unit_of_measurement = "days"
+    _empty_value = 999
+    _title = ""
+    _slug = ""
+    _link_path = "person"
+
+    def __init__(self, coordinator, entry: ConfigEntry, index: int) -> None:
+        super().__init__(coordinator, entry, index)
+        self._attr_name = f"{self._title} {index + 1}"
+        self._attr_unique_id = f"{entry.entry_id}_{self._slug}_{index}"
+
+    def _value(self, record):
+        return record.days_until
+
+    def _attributes(self, record) -> dict:
+        link = self._link(self._link_path, self._handle(record))
+        return {**record.as_dict(), "link": link}
+
+    def _picture(self, record) -> str | None:
+        return record.image_url
+
+    def _handle(self, record) -> str | None:
+        return record.person_handle
+
+    @property
+    def available(self) -> bool:
+        """Return True if entity is available."""
+        return True
+
+
+class GrampsWebBirthdaySlotSensor(GrampsWebSlotSummaryBase, GrampsWebNextBirthdayBase):
+    """Next birthday at a position with all fields as attributes."""
+
+    _title = "Next Birthday"
+    _slug = "birthday"
+
+
+class GrampsWebDeathdaySlotSensor(GrampsWebSlotSummaryBase, GrampsWebNextDeathdayBase):
+    """Next deathday at a position with all fields as attributes."""
+
+    _title = "Next Deathday"
+    _slug = "deathday"
+
+
+class GrampsWebAnniversarySlotSensor(
+    GrampsWebSlotSummaryBase, GrampsWebNextAnniversaryBase
+):
+    """Next anniversary at a position with all fields as attributes."""
+
+    _title = "Next Anniversary"
+    _slug = "anniversary"
+    _link_path = "family"
+
+    def _picture(self, anniversary: AnniversaryRecord) -> str | None:
+        return anniversary.image_url_person1
+
+    def _handle(self, anniversary: AnniversaryRecord) -> str | None:
+        return anniversary.family_handle
+
+
+class GrampsWebNextEventSensor(GrampsWebSnapshotSensor):
+    """Next recurrence of a configured event type, e.g. a baptism.
+
+    The events attribute lists the next num_birthdays recurrences only and
+    is not recorded, like the list of All Upcoming Birthdays.
+    """
+
+    _attr_device_class = SensorDeviceClass.DATE
+    _attr_icon = "mdi:calendar-star"
+    _unrecorded_attributes = frozenset({"events"})
+
+    def __init__(self, coordinator, entry: ConfigEntry, event_type: str) -> None:
+        super().__init__(coordinator, entry)
+        self._event_type = event_type
+        self._attr_name = f"Next {event_type}"
+        self._attr_unique_id = f"{entry.entry_id}_event_{slugify(event_type)}"
+        self._num_events = entry.data.get(CONF_NUM_BIRTHDAYS, DEFAULT_NUM_BIRTHDAYS)
+
+    def _update_from_snapshot(self, snapshot: Snapshot | None) -> None:
+        events: tuple[EventRecord, ...] = (
+            snapshot.of_type(self._event_type) if snapshot else ()
+        )
+        if not events:
+            self._attr_native_value = None
+            self._attr_extra_state_attributes = {"events": []}
+            return
+        self._attr_native_value = events[0].next_date
+        self._attr_extra_state_attributes = {
+            ATTR_PERSON_NAME: events[0].person_name,
+            ATTR_DAYS_UNTIL: events[0].days_until,
+            "events": [event.as_dict() for event in events[: self._num_events]],
+        }
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        config_url = self._entry.data.get(CONF_URL)
+        return DeviceInfo(
+            identifiers={(DOMAIN, f"{self._entry.entry_id}_events")},
+            name="Ereignisse" if self._entry.data.get("language") == "de" else "Events",
+            manufacturer="Gramps Web",
+            model="Events",
+            entry_type=DeviceEntryType.SERVICE,
+            configuration_url=config_url,
+            via_device=(DOMAIN, self._entry.entry_id),
+        )
@@ -0,0 +1,167 @@
+"""Services of the Gramps HA integration."""
+
+from __future__ import annotations
+
+from datetime import date
+from functools import partial
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import (
+    ServiceValidationError,
+    Unauthorized,
+    UnknownUser,
+)
+import homeassistant.helpers.config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, KINDS
+
+SERVICE_GET_UPCOMING = "get_upcoming"
+SERVICE_GET_FEED_URL = "get_feed_url"
+SERVICE_REGENERATE_FEED_TOKEN = "regenerate_feed_token"
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_KIND = "kind"
+ATTR_DAYS = "days"
+ATTR_LIMIT = "limit"
+
+GET_UPCOMING_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_KIND, default="birthdays"): vol.In(KINDS),
+        vol.Optional(ATTR_DAYS): cv.positive_int,
+        vol.Optional(ATTR_LIMIT, default=50): cv.positive_int,
+    }
+)
+
+FEED_SCHEMA = vol.Schema({vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string})
+
+
+def get_coordinator(hass: HomeAssistant, entry_id: str | None, kind: str):
+    """Return the coordinator of a kind, of the given or the first entry."""
+    coordinators = hass.data.get(DOMAIN, {})
+    if entry_id is None:
+        coordinator = next(iter(coordinators.values()), None)
+    else:
+        coordinator = coordinators.get(entry_id)
+    if coordinator is None:
+        raise ServiceValidationError(f"No loaded Gramps HA entry {entry_id or ''}".strip())
+    if kind not in coordinator.coordinators:
+        raise ServiceValidationError(f"{kind.capitalize()} are not enabled")
+    return coordinator.coordinators[kind]
+
+
+def snapshot_day(coordinator) -> date:
+    """Return the day of the current snapshot, so results match the sensors."""
+    if coordinator.data is not None:
+        return coordinator.data.today
+    return dt_util.now().date()
+
+
+async def _async_get_upcoming(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Return the upcoming records of a kind from the in-memory index.
+
+    Covers every indexed record, not only the ones shown by the sensors.
+    """
+    kind = call.data[ATTR_KIND]
+    coordinator = get_coordinator(hass, call.data.get(ATTR_CONFIG_ENTRY_ID), kind)
+    today = snapshot_day(coordinator)
+    limit = call.data[ATTR_LIMIT]
+
+    index = coordinator.api.get_index(kind)
+    if index is None:
+        records = []
+    elif ATTR_DAYS in call.data:
+        records, _ = index.query(today, call.data[ATTR_DAYS], limit=limit)
+    else:
+        records = index.upcoming(today, limit)
+
+    return {
+        "kind": kind,
+        "today": today.isoformat(),
+        "records": [record.as_dict() for record in records],
+    }
+
+
+async def _async_require_admin(hass: HomeAssistant, call: ServiceCall) -> None:
+    """Raise unless the call was made by an admin or by Home Assistant itself.
+
+    Like admin services, but those can't return a response.
+    """
+    if call.context.user_id:
+        user = await hass.auth.async_get_user(call.context.user_id)
+        if user is None:
+            raise UnknownUser(context=call.context)
+        if not user.is_admin:
+            raise Unauthorized(context=call.context)
+
+
+async def _async_get_feed_url(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Return the subscribable URL of the iCalendar feed, admins only."""
+    from .ics import feed_url
+
+    await _async_require_admin(hass, call)
+    entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+    entry = get_coordinator(hass, entry_id, "birthdays").entry
+    return {"url": feed_url(hass, entry)}
+
+
+async def _async_regenerate_feed_token(
+    hass: HomeAssistant, call: ServiceCall
+) -> ServiceResponse:
+    """Replace the iCalendar feed token and return the new URL, admins only."""
+    from .ics import async_regenerate_feed_token, feed_url
+
+    await _async_require_admin(hass, call)
+    entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+    entry = get_coordinator(hass, entry_id, "birthdays").entry
+    async_regenerate_feed_token(hass, entry)
+    return {"url": feed_url(hass, entry)}
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services once for all entries."""
+    if hass.services.has_service(DOMAIN, SERVICE_GET_UPCOMING):
+        return
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_UPCOMING,
+        partial(_async_get_upcoming, hass),
+        schema=GET_UPCOMING_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_FEED_URL,
+        partial(_async_get_feed_url, hass),
+        schema=FEED_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REGENERATE_FEED_TOKEN,
+        partial(_async_regenerate_feed_token, hass),
+        schema=FEED_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+@callback
+def async_unload_services(hass: HomeAssistant) -> None:
+    """Remove the services when the last entry is unloaded."""
+    if not hass.data.get(DOMAIN):
+        for service in (
+            SERVICE_GET_UPCOMING,
+            SERVICE_GET_FEED_URL,
+            SERVICE_REGENERATE_FEED_TOKEN,
+        ):
+            hass.services.async_remove(DOMAIN, service)
@@ -0,0 +1,115 @@
+"""Immutable snapshot of the upcoming records of one kind.
+
+A coordinator publishes a new snapshot on every refresh and at midnight and
+never changes it afterwards, so entities can keep references to it and
+compute their values once per update. Snapshots are also stored, so the
+entities of the next start show the last known dates right away.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field, fields
+from datetime import date
+
+from .records import AnniversaryRecord, BirthdayRecord, DeathdayRecord, EventRecord
+
+RECORD_TYPES = {
+    "birthdays": BirthdayRecord,
+    "deathdays": DeathdayRecord,
+    "anniversaries": AnniversaryRecord,
+    "events": EventRecord,
+}
+
+
+@dataclass(slots=True, frozen=True)
+class Snapshot:
+    """Upcoming records of one kind, ordered by their next recurrence."""
+
+    kind: str
+    today: date
+    records: tuple = ()
+    statistics: dict = field(default_factory=dict)  # treated as read-only
+
+    @classmethod
+    def create(
+        cls,
+        kind: str,
+        today: date,
+        records: Iterable,
+        statistics: dict | None = None,
+    ) -> Snapshot:
+        """Create the snapshot of a kind for a day."""
+        return cls(kind, today, tuple(records or ()), statistics or {})
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self) -> Iterator:
+        return iter(self.records)
+
+    def __getitem__(self, index: int):
+        return self.records[index]
+
+    def record(self, index: int):
+        """Return the record at a position, or None if there are fewer."""
+        if index < len(self.records):
+            return self.records[index]
+        return None
+
+    def at(self, today: date) -> Snapshot:
+        """Return the snapshot recomputed for another day from its records.
+
+        Only covers the records of the snapshot; the statistics are kept.
+        """
+        records = sorted(
+            (record.at(today) for record in self.records),
+            key=lambda record: record.days_until,
+        )
+        return Snapshot.create(self.kind, today, records, self.statistics)
+
+    def to_storage(self) -> dict:
+        """Return the snapshot as JSON serializable data, see from_storage."""
+        return {
+            "today": self.today.isoformat(),
+            "records": [
+                {
+                    item.name: value.isoformat() if isinstance(value, date) else value
+                    for item in fields(record)
+                    if (value := getattr(record, item.name)) is not None
+                }
+                for record in self.records
+            ],
+            "statistics": self.statistics,
+        }
+
+    @classmethod
+    def from_storage(cls, kind: str, data: dict) -> Snapshot:
+        """Create a snapshot of a kind from the data of to_storage."""
+        record_type = RECORD_TYPES[kind]
+        dates = {item.name for item in fields(record_type) if item.type == "date"}
+        records = [
+            record_type(
+                **{
+                    name: date.fromisoformat(value) if name in dates else value
+                    for name, value in stored.items()
+                }
+            )
+            for stored in data["records"]
+        ]
+        statistics = dict(data.get("statistics") or {})
+        if "per_month" in statistics:
+            # JSON object keys are strings
+            statistics["per_month"] = {
+                int(month): count for month, count in statistics["per_month"].items()
+            }
+        return cls.create(kind, date.fromisoformat(data["today"]), records, statistics)
+
+    def of_type(self, event_type: str) -> tuple:
+        """Return the event records of an event type (case-insensitive)."""
+        event_type = event_type.lower()
+        return tuple(
+            record
+            for record in self.records
+            if record.event_type.lower() == event_type
+        )
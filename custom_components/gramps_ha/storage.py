@@ -0,0 +1,48 @@
+"""Stored snapshots of the last run.
+
+The snapshot of every kind is saved after each update, so on the next start
+the entities show the last known dates, recomputed for the current day,
+while the first refresh still runs in the background.
+"""
+
+from __future__ import annotations
+
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .snapshot import Snapshot
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 30  # seconds, updates of all kinds in between are written once
+
+
+class SnapshotStore:
+    """Snapshots of all kinds of an entry, persisted in .storage."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._store: Store = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.snapshots"
+        )
+        self._data: dict[str, dict] = {}
+
+    async def async_load(self) -> dict[str, Snapshot]:
+        """Load the stored snapshots, skipping those that cannot be read."""
+        self._data = await self._store.async_load() or {}
+        snapshots = {}
+        for kind, stored in self._data.items():
+            try:
+                snapshots[kind] = Snapshot.from_storage(kind, stored)
+            except (KeyError, TypeError, ValueError) as err:
+                _LOGGER.warning("Ignoring stored %s snapshot: %s", kind, err)
+        return snapshots
+
+    @callback
+    def async_save(self, snapshot: Snapshot) -> None:
+        """Store the snapshot of a kind, written after SAVE_DELAY."""
+        self._data[snapshot.kind] = snapshot.to_storage()
+        self._store.async_delay_save(lambda: self._data, SAVE_DELAY)
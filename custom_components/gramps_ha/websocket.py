@@ -0,0 +1,119 @@
+"""WebSocket API of the Gramps HA integration.
+
+Dashboard cards query exactly the records they render from the in-memory
+index instead of reading the attributes of many sensors:
+
+- `gramps_ha/upcoming` returns one page of the upcoming records of a kind,
+  optionally limited to a horizon in days and filtered by name.
+- `gramps_ha/subscribe_upcoming` sends the matching records once and then
+  only the added, removed and changed records after every update.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+
+from .changes import upcoming_diff
+from .const import KINDS
+from .services import get_coordinator, snapshot_day
+
+FILTER_SCHEMA = {
+    vol.Optional("config_entry_id"): str,
+    vol.Optional("kind", default="birthdays"): vol.In(KINDS),
+    vol.Optional("days"): vol.All(int, vol.Range(min=0)),
+    vol.Optional("surname"): str,
+    vol.Optional("limit", default=50): vol.All(int, vol.Range(min=1, max=1000)),
+}
+
+
+def _query(
+    coordinator, msg: dict[str, Any], today: date, offset: int = 0
+) -> tuple[list, int]:
+    """Return the page of records matching the filters of a message."""
+    index = coordinator.api.get_index(coordinator.kind)
+    if index is None:
+        return [], 0
+
+    match = None
+    if surname := msg.get("surname"):
+        needle = surname.casefold()
+
+        def _matches(record) -> bool:
+            return needle in record.person_name.casefold()
+
+        match = _matches
+
+    return index.query(today, msg.get("days"), match, offset, msg["limit"])
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "gramps_ha/upcoming",
+        **FILTER_SCHEMA,
+        vol.Optional("offset", default=0): vol.All(int, vol.Range(min=0)),
+    }
+)
+@callback
+def ws_upcoming(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Return one page of upcoming records."""
+    coordinator = get_coordinator(hass, msg.get("config_entry_id"), msg["kind"])
+    today = snapshot_day(coordinator)
+    offset = msg["offset"]
+    records, total = _query(coordinator, msg, today, offset)
+
+    next_offset = offset + len(records)
+    connection.send_result(
+        msg["id"],
+        {
+            "kind": msg["kind"],
+            "today": today.isoformat(),
+            "total": total,
+            "records": [record.as_dict() for record in records],
+            "next_offset": next_offset if next_offset < total else None,
+        },
+    )
+
+
+@websocket_api.websocket_command(
+    {vol.Required("type"): "gramps_ha/subscribe_upcoming", **FILTER_SCHEMA}
+)
+@callback
+def ws_subscribe_upcoming(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Send the matching records, then only their changes after each update."""
+    coordinator = get_coordinator(hass, msg.get("config_entry_id"), msg["kind"])
+    current, _ = _query(coordinator, msg, snapshot_day(coordinator))
+
+    @callback
+    def forward_changes() -> None:
+        nonlocal current
+        records, _ = _query(coordinator, msg, snapshot_day(coordinator))
+        if diff := upcoming_diff(current, records):
+            connection.send_message(websocket_api.event_message(msg["id"], diff))
+        current = records
+
+    connection.subscriptions[msg["id"]] = coordinator.async_add_listener(
+        forward_changes
+    )
+    connection.send_result(msg["id"])
+    connection.send_message(
+        websocket_api.event_message(
+            msg["id"], {"records": [record.as_dict() for record in current]}
+        )
+    )
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the websocket commands."""
+    websocket_api.async_register_command(hass, ws_upcoming)
+    websocket_api.async_register_command(hass, ws_subscribe_upcoming)
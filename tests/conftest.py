@@ -0,0 +1,21 @@
+"""Make the modules of the integration importable without Home Assistant.
+
+The package __init__ sets up the integration and needs Home Assistant; the
+modules under test (dates, records, index, snapshot, the API client) don't,
+so the package is registered without running it.
+"""
+
+import sys
+import types
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+for name, path in (
+    ("custom_components", ROOT / "custom_components"),
+    ("custom_components.gramps_ha", ROOT / "custom_components" / "gramps_ha"),
+):
+    if name not in sys.modules:
+        module = types.ModuleType(name)
+        module.__path__ = [str(path)]
+        sys.modules[name] = module
@@ -0,0 +1,66 @@
+"""Tests for the normalization of Gramps dates."""
+
+from datetime import date
+
+from custom_components.gramps_ha.dates import (
+    MOD_ABOUT,
+    MOD_RANGE,
+    MOD_TEXTONLY,
+    QUAL_ESTIMATED,
+    SORTVAL_OFFSET,
+    GrampsDate,
+    normalize_date,
+)
+from custom_components.gramps_ha.models import Date
+
+
+def gramps_date(value: date, **kwargs) -> Date:
+    """Return a Gramps date of a Gregorian date with its sortval."""
+    kwargs.setdefault("dateval", [value.day, value.month, value.year, False])
+    return Date(sortval=value.toordinal() + SORTVAL_OFFSET, **kwargs)
+
+
+def test_exact_date():
+    assert normalize_date(gramps_date(date(1990, 1, 15))) == GrampsDate(
+        date(1990, 1, 15)
+    )
+
+
+def test_sortval_wins_over_dateval():
+    # Julian 1 January 1700 is 12 January 1700 in the Gregorian calendar
+    julian = gramps_date(date(1700, 1, 12), dateval=[1, 1, 1700, False], calendar=1)
+    assert normalize_date(julian).value == date(1700, 1, 12)
+
+
+def test_dateval_without_sortval():
+    assert normalize_date(Date(dateval=[29, 2, 2000, False])).value == date(2000, 2, 29)
+
+
+def test_modifier_and_quality_are_approximate():
+    about = normalize_date(gramps_date(date(1980, 12, 31), modifier=MOD_ABOUT))
+    estimated = normalize_date(gramps_date(date(1980, 12, 31), quality=QUAL_ESTIMATED))
+    assert about.approximate and about.inexact and not about.is_range
+    assert estimated.approximate and estimated.inexact
+
+
+def test_range_starts_at_its_first_date():
+    result = normalize_date(
+        gramps_date(
+            date(1900, 5, 1),
+            dateval=[1, 5, 1900, False, 1, 6, 1900, False],
+            modifier=MOD_RANGE,
+        )
+    )
+    assert result.value == date(1900, 5, 1)
+    assert result.is_range and result.inexact and not result.approximate
+
+
+def test_unusable_dates():
+    assert normalize_date(None) is None
+    assert normalize_date(Date()) is None
+    assert normalize_date(gramps_date(date(1990, 1, 15), modifier=MOD_TEXTONLY)) is None
+    # Without day, month or year there is no yearly recurrence
+    assert normalize_date(Date(dateval=[0, 5, 1990, False])) is None
+    assert normalize_date(Date(dateval=[12, 5, 0, False])) is None
+    assert normalize_date(Date(dateval=["x", 5, 1990, False])) is None
+    assert normalize_date(Date(dateval=[31, 2, 1990, False])) is None
@@ -0,0 +1,428 @@
+"""Tests for the Gramps Web API client, with GrampsWebAPI._get stubbed."""
+
+import json
+from datetime import date, timedelta
+
+import pytest
+
+requests = pytest.importorskip("requests")
+
+from custom_components.gramps_ha.dates import SORTVAL_OFFSET  # noqa: E402
+from custom_components.gramps_ha.grampsweb_api import (  # noqa: E402
+    BATCH_SIZE,
+    GrampsWebAPI,
+)
+from custom_components.gramps_ha.models import decode  # noqa: E402
+
+TODAY = date(2025, 6, 1)
+
+
+def gramps_date(value: date | None) -> dict | None:
+    """Return a date as serialized by Gramps Web."""
+    if value is None:
+        return None
+    return {
+        "dateval": [value.day, value.month, value.year, False],
+        "sortval": value.toordinal() + SORTVAL_OFFSET,
+    }
+
+
+def http_error(status: int) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(f"HTTP {status}", response=response)
+
+
+class FakeGramps:
+    """Gramps Web objects answering the requests of GrampsWebAPI._get."""
+
+    def __init__(self) -> None:
+        self.people: dict[str, dict] = {}
+        self.events: dict[str, dict] = {}
+        self.families: dict[str, dict] = {}
+        self.tags: list[dict] = []
+        self.requests: list[tuple[str, dict | None]] = []
+        # Raised instead of answering, keyed by endpoint
+        self.errors: dict[str, Exception] = {}
+
+    def event(self, handle: str, event_type: str, value: date | None) -> None:
+        self.events[handle] = {
+            "handle": handle,
+            "change": 1,
+            "type": event_type,
+            "date": gramps_date(value),
+        }
+
+    def person(
+        self,
+        handle: str,
+        name: str,
+        events: tuple = (),
+        birth: int = -1,
+        death: int = -1,
+        tags: tuple = (),
+    ) -> None:
+        """Add a person; events are handles or (handle, role) pairs."""
+        refs = [(ref, "Primary") if isinstance(ref, str) else ref for ref in events]
+        self.people[handle] = {
+            "handle": handle,
+            "change": 1,
+            "primary_name": {"first_name": name, "surname_list": []},
+            "event_ref_list": [{"ref": ref, "role": role} for ref, role in refs],
+            "birth_ref_index": birth,
+            "death_ref_index": death,
+            "family_list": [],
+            "tag_list": list(tags),
+        }
+
+    def family(self, handle: str, father: str, mother: str, events: tuple = ()) -> None:
+        self.families[handle] = {
+            "handle": handle,
+            "change": 1,
+            "father_handle": father,
+            "mother_handle": mother,
+            "event_ref_list": [{"ref": ref, "role": "Family"} for ref in events],
+        }
+        for parent in (father, mother):
+            self.people[parent]["family_list"].append(handle)
+
+    def _backlinks(self, event_handle: str) -> dict:
+        backlinks = {}
+        for kind, objects in (("person", self.people), ("family", self.families)):
+            handles = [
+                handle
+                for handle, data in objects.items()
+                if any(ref["ref"] == event_handle for ref in data["event_ref_list"])
+            ]
+            if handles:
+                backlinks[kind] = handles
+        return backlinks
+
+    def _events(self, params: dict | None) -> list[dict]:
+        month = None
+        if params and "dates" in params:
+            month = int(params["dates"].split("/")[1])
+        return [
+            {**event, "backlinks": self._backlinks(handle)}
+            for handle, event in self.events.items()
+            if month is None
+            or (event["date"] and event["date"]["dateval"][1] == month)
+        ]
+
+    def get(self, endpoint: str, params=None, model=None, many=False):
+        self.requests.append((endpoint, params))
+        if endpoint in self.errors:
+            raise self.errors[endpoint]
+
+        collection, _, handle = endpoint.rstrip("/").partition("/")
+        if collection == "tags":
+            payload = self.tags
+        elif collection == "types":
+            event_types = ["Birth", "Death", "Marriage", "Baptism", "Graduation"]
+            payload = {"default": {"event_types": event_types}}
+        elif handle:
+            objects = getattr(self, collection)
+            if handle not in objects:
+                raise http_error(404)
+            payload = objects[handle]
+        elif collection == "events":
+            payload = self._events(params)
+        else:
+            payload = list(getattr(self, collection).values())
+
+        if model is None:
+            return payload
+        return decode(json.dumps(payload).encode(), model, many)
+
+
+@pytest.fixture
+def gramps() -> FakeGramps:
+    return FakeGramps()
+
+
+def make_api(gramps: FakeGramps, **kwargs) -> GrampsWebAPI:
+    api = GrampsWebAPI("http://gramps.local", **kwargs)
+    api._get = gramps.get
+    return api
+
+
+def names(records) -> list[str]:
+    return [record.person_name for record in records]
+
+
+def add_tagged_people(gramps: FakeGramps) -> None:
+    gramps.tags = [{"handle": "T1", "name": "Family"}]
+    gramps.event("B1", "Birth", date(1990, 6, 5))
+    gramps.event("B2", "Birth", date(1991, 6, 6))
+    gramps.event("D1", "Death", date(2001, 6, 7))
+    gramps.event("D2", "Death", date(2002, 6, 8))
+    gramps.person("P1", "Tagged", ["B1"], birth=0, tags=["T1"])
+    gramps.person("P2", "Untagged", ["B2"], birth=0)
+    gramps.person("P3", "Tagged late", ["D1"], death=0, tags=["T1"])
+    gramps.person("P4", "Untagged late", ["D2"], death=0)
+
+
+def test_people_rules():
+    api = GrampsWebAPI("http://gramps.local", filter_tag="Family")
+    rules = api._people_rules("birthdays")
+    assert [rule["name"] for rule in rules["rules"]] == [
+        "ProbablyAlive",
+        "HasBirth",
+        "HasTag",
+    ]
+    assert api._people_rules("anniversaries")["rules"] == [
+        {"name": "HasTag", "values": ["Family"]}
+    ]
+    assert GrampsWebAPI("http://gramps.local")._people_rules("anniversaries") is None
+    api.server_filters = False
+    assert api._people_rules("birthdays") is None
+
+
+def test_tag_filter_without_server_filters(gramps):
+    add_tagged_people(gramps)
+    api = make_api(gramps, server_filters=False, filter_tag="Family")
+
+    assert names(api.get_birthdays(today=TODAY)) == ["Tagged"]
+    assert names(api.get_deathdays(today=TODAY)) == ["Tagged late"]
+    assert ("people/", None) in gramps.requests
+
+
+def test_tag_filter_after_rejected_server_filters(gramps):
+    add_tagged_people(gramps)
+    api = make_api(gramps, filter_tag="Family")
+    get = gramps.get
+
+    def reject_rules(endpoint, params=None, model=None, many=False):
+        if endpoint == "people/" and params:
+            raise http_error(400)
+        return get(endpoint, params, model, many)
+
+    api._get = reject_rules
+
+    assert names(api.get_birthdays(today=TODAY)) == ["Tagged"]
+    assert api.server_filters is False
+
+
+def test_tag_handle_is_not_cached_after_a_failure(gramps):
+    add_tagged_people(gramps)
+    api = make_api(gramps, server_filters=False, filter_tag="Family")
+    gramps.errors["tags/"] = requests.ConnectionError("down")
+
+    with pytest.raises(requests.ConnectionError):
+        api._tag_handle()
+    with pytest.raises(requests.ConnectionError):
+        api.get_birthdays(today=TODAY)
+
+    del gramps.errors["tags/"]
+    assert api._tag_handle() == "T1"
+    assert names(api.get_birthdays(today=TODAY)) == ["Tagged"]
+
+
+def test_unknown_tag_matches_no_one(gramps):
+    add_tagged_people(gramps)
+    api = make_api(gramps, server_filters=False, filter_tag="Friends")
+
+    assert api._tag_handle() == ""
+    assert api._tag_handle() == ""
+    assert [endpoint for endpoint, _ in gramps.requests].count("tags/") == 1
+    assert api.get_deathdays(today=TODAY) == []
+
+
+def test_window_months_wrap_over_new_year():
+    api = GrampsWebAPI("http://gramps.local", window_days=45)
+    assert api._window_months(date(2025, 12, 20), 30) == [12, 1]
+    assert api._window_months(date(2025, 12, 20), 45) == [12, 1, 2]
+    assert api._window_months(date(2025, 6, 1), 400) == list(range(6, 13)) + list(
+        range(1, 6)
+    )
+
+
+def test_window_birthdays_wrap_over_new_year(gramps):
+    gramps.event("B1", "Birth", date(1990, 1, 5))
+    gramps.event("B2", "Birth", date(1991, 12, 28))
+    gramps.event("B3", "Birth", date(1992, 3, 1))
+    for handle, event in (("P1", "B1"), ("P2", "B2"), ("P3", "B3")):
+        gramps.person(handle, handle, [event], birth=0)
+    api = make_api(gramps, window_days=30)
+
+    records = api.get_birthdays(today=date(2025, 12, 20))
+    assert [record.next_birthday for record in records] == [
+        date(2025, 12, 28),
+        date(2026, 1, 5),
+    ]
+
+
+def window_birthdays(gramps: FakeGramps) -> GrampsWebAPI:
+    for handle, day in (("P1", 3), ("P2", 11), ("P3", 12)):
+        gramps.event(f"B{handle}", "Birth", date(1990, 6, day))
+        gramps.person(handle, handle, [f"B{handle}"], birth=0)
+    return make_api(gramps, window_days=10)
+
+
+def test_window_index_is_not_rolled_past_its_window(gramps):
+    api = window_birthdays(gramps)
+    tomorrow = date(2025, 6, 2)
+
+    assert names(api.get_birthdays(today=TODAY)) == ["P1", "P2"]
+    assert names(api.get_upcoming("birthdays", TODAY)) == ["P1", "P2"]
+    # P3 enters the window tomorrow, but the index doesn't know it
+    assert api.get_upcoming("birthdays", tomorrow) is None
+    assert names(api.get_birthdays(today=tomorrow)) == ["P1", "P2", "P3"]
+
+
+def test_window_index_rolls_over_while_it_covers_the_result(gramps):
+    api = window_birthdays(gramps)
+    api.get_birthdays(limit=1, today=TODAY)
+    assert names(api.get_upcoming("birthdays", date(2025, 6, 2), limit=1)) == ["P1"]
+
+
+def test_witnesses_are_not_participants(gramps):
+    gramps.event("M1", "Marriage", date(2000, 6, 10))
+    gramps.event("C1", "Baptism", date(2010, 6, 12))
+    gramps.person("P1", "Groom")
+    gramps.person("P2", "Bride")
+    gramps.person("P3", "Witness", [("M1", "Witness"), ("C1", "Witness")])
+    gramps.person("P4", "Child", ["C1"])
+    gramps.family("F1", "P1", "P2", ["M1"])
+    api = make_api(gramps, event_types=["Baptism"])
+
+    [marriage] = api.get_marriage_events(TODAY)
+    people, family_handle = api._event_participants(marriage)
+    assert [person.handle for person in people] == ["P1", "P2"]
+    assert family_handle == "F1"
+
+    assert names(api.get_anniversaries(today=TODAY)) == ["Groom & Bride"]
+    assert names(api.get_events(today=TODAY)) == ["Child"]
+
+
+def expire(api: GrampsWebAPI) -> None:
+    """Let every cached download and index expire."""
+    for key in api._cache:
+        if key.endswith("_timestamp"):
+            api._cache[key] = None
+
+
+def test_undated_people_are_skipped_until_changed(gramps):
+    gramps.event("B1", "Birth", date(1990, 6, 5))
+    gramps.event("B2", "Birth", None)
+    gramps.person("P1", "Dated", ["B1"], birth=0)
+    gramps.person("P2", "Undated", ["B2"], birth=0)
+    gramps.person("P3", "Missing event", ["X1"], birth=0)
+    api = make_api(gramps)
+
+    assert names(api.get_birthdays(today=TODAY)) == ["Dated"]
+    assert set(api._undated["birth"]) == {"P2"}
+
+    expire(api)
+    gramps.requests.clear()
+    assert names(api.get_birthdays(today=TODAY)) == ["Dated"]
+    requested = [endpoint for endpoint, _ in gramps.requests]
+    assert "events/B2" not in requested
+    # A failed fetch doesn't mean there is no date, so it is tried again
+    assert "events/X1" in requested
+
+    gramps.event("B2", "Birth", date(1991, 6, 6))
+    gramps.people["P2"]["change"] = 2
+    expire(api)
+    assert names(api.get_birthdays(today=TODAY)) == ["Dated", "Undated"]
+
+
+def test_events_are_limited_per_type(gramps):
+    for day in range(2, 12):
+        gramps.event(f"C{day}", "Baptism", date(2010, 6, day))
+        gramps.person(f"K{day}", f"Kid {day}", [f"C{day}"])
+    gramps.event("G1", "Graduation", date(2015, 9, 1))
+    gramps.person("S1", "Student", ["G1"])
+    api = make_api(gramps, event_types=["baptism", "Graduation"])
+
+    expected = ["Kid 2", "Kid 3", "Kid 4", "Student"]
+    assert names(api.get_events(limit=3, today=TODAY)) == expected
+    # Also from the cached index
+    assert names(api.get_events(limit=3, today=TODAY)) == expected
+    assert names(api.get_upcoming("events", TODAY, limit=3)) == expected
+    assert {record.event_type for record in api.get_events(today=TODAY)} == {
+        "Baptism",
+        "Graduation",
+    }
+
+
+def test_unreachable_lookups_raise(gramps):
+    api = window_birthdays(gramps)
+    gramps.event("M1", "Marriage", date(2000, 6, 10))
+    gramps.family("F1", "P1", "P3", ["M1"])
+    gramps.errors["people/P2"] = requests.ConnectionError("refused")
+
+    # No fall back to the full scan, the server is down for it as well
+    with pytest.raises(requests.ConnectionError):
+        api.get_birthdays(today=TODAY)
+    assert "P2" not in api._cache["person_details"]
+
+    gramps.errors["families/F1"] = http_error(503)
+    with pytest.raises(requests.HTTPError):
+        api.get_anniversaries(today=TODAY)
+
+    del gramps.errors["people/P2"]
+    assert names(api.get_birthdays(today=TODAY)) == ["P1", "P2"]
+
+
+def test_missing_people_are_skipped_and_not_cached(gramps):
+    api = window_birthdays(gramps)
+    gramps.errors["people/P2"] = http_error(404)
+
+    assert names(api.get_birthdays(today=TODAY)) == ["P1"]
+    assert "P2" not in api._cache["person_details"]
+
+    del gramps.errors["people/P2"]
+    assert api._get_person("P2").handle == "P2"
+
+
+def many_birthdays(gramps: FakeGramps, count: int) -> None:
+    """Add people born on different days, not in the order of the days."""
+    for i in range(count):
+        born = date(1990, 1, 1) + timedelta(days=i * 97 % 365)
+        gramps.event(f"B{i}", "Birth", born)
+        gramps.person(f"P{i}", f"Person {i}", [f"B{i}"], birth=0)
+
+
+def test_known_dates_come_first(gramps):
+    many_birthdays(gramps, 5)
+    gramps.person("P5", "Unknown")
+    api = make_api(gramps)
+    people = api._tagged(api.get_people("birthdays"))
+
+    assert api._soonest_first(people, "birthdays", TODAY) == list(people)
+
+    api.get_birthdays(today=TODAY)
+    expire(api)
+    ordered = api._soonest_first(people, "birthdays", TODAY)
+    assert [person.handle for person in ordered] == [
+        record.person_handle for record in api.get_birthdays(today=TODAY)
+    ] + ["P5"]
+
+    # Also from the dates of a stored snapshot
+    records = api.get_birthdays(today=TODAY)
+    api = make_api(gramps)
+    api.remember_dates("birthdays", records)
+    assert api._soonest_first(people, "birthdays", TODAY) == ordered
+
+
+def test_partial_results_hold_the_nearest_records(gramps):
+    many_birthdays(gramps, 2 * BATCH_SIZE + 20)
+    api = make_api(gramps)
+    batches = []
+
+    def on_batch(records, done, total):
+        batches.append((names(records), done, total))
+
+    api.get_birthdays(limit=5, today=TODAY, on_batch=on_batch)
+    assert [batch[1:] for batch in batches] == [
+        (BATCH_SIZE, 2 * BATCH_SIZE + 20),
+        (2 * BATCH_SIZE, 2 * BATCH_SIZE + 20),
+    ]
+    assert all(len(records) == 5 for records, _done, _total in batches)
+
+    # With the dates of the last index the first batch is already complete
+    expire(api)
+    batches.clear()
+    result = names(api.get_birthdays(limit=5, today=TODAY, on_batch=on_batch))
+    assert [records for records, _done, _total in batches] == [result, result]
@@ -0,0 +1,106 @@
+"""Tests for the day-of-year index of recurring dates."""
+
+from datetime import date
+
+from custom_components.gramps_ha.index import DateIndex, NearestRecords
+from custom_components.gramps_ha.records import BirthdayRecord, EventRecord
+
+
+def birthdays(*origins: date) -> DateIndex:
+    today = date(2025, 1, 1)
+    return DateIndex(
+        BirthdayRecord.create(f"P{idx}", origin, today)
+        for idx, origin in enumerate(origins)
+    )
+
+
+def test_upcoming_wraps_over_new_year():
+    index = birthdays(date(1990, 6, 1), date(1980, 1, 1), date(1970, 12, 31))
+    upcoming = index.upcoming(date(2025, 12, 30))
+    assert [record.next_birthday for record in upcoming] == [
+        date(2025, 12, 31),
+        date(2026, 1, 1),
+        date(2026, 6, 1),
+    ]
+    assert [record.days_until for record in upcoming] == [1, 2, 153]
+    assert [record.age for record in upcoming] == [55, 46, 36]
+
+
+def test_upcoming_includes_today_and_limits():
+    index = birthdays(date(1990, 3, 1), date(1991, 3, 2), date(1992, 3, 3))
+    upcoming = index.upcoming(date(2025, 3, 2), limit=2)
+    assert [record.days_until for record in upcoming] == [0, 1]
+
+
+def test_upcoming_february_29():
+    index = birthdays(date(2000, 2, 29), date(1990, 3, 1))
+    assert [record.next_birthday for record in index.upcoming(date(2025, 2, 28))] == [
+        date(2025, 2, 28),
+        date(2025, 3, 1),
+    ]
+    assert [record.next_birthday for record in index.upcoming(date(2028, 2, 29))] == [
+        date(2028, 2, 29),
+        date(2028, 3, 1),
+    ]
+
+
+def test_between_wraps_over_new_year():
+    index = birthdays(date(1990, 6, 1), date(1980, 1, 1), date(1970, 12, 31))
+    result = list(index.between(date(2025, 12, 20), date(2026, 1, 10)))
+    assert [(day, record.person_name) for day, record in result] == [
+        (date(2025, 12, 31), "P2"),
+        (date(2026, 1, 1), "P1"),
+    ]
+    # Every record is recomputed for the day of its recurrence
+    assert [record.days_until for _, record in result] == [0, 0]
+    assert [record.age for _, record in result] == [55, 46]
+
+
+def test_between_spans_years_with_february_29():
+    index = birthdays(date(2000, 2, 29))
+    days = [day for day, _ in index.between(date(2023, 1, 1), date(2026, 1, 1))]
+    assert days == [date(2023, 2, 28), date(2024, 2, 29), date(2025, 2, 28)]
+
+
+def test_between_excludes_end():
+    index = birthdays(date(1990, 6, 1))
+    assert list(index.between(date(2025, 5, 1), date(2025, 6, 1))) == []
+    assert len(list(index.between(date(2025, 6, 1), date(2025, 6, 2)))) == 1
+
+
+def test_upcoming_per_keeps_rare_groups():
+    today = date(2025, 1, 1)
+    records = [
+        EventRecord.create("Baptism", f"Kid {day}", date(2015, 1, day), today)
+        for day in range(1, 21)
+    ]
+    records.append(EventRecord.create("Graduation", "Grad", date(2020, 9, 1), today))
+    index = DateIndex(records)
+
+    assert [record.event_type for record in index.upcoming(today, 5)] == ["Baptism"] * 5
+    result = index.upcoming_per(today, lambda record: record.event_type, 5)
+    assert [record.event_type for record in result] == ["Baptism"] * 5 + ["Graduation"]
+    assert result[-1].next_date == date(2025, 9, 1)
+
+
+def test_nearest_records_keeps_the_nearest():
+    today = date(2025, 1, 1)
+    nearest = NearestRecords(3)
+    for idx, day in enumerate([20, 5, 9, 5, 1, 30]):
+        nearest.add(BirthdayRecord.create(f"P{idx}", date(1990, 1, day), today))
+    # Of records as near as each other the first added is kept
+    assert [record.person_name for record in nearest.records()] == ["P4", "P1", "P3"]
+
+
+def test_nearest_records_per_group():
+    today = date(2025, 1, 1)
+    nearest = NearestRecords(2, lambda record: record.event_type)
+    for day in range(1, 11):
+        nearest.add(EventRecord.create("Baptism", f"Kid {day}", date(2015, 1, day), today))
+    nearest.add(EventRecord.create("Graduation", "Grad", date(2020, 9, 1), today))
+    assert [record.person_name for record in nearest.records()] == [
+        "Kid 1",
+        "Kid 2",
+        "Grad",
+    ]
+    assert NearestRecords(0).records() == []
@@ -0,0 +1,58 @@
+"""Tests for the record types and their recurrences."""
+
+from datetime import date
+
+import pytest
+
+from custom_components.gramps_ha.records import (
+    AnniversaryRecord,
+    BirthdayRecord,
+    DeathdayRecord,
+    next_occurrence,
+)
+
+
+@pytest.mark.parametrize(
+    ("origin", "today", "expected"),
+    [
+        (date(1990, 6, 1), date(2025, 6, 1), date(2025, 6, 1)),
+        (date(1990, 6, 1), date(2025, 5, 31), date(2025, 6, 1)),
+        (date(1990, 6, 1), date(2025, 6, 2), date(2026, 6, 1)),
+        (date(1990, 1, 1), date(2025, 12, 31), date(2026, 1, 1)),
+        (date(2000, 2, 29), date(2025, 1, 1), date(2025, 2, 28)),
+        (date(2000, 2, 29), date(2027, 3, 1), date(2028, 2, 29)),
+        (date(2000, 2, 29), date(2024, 2, 29), date(2024, 2, 29)),
+    ],
+)
+def test_next_occurrence(origin, today, expected):
+    assert next_occurrence(origin, today) == expected
+
+
+def test_birthday_record():
+    record = BirthdayRecord.create("Anna", date(1990, 1, 1), date(2025, 12, 31))
+    assert record.next_birthday == date(2026, 1, 1)
+    assert record.age == 36
+    assert record.days_until == 1
+    assert record.origin == date(1990, 1, 1)
+    assert record.key == "Anna"
+
+
+def test_record_at_another_day():
+    record = DeathdayRecord.create(
+        "Bert", date(2000, 3, 10), date(2025, 1, 1), person_handle="P2"
+    )
+    later = record.at(date(2025, 3, 11))
+    assert later.next_deathday == date(2026, 3, 10)
+    assert later.days_until == 364
+    assert later.person_handle == "P2"
+    assert later.key == "P2"
+
+
+def test_anniversary_record():
+    record = AnniversaryRecord.create(
+        "Anna & Bert", date(2000, 2, 29), date(2025, 2, 1), family_handle="F1"
+    )
+    assert record.next_anniversary == date(2025, 2, 28)
+    assert record.days_until == 27
+    assert record.key == "F1"
+    assert record.as_dict()["marriage_date"] == "2000-02-29"
@@ -0,0 +1,112 @@
+"""Tests for the slot sensors added and removed with the number of records."""
+
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.gramps_ha import sensor  # noqa: E402
+from custom_components.gramps_ha.records import BirthdayRecord  # noqa: E402
+from custom_components.gramps_ha.snapshot import Snapshot  # noqa: E402
+
+TODAY = date(2025, 12, 30)
+
+
+class FakeRegistry:
+    """Entity registry holding the unique ids of the registered sensors."""
+
+    def __init__(self, unique_ids=()):
+        self.entities = {unique_id: f"sensor.{unique_id}" for unique_id in unique_ids}
+
+    def async_get_entity_id(self, domain, platform, unique_id):
+        return self.entities.get(unique_id)
+
+    def async_remove(self, entity_id):
+        self.entities = {
+            unique_id: known
+            for unique_id, known in self.entities.items()
+            if known != entity_id
+        }
+
+
+def snapshot(count):
+    return Snapshot.create(
+        "birthdays",
+        TODAY,
+        [
+            BirthdayRecord.create(f"Person {i}", date(1990, 12, 31), TODAY)
+            for i in range(count)
+        ],
+    )
+
+
+@pytest.fixture
+def slots(monkeypatch):
+    registry = FakeRegistry(f"E1_birthday_{i}" for i in range(5))
+    monkeypatch.setattr(sensor.er, "async_get", lambda hass: registry)
+    coordinator = SimpleNamespace(
+        data=None, last_update_success=True, partial=False, kind="birthdays"
+    )
+    added = []
+
+    def add_entities(entities):
+        added.extend(entities)
+        registry.entities.update(
+            (entity.unique_id, f"sensor.{entity.unique_id}") for entity in entities
+        )
+
+    slots = sensor.DynamicSlotSensors(
+        None,
+        coordinator,
+        SimpleNamespace(entry_id="E1", data={}),
+        (sensor.GrampsWebBirthdaySlotSensor,),
+        5,
+        add_entities,
+    )
+    return SimpleNamespace(
+        update=slots.async_update,
+        coordinator=coordinator,
+        added=added,
+        registry=registry,
+    )
+
+
+def update(slots, count, partial=False, success=True):
+    slots.coordinator.data = snapshot(count)
+    slots.coordinator.partial = partial
+    slots.coordinator.last_update_success = success
+    slots.update()
+    return (
+        [entity.unique_id for entity in slots.added],
+        sorted(slots.registry.entities),
+    )
+
+
+def test_slots_follow_the_number_of_records(slots):
+    slots.update()  # no data yet
+    assert not slots.added
+    assert len(slots.registry.entities) == 5
+
+    # The positions left by an earlier run are removed
+    assert update(slots, 2) == (
+        ["E1_birthday_0", "E1_birthday_1"],
+        ["E1_birthday_0", "E1_birthday_1"],
+    )
+
+    # More records add sensors, fewer remove them from the registry
+    assert update(slots, 4)[0][2:] == ["E1_birthday_2", "E1_birthday_3"]
+    assert update(slots, 3)[1] == ["E1_birthday_0", "E1_birthday_1", "E1_birthday_2"]
+    assert len(slots.added) == 4
+
+
+def test_partial_and_failed_updates_only_add_slots(slots):
+    update(slots, 3)
+    kept = ["E1_birthday_0", "E1_birthday_1", "E1_birthday_2"]
+
+    assert update(slots, 1, partial=True)[1] == kept
+    assert update(slots, 0)[1] == kept  # empty right after records
+    assert update(slots, 1, success=False)[1] == kept
+    assert update(slots, 4, partial=True)[0][3:] == ["E1_birthday_3"]
+    assert update(slots, 1)[1] == ["E1_birthday_0"]
@@ -0,0 +1,77 @@
+"""Tests for the immutable snapshots and their storage."""
+
+import json
+from datetime import date
+
+import pytest
+
+from custom_components.gramps_ha.records import (
+    AnniversaryRecord,
+    BirthdayRecord,
+    DeathdayRecord,
+    EventRecord,
+)
+from custom_components.gramps_ha.snapshot import Snapshot
+
+TODAY = date(2025, 12, 30)
+
+RECORDS = {
+    "birthdays": [
+        BirthdayRecord.create(
+            "Anna",
+            date(1990, 1, 1),
+            TODAY,
+            image_url="/local/a.jpg",
+            person_handle="P1",
+        ),
+        BirthdayRecord.create("Bert", date(2000, 2, 29), TODAY, approximate=True),
+    ],
+    "deathdays": [DeathdayRecord.create("Cleo", date(2001, 12, 31), TODAY)],
+    "anniversaries": [
+        AnniversaryRecord.create(
+            "Anna & Bert", date(2010, 6, 1), TODAY, family_handle="F1"
+        )
+    ],
+    "events": [
+        EventRecord.create(
+            "Baptism", "Dan", date(2015, 1, 5), TODAY, event_handle="E1"
+        )
+    ],
+}
+
+
+@pytest.mark.parametrize("kind", list(RECORDS))
+def test_storage_round_trip(kind):
+    statistics = {"per_month": {1: 2, 12: 1}, "next_7_days": 2}
+    snapshot = Snapshot.create(kind, TODAY, RECORDS[kind], statistics)
+
+    # The stored data goes through JSON, like the Home Assistant store
+    stored = json.loads(json.dumps(snapshot.to_storage()))
+    restored = Snapshot.from_storage(kind, stored)
+
+    assert restored == snapshot
+    assert restored.statistics["per_month"] == {1: 2, 12: 1}
+
+
+def test_storage_omits_unset_fields():
+    stored = Snapshot.create("birthdays", TODAY, RECORDS["birthdays"]).to_storage()
+    assert "image_url" not in stored["records"][1]
+    assert stored["records"][0]["birth_date"] == "1990-01-01"
+
+
+def test_at_recomputes_and_reorders():
+    snapshot = Snapshot.create("birthdays", TODAY, RECORDS["birthdays"])
+    later = snapshot.at(date(2026, 1, 2))
+    assert later.today == date(2026, 1, 2)
+    assert [record.person_name for record in later] == ["Bert", "Anna"]
+    assert later[0].next_birthday == date(2026, 2, 28)
+    assert later[1].days_until == 364
+    assert snapshot[0].person_name == "Anna"
+
+
+def test_record_and_of_type():
+    snapshot = Snapshot.create("events", TODAY, RECORDS["events"])
+    assert snapshot.record(0).person_name == "Dan"
+    assert snapshot.record(1) is None
+    assert snapshot.of_type("baptism") == snapshot.records
+    assert snapshot.of_type("Graduation") == ()